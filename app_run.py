@@ -4,11 +4,30 @@ import os
 from threading import Thread
 import time
 
+import requests
+
+READY_URL = "http://localhost:8000/health/ready"
+READY_TIMEOUT_S = 600
+
 def run_kedro():
     """Запускает Kedro pipeline."""
     print("Запуск Kedro...")
     subprocess.run(["kedro", "run"], check=True)
 
+def wait_until_ready(kedro_thread, url=READY_URL, timeout_s=READY_TIMEOUT_S):
+    """Ждёт, пока API загрузит и прогреет модели."""
+    deadline = time.monotonic() + timeout_s
+    while time.monotonic() < deadline and kedro_thread.is_alive():
+        try:
+            if requests.get(url, timeout=2).status_code == 200:
+                print("API готов.")
+                return True
+        except requests.RequestException:
+            pass
+        time.sleep(0.5)
+    print("API не готов, GUI запускается без него.")
+    return False
+
 def run_gui():
     """Запускает GUI."""
     print("Запуск GUI...")
@@ -24,7 +43,7 @@ if __name__ == "__main__":
     kedro_thread = Thread(target=run_kedro)
     kedro_thread.start()
 
-    time.sleep(15)
+    wait_until_ready(kedro_thread)
 
     run_gui()
 
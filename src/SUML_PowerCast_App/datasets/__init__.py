@@ -0,0 +1,14 @@
+"""Custom Kedro datasets of the project"""
+
+__all__ = ["OptionalPickleDataset", "PartitionedConsumptionDataset"]
+
+
+def __getattr__(name):
+    # Imported on first use, so the storage functions can be used without loading Kedro
+    if name == "PartitionedConsumptionDataset":
+        from .consumption_dataset import PartitionedConsumptionDataset
+        return PartitionedConsumptionDataset
+    if name == "OptionalPickleDataset":
+        from .optional_pickle_dataset import OptionalPickleDataset
+        return OptionalPickleDataset
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,78 @@
+"""
+Kedro dataset over the month-partitioned consumption data.
+"""
+
+import os
+from typing import Any, Dict, Optional
+
+import pandas as pd
+from kedro.io import AbstractDataset
+
+from .partitioned_consumption import append_partitions, is_partitioned, migrate_csv_to_partitions, read_partitions
+
+
+class PartitionedConsumptionDataset(AbstractDataset[pd.DataFrame, pd.DataFrame]):
+    """
+    Kedro dataset over the month-partitioned consumption data.
+
+    Example catalog entry:
+
+        power_consumption:
+          type: SUML_PowerCast_App.datasets.PartitionedConsumptionDataset
+          path: data/01_raw/powerconsumption
+          legacy_filepath: data/01_raw/powerconsumption.csv
+          load_args:
+            columns: [Temperature, Humidity]
+            since: "2017-06"
+
+    Saving appends the rows as new segments, it never overwrites existing data.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        legacy_filepath: Optional[str] = None,
+        migrate_legacy: bool = False,
+        load_args: Optional[Dict[str, Any]] = None,
+        metadata: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Args:
+            path (str): Root directory of the partitions.
+            legacy_filepath (str, optional): CSV read until the data is migrated.
+            migrate_legacy (bool): Migrate `legacy_filepath` on first load if no partitions exist.
+            load_args (dict, optional): `columns`, `since` and `until` passed to `read_partitions`.
+            metadata (dict, optional): Arbitrary metadata, ignored by Kedro.
+        """
+        self._path = path
+        self._legacy_filepath = legacy_filepath
+        self._migrate_legacy = migrate_legacy
+        self._load_args = load_args or {}
+        self.metadata = metadata
+
+    def _load(self) -> pd.DataFrame:
+        if (
+            self._migrate_legacy
+            and self._legacy_filepath
+            and os.path.exists(self._legacy_filepath)
+            and not is_partitioned(self._path)
+        ):
+            migrate_csv_to_partitions(self._legacy_filepath, self._path)
+
+        return read_partitions(self._path, legacy_filepath=self._legacy_filepath, **self._load_args)
+
+    def _save(self, data: pd.DataFrame) -> None:
+        append_partitions(self._path, data)
+
+    def _exists(self) -> bool:
+        return is_partitioned(self._path) or bool(
+            self._legacy_filepath and os.path.exists(self._legacy_filepath)
+        )
+
+    def _describe(self) -> Dict[str, Any]:
+        return {
+            "path": self._path,
+            "legacy_filepath": self._legacy_filepath,
+            "migrate_legacy": self._migrate_legacy,
+            "load_args": self._load_args,
+        }
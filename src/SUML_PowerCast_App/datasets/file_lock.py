@@ -0,0 +1,63 @@
+"""
+Lock that is exclusive across the threads and the processes writing the raw dataset.
+
+The API's prediction log, the zone backfill and the CSV migration all take the lock
+on `<raw csv path>.lock`, so none of them sees the data half-written by another.
+"""
+
+import os
+import threading
+
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
+
+
+class FileLock:
+    """
+    Lock that is exclusive across threads and across processes.
+
+    Threads of one process serialise on an in-process lock, processes on an OS
+    lock taken on a separate `.lock` file. The object can be reused with `with`.
+    """
+
+    def __init__(self, lock_path: str):
+        self.lock_path = lock_path
+        self._thread_lock = threading.Lock()
+        self._handle = None
+
+    def __enter__(self):
+        self._thread_lock.acquire()
+        try:
+            self._handle = open(self.lock_path, "a+b")
+            if os.name == "nt":
+                self._handle.seek(0)
+                # LK_LOCK retries for ~10 s, loop until the other process releases it
+                while True:
+                    try:
+                        msvcrt.locking(self._handle.fileno(), msvcrt.LK_LOCK, 1)
+                        break
+                    except OSError:
+                        continue
+            else:
+                fcntl.flock(self._handle.fileno(), fcntl.LOCK_EX)
+        except Exception:
+            if self._handle is not None:
+                self._handle.close()
+                self._handle = None
+            self._thread_lock.release()
+            raise
+        return self
+
+    def __exit__(self, *exc_info):
+        try:
+            if os.name == "nt":
+                self._handle.seek(0)
+                msvcrt.locking(self._handle.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(self._handle.fileno(), fcntl.LOCK_UN)
+        finally:
+            self._handle.close()
+            self._handle = None
+            self._thread_lock.release()
@@ -0,0 +1,25 @@
+"""
+Pickle dataset loading as empty while its file has not been written yet.
+"""
+
+from typing import Any
+
+from kedro_datasets.pickle import PickleDataset
+
+
+class OptionalPickleDataset(PickleDataset):
+    """
+    `pickle.PickleDataset` that loads an empty dict while its file doesn't exist, so
+    the API can start on the baseline tier before the first AutoGluon training.
+
+    Example catalog entry:
+
+        best_models:
+          type: SUML_PowerCast_App.datasets.OptionalPickleDataset
+          filepath: data/06_models/best_models.pkl
+    """
+
+    def load(self) -> Any:
+        if not self._exists():
+            return {}
+        return super().load()
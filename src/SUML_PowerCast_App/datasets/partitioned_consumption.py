@@ -0,0 +1,244 @@
+"""
+Month-partitioned Parquet storage for the raw power consumption data.
+
+Rows live in `<path>/month=YYYY-MM/part-*.parquet`, with float32 measurement
+columns. New rows are written as small append segments, which `compact` merges
+per month. Readers load only the columns and months they ask for.
+
+Until the data has been migrated, reads fall back to the legacy CSV, so the
+dataset can be used before and after `migrate_csv_to_partitions` has run.
+
+`pyarrow.parquet` and `pyarrow.dataset` are imported by the functions needing them,
+so an API serving from the CSV doesn't load them. pandas imports the core of pyarrow
+by itself whenever it is installed, so that part is loaded either way. The Kedro
+dataset is in `consumption_dataset`.
+"""
+
+import glob
+import os
+import shutil
+import time
+import uuid
+from typing import Iterable, List, Optional
+
+import pandas as pd
+
+from .file_lock import FileLock
+
+DATETIME_FORMAT = "%m/%d/%Y %H:%M"
+FLOAT_COLUMNS = [
+    "Temperature",
+    "Humidity",
+    "WindSpeed",
+    "GeneralDiffuseFlows",
+    "DiffuseFlows",
+    "PowerConsumption_Zone1",
+    "PowerConsumption_Zone2",
+    "PowerConsumption_Zone3",
+]
+STRING_COLUMNS = ["ModelVersion"]
+STORED_COLUMNS = ["Datetime", *FLOAT_COLUMNS, *STRING_COLUMNS]
+
+
+def is_partitioned(path: str) -> bool:
+    """
+    Tells whether `path` already holds migrated partitions.
+    """
+    return bool(glob.glob(os.path.join(path, "month=*", "*.parquet")))
+
+
+def _prepare(data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Casts the columns present to the stored types: timestamp `Datetime`, float32 measurements.
+    """
+    data = data.copy()
+    if "Datetime" in data.columns and not pd.api.types.is_datetime64_any_dtype(data["Datetime"]):
+        data["Datetime"] = pd.to_datetime(data["Datetime"], format=DATETIME_FORMAT, errors="coerce")
+    for column in FLOAT_COLUMNS:
+        if column in data.columns:
+            data[column] = pd.to_numeric(data[column], errors="coerce").astype("float32")
+    for column in STRING_COLUMNS:
+        if column in data.columns:
+            data[column] = data[column].astype("string")
+    return data
+
+
+def _to_stored_schema(data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Gives rows exactly the stored columns, so every segment shares one schema.
+    """
+    return _prepare(data.reindex(columns=STORED_COLUMNS))
+
+
+def _write_segment(table, directory: str, prefix: str, durable: bool = False) -> str:
+    """
+    Writes one Parquet file atomically: readers ignore the dot-prefixed temporary name.
+    """
+    import pyarrow.parquet as pq
+
+    os.makedirs(directory, exist_ok=True)
+    name = f"{prefix}-{time.time_ns()}-{uuid.uuid4().hex[:8]}.parquet"
+    tmp_path = os.path.join(directory, f".{name}.tmp")
+    final_path = os.path.join(directory, name)
+
+    pq.write_table(table, tmp_path)
+    if durable:
+        fd = os.open(tmp_path, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+    os.replace(tmp_path, final_path)
+    return final_path
+
+
+def append_partitions(path: str, data: pd.DataFrame, durable: bool = False) -> List[str]:
+    """
+    Appends rows as one new segment per month they fall into.
+
+    Args:
+        path (str): Root directory of the partitioned dataset.
+        data (pd.DataFrame): Rows with a `Datetime` column.
+        durable (bool): Fsync every segment before it becomes visible.
+
+    Returns:
+        list: Months (`YYYY-MM`) that received a segment.
+    """
+    import pyarrow as pa
+
+    data = _to_stored_schema(data)
+    months = data["Datetime"].dt.strftime("%Y-%m")
+
+    touched = []
+    for month, rows in data.groupby(months, sort=True):
+        table = pa.Table.from_pandas(rows, preserve_index=False)
+        _write_segment(table, os.path.join(path, f"month={month}"), "part", durable)
+        touched.append(month)
+    return touched
+
+
+def compact_partitions(path: str, months: Optional[Iterable[str]] = None, min_segments: int = 2) -> int:
+    """
+    Merges the segments of each month into a single file.
+
+    Args:
+        path (str): Root directory of the partitioned dataset.
+        months (iterable, optional): Months to compact; defaults to all of them.
+        min_segments (int): Only months with at least this many segments are compacted.
+
+    Returns:
+        int: Number of months that were compacted.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    if months is None:
+        directories = sorted(glob.glob(os.path.join(path, "month=*")))
+    else:
+        directories = [os.path.join(path, f"month={month}") for month in months]
+
+    compacted = 0
+    for directory in directories:
+        segments = sorted(glob.glob(os.path.join(directory, "*.parquet")))
+        if len(segments) < min_segments:
+            continue
+
+        rows = pd.concat([pq.read_table(segment).to_pandas() for segment in segments], ignore_index=True)
+        table = pa.Table.from_pandas(_to_stored_schema(rows), preserve_index=False)
+        _write_segment(table, directory, "compact")
+        # The merged file is visible before the segments are gone, a reader may briefly
+        # see those rows twice but never misses any
+        for segment in segments:
+            os.remove(segment)
+        compacted += 1
+
+    return compacted
+
+
+def migrate_csv_to_partitions(csv_path: str, path: str, chunksize: int = 100_000) -> int:
+    """
+    One-time copy of the legacy CSV into month partitions; the CSV is left in place.
+
+    The partitions are built in a temporary directory renamed to `path` once complete,
+    so an interrupted migration leaves readers on the CSV. The lock of the CSV is held
+    throughout: an API logging to the CSV in the "auto" storage waits, then writes to
+    the partitions.
+
+    Returns:
+        int: Number of migrated rows, 0 if `path` was already migrated.
+    """
+    with FileLock(f"{csv_path}.lock"):
+        if is_partitioned(path):
+            print(f"{path} is already migrated")
+            return 0
+
+        tmp_path = f"{os.path.normpath(path)}.migrating-{uuid.uuid4().hex[:8]}"
+        try:
+            rows = 0
+            for chunk in pd.read_csv(csv_path, chunksize=chunksize):
+                append_partitions(tmp_path, chunk)
+                rows += len(chunk)
+            compact_partitions(tmp_path)
+            if os.path.isdir(path):
+                # Only an empty directory can be replaced, anything else is left to the user
+                os.rmdir(path)
+            os.replace(tmp_path, path)
+        except BaseException:
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            raise
+
+    print(f"Migrated {rows} rows from {csv_path} to {path}")
+    return rows
+
+
+def read_partitions(
+    path: str,
+    columns: Optional[List[str]] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    legacy_filepath: Optional[str] = None
+) -> pd.DataFrame:
+    """
+    Reads the requested columns of the months between `since` and `until` (inclusive).
+
+    Args:
+        path (str): Root directory of the partitioned dataset.
+        columns (list, optional): Columns to read; defaults to all of them.
+        since (str, optional): First month to read, `YYYY-MM`.
+        until (str, optional): Last month to read, `YYYY-MM`.
+        legacy_filepath (str, optional): CSV read instead while `path` holds no partitions.
+
+    Returns:
+        pd.DataFrame: The selected rows and columns.
+    """
+    if not is_partitioned(path):
+        if legacy_filepath is None or not os.path.exists(legacy_filepath):
+            return pd.DataFrame(columns=columns or ["Datetime", *FLOAT_COLUMNS])
+        usecols = columns
+        if columns is not None and (since or until) and "Datetime" not in columns:
+            usecols = [*columns, "Datetime"]
+        # Parse measurements straight to float32 instead of casting a float64 frame
+        dtype = {column: "float32" for column in (usecols or FLOAT_COLUMNS) if column in FLOAT_COLUMNS}
+        # Columns the CSV predates, like `ModelVersion`, come back empty as in the partitions
+        data = pd.read_csv(legacy_filepath, usecols=usecols and (lambda column: column in usecols), dtype=dtype)
+        data = _prepare(data if usecols is None else data.reindex(columns=usecols))
+        if since or until:
+            months = data["Datetime"].dt.strftime("%Y-%m")
+            data = data[(months >= (since or "")) & (months <= (until or "9999-99"))]
+        if usecols is not columns:
+            data = data[columns]
+        return data.reset_index(drop=True)
+
+    import pyarrow.dataset as ds
+
+    dataset = ds.dataset(path, format="parquet", partitioning="hive")
+    month = ds.field("month")
+    expression = None
+    if since:
+        expression = month >= since
+    if until:
+        expression = month <= until if expression is None else expression & (month <= until)
+
+    table = dataset.to_table(columns=columns, filter=expression)
+    data = table.to_pandas()
+    return data.drop(columns=["month"], errors="ignore")
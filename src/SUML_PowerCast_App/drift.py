@@ -0,0 +1,111 @@
+"""
+Distribution profiles shared by the training-time reference and the API's drift monitor.
+
+A profile keeps, per column, the count, mean and standard deviation and a histogram
+over fixed bins cut at the reference deciles. `RunningStats` maintains the same
+summary over a stream in constant memory, so the two can be compared without
+keeping or rescanning the rows.
+"""
+
+import math
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+# Floor of a bin's share in the PSI, so empty bins don't make it infinite
+PSI_EPSILON = 1e-4
+
+
+def histogram_cuts(values: np.ndarray, bins: int = 10) -> List[float]:
+    """
+    Cut points at the quantiles of `values`, giving bins of roughly equal mass.
+    """
+    quantiles = np.linspace(0, 1, bins + 1)[1:-1]
+    return [float(cut) for cut in np.unique(np.quantile(values, quantiles))]
+
+
+def histogram_counts(values: np.ndarray, cuts: List[float]) -> np.ndarray:
+    """
+    Counts `values` per bin; the outer bins are open, so no value falls outside.
+    """
+    return np.bincount(np.searchsorted(cuts, values, side="right"), minlength=len(cuts) + 1)
+
+
+def build_profile(frame: pd.DataFrame, bins: int = 10) -> Dict[str, dict]:
+    """
+    Summarises every column of `frame` for the drift monitor.
+
+    Args:
+        frame (pd.DataFrame): Reference values, one column per feature or zone.
+        bins (int): Number of histogram bins.
+
+    Returns:
+        dict: Per column: `count`, `mean`, `std`, the bin `cuts` and the share of rows per bin.
+    """
+    profile = {}
+    for column in frame.columns:
+        values = pd.to_numeric(frame[column], errors="coerce").dropna().to_numpy(dtype="float64")
+        if len(values) == 0:
+            continue
+        cuts = histogram_cuts(values, bins)
+        counts = histogram_counts(values, cuts)
+        profile[column] = {
+            "count": int(len(values)),
+            "mean": float(values.mean()),
+            "std": float(values.std()),
+            "cuts": cuts,
+            "fractions": (counts / len(values)).tolist(),
+        }
+    return profile
+
+
+def psi(expected: List[float], actual: List[float]) -> float:
+    """
+    Population stability index between two binned distributions given as shares.
+    Below 0.1 is usually read as stable, above 0.2 as a significant shift.
+    """
+    total = 0.0
+    for expected_share, actual_share in zip(expected, actual):
+        expected_share = max(expected_share, PSI_EPSILON)
+        actual_share = max(actual_share, PSI_EPSILON)
+        total += (actual_share - expected_share) * math.log(actual_share / expected_share)
+    return total
+
+
+class RunningStats:
+    """
+    Count, mean, variance and histogram of one column, updated batch by batch.
+
+    The mean and variance follow Welford's algorithm, in the form merging a whole
+    batch at once (Chan et al.), so updates cost one vectorised pass per batch.
+    """
+
+    def __init__(self, cuts: List[float]):
+        self.cuts = cuts
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.counts = np.zeros(len(cuts) + 1, dtype="int64")
+
+    def update(self, values: np.ndarray):
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return
+        batch_count = len(values)
+        batch_mean = float(values.mean())
+        batch_m2 = float(np.square(values - batch_mean).sum())
+
+        total = self.count + batch_count
+        delta = batch_mean - self.mean
+        self.mean += delta * batch_count / total
+        self._m2 += batch_m2 + delta * delta * self.count * batch_count / total
+        self.count = total
+        self.counts += histogram_counts(values, self.cuts)
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self._m2 / self.count) if self.count else 0.0
+
+    def fractions(self) -> List[float]:
+        return (self.counts / self.count).tolist() if self.count else [0.0] * len(self.counts)
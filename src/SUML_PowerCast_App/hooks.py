@@ -0,0 +1,180 @@
+"""
+Project hooks registered in `settings.py`.
+"""
+
+import cProfile
+import json
+import os
+import time
+from datetime import datetime
+
+from kedro.framework.hooks import hook_impl
+
+from SUML_PowerCast_App.node_cache import cache_stats, configure as configure_node_cache
+from SUML_PowerCast_App.profiling import PeakRssSampler, describe_size
+from SUML_PowerCast_App.progress import report_progress
+
+
+class ProgressHooks:
+    """
+    Reports the node that is about to run to the progress sink.
+    """
+
+    @hook_impl
+    def before_node_run(self, node):
+        report_progress(node=node.name)
+
+
+class NodeCacheHooks:
+    """
+    Configures the node output cache from the `node_cache` parameters and reports
+    the hits and misses of every cached node when a run ends.
+    """
+
+    @hook_impl
+    def after_context_created(self, context):
+        node_cache = context.params.get("node_cache") or {}
+        configure_node_cache(
+            enabled=node_cache.get("enabled", False),
+            path=node_cache.get("path", "data/02_intermediate/node_cache"),
+            ignore_params=node_cache.get("ignore_params")
+        )
+
+    @hook_impl
+    def after_pipeline_run(self):
+        for name, counts in cache_stats().items():
+            print(f"Node cache {name}: {counts['hits']} hits, {counts['misses']} misses")
+
+
+def _cpu_seconds() -> float:
+    """
+    CPU time of this process and of the child processes it has waited for.
+    """
+    times = os.times()
+    return times.user + times.system + times.children_user + times.children_system
+
+
+class ProfilingHooks:
+    """
+    Records wall time, CPU time, peak RSS and dataset sizes of every node and writes
+    one JSON report per run, configured by the `profiling` parameters.
+
+    Nodes listed in `profiling.cprofile_nodes` are also run under cProfile, their
+    stats are dumped next to the report and can be opened with pstats or snakeviz.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.report_dir = "data/08_reporting/performance"
+        self.cprofile_nodes = set()
+        self.rss_interval_s = 0.1
+        self._run = None
+        self._running = {}
+
+    @hook_impl
+    def after_context_created(self, context):
+        profiling = context.params.get("profiling") or {}
+        self.enabled = profiling.get("enabled", False)
+        self.report_dir = profiling.get("report_dir", self.report_dir)
+        self.cprofile_nodes = set(profiling.get("cprofile_nodes") or [])
+        self.rss_interval_s = profiling.get("rss_interval_s", self.rss_interval_s)
+
+    @hook_impl
+    def before_pipeline_run(self, run_params):
+        if not self.enabled:
+            return
+        started_at = datetime.now()
+        self._run = {
+            "run_id": f"{started_at.strftime('%Y%m%d-%H%M%S')}-{run_params.get('pipeline_name') or '__default__'}",
+            "pipeline": run_params.get("pipeline_name") or "__default__",
+            "session_id": run_params.get("session_id"),
+            "started_at": started_at.isoformat(timespec="seconds"),
+            "nodes": [],
+            "_wall": time.perf_counter(),
+            "_cpu": _cpu_seconds(),
+        }
+
+    @hook_impl
+    def before_node_run(self, node, inputs):
+        if self._run is None:
+            return
+        sampler = PeakRssSampler(self.rss_interval_s)
+        sampler.start()
+        profiler = None
+        if node.name in self.cprofile_nodes:
+            profiler = cProfile.Profile()
+            profiler.enable()
+        self._running[node.name] = {
+            "inputs": {name: describe_size(value) for name, value in inputs.items()},
+            "sampler": sampler,
+            "profiler": profiler,
+            "wall": time.perf_counter(),
+            "cpu": _cpu_seconds(),
+        }
+
+    @hook_impl
+    def after_node_run(self, node, outputs):
+        self._finish_node(node, outputs=outputs)
+
+    @hook_impl
+    def on_node_error(self, error, node):
+        self._finish_node(node, error=error)
+
+    @hook_impl
+    def after_pipeline_run(self):
+        self._write_report("succeeded")
+
+    @hook_impl
+    def on_pipeline_error(self, error):
+        self._write_report("failed", error)
+
+    def _finish_node(self, node, outputs=None, error=None):
+        running = self._running.pop(node.name, None)
+        if running is None:
+            return
+
+        wall_s = time.perf_counter() - running["wall"]
+        cpu_s = _cpu_seconds() - running["cpu"]
+        peak_rss = running["sampler"].stop()
+
+        record = {
+            "node": node.name,
+            "status": "failed" if error is not None else "succeeded",
+            "wall_s": round(wall_s, 3),
+            "cpu_s": round(cpu_s, 3),
+            "peak_rss_mb": round(peak_rss / 2**20, 1),
+            "inputs": running["inputs"],
+            "outputs": {name: describe_size(value) for name, value in (outputs or {}).items()},
+        }
+        if error is not None:
+            record["error"] = str(error)
+
+        if running["profiler"] is not None:
+            running["profiler"].disable()
+            os.makedirs(self.report_dir, exist_ok=True)
+            profile_path = os.path.join(self.report_dir, f"{self._run['run_id']}-{node.name}.prof")
+            running["profiler"].dump_stats(profile_path)
+            record["profile"] = profile_path
+
+        self._run["nodes"].append(record)
+        print(f"Node {node.name}: {wall_s:.1f}s wall, {cpu_s:.1f}s CPU, peak RSS {record['peak_rss_mb']} MB")
+
+    def _write_report(self, status, error=None):
+        if self._run is None:
+            return
+        run, self._run = self._run, None
+        for name in list(self._running):
+            self._running.pop(name)["sampler"].stop()
+
+        report = {key: value for key, value in run.items() if not key.startswith("_")}
+        report["status"] = status
+        report["error"] = str(error) if error is not None else None
+        report["wall_s"] = round(time.perf_counter() - run["_wall"], 3)
+        report["cpu_s"] = round(_cpu_seconds() - run["_cpu"], 3)
+        report["peak_rss_mb"] = max((node["peak_rss_mb"] for node in run["nodes"]), default=None)
+
+        os.makedirs(self.report_dir, exist_ok=True)
+        report_path = os.path.join(self.report_dir, f"{run['run_id']}.json")
+        with open(report_path, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+        print(f"Performance report written to {report_path}")
@@ -0,0 +1,281 @@
+"""
+Content-hash caching of node outputs.
+
+A node function wrapped with `cached` fingerprints its inputs (data, parameters and
+the source of the node's module). When the fingerprint matches the last run, the
+outputs persisted by that run are returned instead of running the node again, so a
+retrain on unchanged data and parameters only costs the hashing.
+
+Saved models, e.g. a `TabularPredictor`, are identified by their directory and the
+key of the cached run that wrote it, not by the files: later nodes such as
+`evaluate_models` rewrite the predictor's metadata in place, which must not
+invalidate the training entry nor the inputs of the next node.
+
+Entries store such models as their class and directory and load them back on a hit,
+so the cache never holds a second copy of them. Other outputs, like the split
+frames, are pickled whole.
+
+The cache is configured from the `node_cache` parameters by `NodeCacheHooks`.
+"""
+
+import functools
+import hashlib
+import importlib
+import inspect
+import os
+import pickle
+from typing import Any, Callable, Dict, Iterable, Optional
+
+import pandas as pd
+
+CACHE_PATH = "data/02_intermediate/node_cache"
+ARTIFACTS_NAME = "artifacts.pkl"
+
+_config = {
+    "enabled": False,
+    "path": CACHE_PATH,
+    "ignore_params": [],
+}
+_stats: Dict[str, Dict[str, int]] = {}
+
+
+def configure(enabled: bool = False, path: str = CACHE_PATH, ignore_params: Optional[Iterable[str]] = None):
+    """
+    Sets up the cache for the current run.
+
+    Args:
+        enabled (bool): Reuse outputs of unchanged nodes.
+        path (str): Directory holding one entry per cached node.
+        ignore_params (list, optional): Top-level parameter keys left out of fingerprints,
+            e.g. `api`, which has no effect on training.
+    """
+    _config.update(enabled=enabled, path=path, ignore_params=list(ignore_params or []))
+
+
+def cache_stats() -> Dict[str, Dict[str, int]]:
+    """
+    Returns the hits and misses of every cached node since the process started.
+    """
+    return {name: dict(counts) for name, counts in _stats.items()}
+
+
+def _artifact_path(value: Any) -> Optional[str]:
+    """
+    Returns the directory of a saved model, or None for any other value.
+    """
+    path = getattr(value, "path", None)
+    if isinstance(path, str) and os.path.isdir(path):
+        return os.path.abspath(path)
+    return None
+
+
+class _SavedModel:
+    """
+    Stands in for a saved model in a cache entry: its class and its directory.
+    """
+
+    def __init__(self, model: Any, path: str):
+        self.module = type(model).__module__
+        self.qualname = type(model).__qualname__
+        self.path = path
+
+    def load(self) -> Any:
+        model_class = getattr(importlib.import_module(self.module), self.qualname)
+        return model_class.load(self.path)
+
+
+def _to_entry(value: Any) -> Any:
+    """
+    Replaces the saved models in `value` by references to their directories.
+    """
+    if isinstance(value, dict):
+        return {key: _to_entry(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return type(value)(_to_entry(item) for item in value)
+    path = _artifact_path(value)
+    if path is not None and callable(getattr(type(value), "load", None)):
+        return _SavedModel(value, path)
+    return value
+
+
+def _from_entry(value: Any) -> Any:
+    """
+    Loads the saved models referenced in `value` back from their directories.
+    """
+    if isinstance(value, dict):
+        return {key: _from_entry(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return type(value)(_from_entry(item) for item in value)
+    if isinstance(value, _SavedModel):
+        return value.load()
+    return value
+
+
+def _load_artifacts() -> Dict[str, str]:
+    """
+    Returns the key of the cached run that last wrote each model directory.
+    """
+    artifacts_path = os.path.join(_config["path"], ARTIFACTS_NAME)
+    if not os.path.exists(artifacts_path):
+        return {}
+    try:
+        with open(artifacts_path, "rb") as file:
+            return pickle.load(file)
+    except Exception:
+        return {}
+
+
+def _collect_artifact_paths(value: Any) -> set:
+    """
+    Returns the directories of the saved models in `value`, searching dicts, lists and tuples.
+    """
+    if isinstance(value, dict):
+        value = list(value.values())
+    if isinstance(value, (list, tuple)):
+        return set().union(*(_collect_artifact_paths(item) for item in value))
+    path = _artifact_path(value)
+    return set() if path is None else {path}
+
+
+def _record_artifacts(paths: Iterable[str], key: str):
+    """
+    Records `key` as the writer of the model directories in `paths`.
+    """
+    paths = list(paths)
+    if not paths:
+        return
+
+    artifacts = _load_artifacts()
+    artifacts.update({path: key for path in paths})
+    os.makedirs(_config["path"], exist_ok=True)
+    artifacts_path = os.path.join(_config["path"], ARTIFACTS_NAME)
+    with open(f"{artifacts_path}.tmp", "wb") as file:
+        pickle.dump(artifacts, file)
+    os.replace(f"{artifacts_path}.tmp", artifacts_path)
+
+
+def _update_hash(digest, value: Any, artifacts: Optional[Dict[str, str]] = None):
+    """
+    Feeds a stable representation of `value` into `digest`.
+    """
+    artifact_path = _artifact_path(value)
+    if isinstance(value, bytes):
+        digest.update(value)
+    elif isinstance(value, (pd.DataFrame, pd.Series)):
+        labels = list(value.columns) if isinstance(value, pd.DataFrame) else [value.name]
+        digest.update(repr((type(value).__name__, value.shape, labels)).encode())
+        digest.update(repr(list(value.dtypes) if isinstance(value, pd.DataFrame) else value.dtype).encode())
+        digest.update(pd.util.hash_pandas_object(value, index=True).values.tobytes())
+    elif isinstance(value, dict):
+        digest.update(b"dict")
+        for key in sorted(value, key=str):
+            digest.update(repr(key).encode())
+            _update_hash(digest, value[key], artifacts)
+    elif isinstance(value, (list, tuple)):
+        digest.update(type(value).__name__.encode())
+        for item in value:
+            _update_hash(digest, item, artifacts)
+    elif artifact_path is not None:
+        # Saved models: the directory and the cached run that wrote it identify them
+        artifacts = _load_artifacts() if artifacts is None else artifacts
+        writer = artifacts.get(artifact_path)
+        digest.update(f"model:{artifact_path}:{writer}".encode())
+        if writer is None:
+            # Written outside the cache, fall back to the state of the files
+            for root, _, files in sorted(os.walk(artifact_path)):
+                for name in sorted(files):
+                    stat = os.stat(os.path.join(root, name))
+                    digest.update(f"{os.path.relpath(os.path.join(root, name), artifact_path)}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+    else:
+        digest.update(repr(value).encode())
+
+
+def fingerprint(*values: Any) -> str:
+    """
+    Returns the content hash of `values`.
+    """
+    digest = hashlib.sha256()
+    artifacts = _load_artifacts()
+    for value in values:
+        _update_hash(digest, value, artifacts)
+    return digest.hexdigest()
+
+
+def _without_ignored_params(value: Any) -> Any:
+    if isinstance(value, dict) and _config["ignore_params"]:
+        return {key: item for key, item in value.items() if key not in _config["ignore_params"]}
+    return value
+
+
+def _load_entry(entry_path: str, key: str):
+    """
+    Returns the cached outputs, or None if the entry is missing, stale or its
+    saved models were deleted or rewritten by another run since.
+    """
+    if not os.path.exists(entry_path):
+        return None
+    try:
+        with open(entry_path, "rb") as file:
+            entry = pickle.load(file)
+        if entry["key"] != key:
+            return None
+        outputs = _from_entry(entry["outputs"])
+    except Exception as e:
+        print(f"Ignoring unreadable node cache entry {entry_path}: {e}")
+        return None
+
+    if fingerprint(outputs) != entry["outputs_fingerprint"]:
+        return None
+    return outputs
+
+
+def _save_entry(entry_path: str, key: str, outputs: Any):
+    os.makedirs(os.path.dirname(entry_path), exist_ok=True)
+    tmp_path = f"{entry_path}.tmp"
+    entry = {"key": key, "outputs": _to_entry(outputs), "outputs_fingerprint": fingerprint(outputs)}
+    with open(tmp_path, "wb") as file:
+        pickle.dump(entry, file)
+    os.replace(tmp_path, entry_path)
+
+
+def cached(func: Callable) -> Callable:
+    """
+    Wraps a node function so its outputs are reused while its inputs are unchanged.
+
+    Only the latest entry of each function is kept. Outputs referring to saved models
+    are reused only while no other run has written to their directories.
+    """
+    source_path = inspect.getsourcefile(func)
+    name = func.__name__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not _config["enabled"]:
+            return func(*args, **kwargs)
+
+        with open(source_path, "rb") as file:
+            source = file.read()
+        key = fingerprint(
+            source,
+            [_without_ignored_params(arg) for arg in args],
+            {key: _without_ignored_params(value) for key, value in kwargs.items()}
+        )
+        entry_path = os.path.join(_config["path"], f"{name}.pkl")
+        counts = _stats.setdefault(name, {"hits": 0, "misses": 0})
+
+        outputs = _load_entry(entry_path, key)
+        if outputs is not None:
+            counts["hits"] += 1
+            print(f"Node cache hit for {name}, reusing outputs from the previous run")
+            return outputs
+
+        counts["misses"] += 1
+        print(f"Node cache miss for {name}")
+        outputs = func(*args, **kwargs)
+        # Models passed through from the inputs, like the predictors evaluate_models
+        # returns, keep their writer. Record it first, the entry's fingerprint depends on it
+        _record_artifacts(_collect_artifact_paths(outputs) - _collect_artifact_paths(list(args)), key)
+        _save_entry(entry_path, key, outputs)
+        return outputs
+
+    return wrapper
@@ -2,11 +2,19 @@ from kedro.pipeline import Pipeline
 from SUML_PowerCast_App.pipelines.data_science import pipeline as ds_pipeline
 from SUML_PowerCast_App.pipelines.app_run import pipeline as app_pipeline
 from SUML_PowerCast_App.pipelines.model_training import pipeline as model_training_pipeline
+from SUML_PowerCast_App.pipelines.batch_scoring import pipeline as batch_scoring_pipeline
+from SUML_PowerCast_App.pipelines.backtesting import pipeline as backtesting_pipeline
 def register_pipelines():
     return {
         "ds": ds_pipeline.create_pipeline(),
         "app": app_pipeline.create_pipeline(),
         "model_training": model_training_pipeline.create_pipeline(),
+        "baseline_training": model_training_pipeline.create_pipeline().only_nodes(
+            "split_data_node", "train_baseline_models_node"
+        ),
+        "incremental_training": model_training_pipeline.create_incremental_pipeline(),
+        "batch_scoring": batch_scoring_pipeline.create_pipeline(),
+        "backtesting": backtesting_pipeline.create_pipeline(),
         "full": Pipeline(
             model_training_pipeline.create_pipeline().nodes + app_pipeline.create_pipeline().nodes
         ),
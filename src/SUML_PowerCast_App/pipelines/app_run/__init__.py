@@ -3,8 +3,14 @@ This is a boilerplate pipeline 'app_run'
 generated using Kedro 0.19.10
 """
 
-from .pipeline import create_pipeline
-
 __all__ = ["create_pipeline"]
 
 __version__ = "0.1"
+
+
+def __getattr__(name):
+    # Imported on first use, so the serving modules can be used without loading Kedro
+    if name == "create_pipeline":
+        from .pipeline import create_pipeline
+        return create_pipeline
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,17 +1,47 @@
 import pandas as pd
 import os
-from kedro.framework.context import KedroContext
-from fastapi import FastAPI, HTTPException
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Response
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
-from typing import Optional, Dict, List
+from typing import Callable, Optional, Dict, List, Tuple, Union
 from autogluon.tabular import TabularPredictor
 from multiprocessing import Process
 from datetime import datetime
 import uvicorn
-from kedro.framework.hooks import _create_hook_manager
-from kedro.config import OmegaConfigLoader
-from kedro.framework.session import KedroSession
-from kedro.framework.startup import bootstrap_project
+
+from SUML_PowerCast_App.datasets.file_lock import FileLock
+from SUML_PowerCast_App.datasets.partitioned_consumption import is_partitioned
+
+from .backfill import FEATURE_COLUMNS, BackfillJob
+from .batching import PredictionBatcher
+from .drift_monitor import REFERENCE_PROFILE_PATH, DriftMonitor
+from .fallback import BaselineFallback
+from .metrics import (
+    MetricsMiddleware,
+    init_metrics,
+    observe_feature_frame,
+    observe_log_append,
+    observe_log_flush,
+    observe_predict,
+    render_metrics,
+    set_model_loaded,
+    set_time_to_ready,
+    update_process_metrics,
+)
+from .model_store import BASELINE_MODELS_PATH, BEST_MODELS_PATH, LoadedModels, ModelStore, resolve_predictors
+from .prediction_cache import PredictionCache
+from .prediction_log import TIER_COLUMN, PredictionLog
+from .rollup import MonthlyRollup
+from .training_jobs import TRAINING_STATE_PATH, TrainingJobManager
+
+
+RAW_DATA_PATH = "data/01_raw/powerconsumption.csv"
+PARTITIONED_DATA_PATH = "data/01_raw/powerconsumption"
+ZONE_COLUMNS = ["PowerConsumption_Zone1", "PowerConsumption_Zone2", "PowerConsumption_Zone3"]
+TRAINING_PIPELINES = {"full": "model_training", "incremental": "incremental_training"}
 
 
 class WeatherInput(BaseModel):
@@ -21,6 +51,37 @@ class WeatherInput(BaseModel):
     general_diffuse_flows: float
     diffuse_flows: float
     target_zones: Optional[List[int]] = None  # Zone to predict; 1, 2, or 3
+    # When the weather was measured, `YYYY-MM-DD HH:MM:SS`; logged as the request time if omitted
+    datetime: Optional[str] = None
+
+
+class BatchWeatherInput(BaseModel):
+    """
+    Many weather points scored in one request, either as a list of records
+    or as columns keyed by the `WeatherInput` field names. Each record is logged
+    with its own `datetime`, the ones without it share the time of the request.
+    """
+    records: Optional[List[WeatherInput]] = None
+    columns: Optional[Dict[str, List[Union[float, str, None]]]] = None
+    target_zones: Optional[List[int]] = None
+
+    def to_records(self) -> List[WeatherInput]:
+        if self.records is not None:
+            return self.records
+        if not self.columns:
+            return []
+
+        lengths = {len(values) for values in self.columns.values()}
+        if len(lengths) != 1:
+            raise HTTPException(status_code=400, detail="All columns must have the same length.")
+        try:
+            return [
+                WeatherInput(**dict(zip(self.columns, row)))
+                for row in zip(*self.columns.values())
+            ]
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=f"Invalid columnar payload: {str(e)}")
+
 
 def format_datetime_for_file(input_datetime: str) -> str:
     """
@@ -35,103 +96,691 @@ def format_datetime_for_file(input_datetime: str) -> str:
         raise HTTPException(status_code=400, detail=f"Invalid datetime format: {str(e)}")
 
 
-def append_to_csv(file_path, data):
+def build_feature_frame(records: List[WeatherInput], timestamp: str) -> pd.DataFrame:
     """
-    Appends data to a CSV file, creating it if it doesn't exist.
+    Builds one model input frame from a list of weather records, dated with each
+    record's `datetime` or, for the records without one, with `timestamp`.
     """
-    df = pd.DataFrame([data])  # Convert single record to DataFrame
-    try:
-        if not os.path.exists(file_path):
-            # Create the file with headers if it doesn't exist
-            df.to_csv(file_path, mode='w', index=False, header=True)
+    return pd.DataFrame({
+        "Datetime": [
+            timestamp if record.datetime is None else format_datetime_for_file(record.datetime)
+            for record in records
+        ],
+        "Temperature": [record.temperature for record in records],
+        "Humidity": [record.humidity for record in records],
+        "WindSpeed": [record.wind_speed for record in records],
+        "GeneralDiffuseFlows": [record.general_diffuse_flows for record in records],
+        "DiffuseFlows": [record.diffuse_flows for record in records],
+    })
+
+
+def resolve_zone_keys(target_zones: Optional[List[int]], zones: List[str]) -> List[str]:
+    """
+    Maps requested zone numbers to model keys, or returns every zone if none were requested.
+    """
+    if not target_zones:
+        return list(zones)
+
+    zone_keys = []
+    for zone in target_zones:
+        zone_key = f"PowerConsumption_Zone{zone}"
+        if zone_key not in zones:
+            raise HTTPException(status_code=404, detail=f"Model for {zone_key} not found.")
+        zone_keys.append(zone_key)
+    return zone_keys
+
+
+def getPredictions(
+    input_data: WeatherInput,
+    models: LoadedModels,
+    prediction_log: PredictionLog,
+    requested_zones_only: bool = False,
+    cache: Optional[PredictionCache] = None,
+    fallback: Optional[BaselineFallback] = None
+):
+    zone_keys = resolve_zone_keys(input_data.target_zones, models.zones)
+    all_predictions = score_records(
+        [input_data], models, prediction_log, zone_keys if requested_zones_only else None, cache, fallback
+    )
+
+    return {
+        "predictions": {zone_key: all_predictions[zone_key] for zone_key in zone_keys},
+        "model_version": models.version
+    }
+
+
+def score_records(
+    records: List[WeatherInput],
+    models: LoadedModels,
+    prediction_log: PredictionLog,
+    zone_keys: Optional[List[str]] = None,
+    cache: Optional[PredictionCache] = None,
+    fallback: Optional[BaselineFallback] = None
+) -> Dict[str, List[float]]:
+    """
+    Scores records with one `predict` call per zone and queues all rows in the prediction log.
+
+    Args:
+        records (list): Weather records to score.
+        models (LoadedModels): Snapshot of the served models.
+        prediction_log (PredictionLog): Write-behind log of the raw dataset.
+        zone_keys (list, optional): Zones to run inference for. Defaults to every zone;
+            skipped zones are logged as nulls and left for the backfill job.
+        cache (PredictionCache, optional): Cache filled with every scored row.
+        fallback (BaselineFallback, optional): Routes zones to the baseline estimators
+            while the AutoGluon models are cold or over their latency budget.
+
+    Returns:
+        dict: Predictions per scored zone, each a list aligned with `records`.
+    """
+    started = time.perf_counter()
+    X_new = build_feature_frame(records, datetime.now().strftime("%m/%d/%Y %H:%M"))
+    observe_feature_frame(time.perf_counter() - started)
+    zone_keys = models.zones if zone_keys is None else zone_keys
+
+    if X_new.empty:
+        return {zone: [] for zone in zone_keys}
+
+    all_predictions = {}
+    used_baseline = False
+    for zone in zone_keys:
+        # Zones without an AutoGluon model yet are always served by the baseline
+        baseline = zone in models.baseline and (
+            zone not in models.models or (fallback is not None and fallback.use_baseline(zone))
+        )
+        started = time.perf_counter()
+        if baseline:
+            all_predictions[zone] = models.baseline[zone].predict(X_new[FEATURE_COLUMNS]).tolist()
         else:
-            # Append without headers if the file exists
-            df.to_csv(file_path, mode='a', index=False, header=False)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"File operation error: {str(e)}")
-
-
-def getPredictions(input_data: WeatherInput, best_models: Dict[str, TabularPredictor]):
-    # Prepare data for prediction
-    X_new = pd.DataFrame([{
-        "Datetime": datetime.now().strftime("%m/%d/%Y %H:%M"),
-        "Temperature": input_data.temperature,
-        "Humidity": input_data.humidity,
-        "WindSpeed": input_data.wind_speed,
-        "GeneralDiffuseFlows": input_data.general_diffuse_flows,
-        "DiffuseFlows": input_data.diffuse_flows
-    }])
-
-    # Predict for the specified zone or all zones
-    all_predictions = {
-        zone: model.predict(X_new).tolist()
-        for zone, model in best_models.items()
+            all_predictions[zone] = models.models[zone].predict(X_new).tolist()
+        elapsed = time.perf_counter() - started
+        observe_predict(zone, len(X_new), elapsed, "baseline" if baseline else "autogluon")
+        if fallback is not None:
+            fallback.record(zone, elapsed, len(X_new), baseline)
+        used_baseline = used_baseline or baseline
+
+    # Baseline answers are a stopgap, later requests should get the AutoGluon ones
+    if cache is not None and not used_baseline:
+        for row, record in enumerate(records):
+            cache.put(
+                cache.make_key(record, models.version),
+                {zone: values[row] for zone, values in all_predictions.items()}
+            )
+
+    log_scored_rows(X_new, all_predictions, models, prediction_log, used_baseline)
+
+    return all_predictions
+
+
+def log_scored_rows(
+    X_new: pd.DataFrame,
+    all_predictions: Dict[str, List[float]],
+    models: LoadedModels,
+    prediction_log: PredictionLog,
+    baseline: bool = False
+):
+    """
+    Queues scored rows in the prediction log, the log writes them in bulk off the request path.
+    Rows the baseline tier predicted any zone of are marked, the drift monitor skips them.
+    """
+    started = time.perf_counter()
+    rows_to_insert = X_new.copy()
+    for zone_column in ZONE_COLUMNS:
+        rows_to_insert[zone_column] = all_predictions.get(zone_column, [None] * len(X_new))
+    rows_to_insert["ModelVersion"] = models.version
+    rows_to_insert[TIER_COLUMN] = "baseline" if baseline else "autogluon"
+
+    prediction_log.append(rows_to_insert)
+    observe_log_append(time.perf_counter() - started)
+
+
+def getCachedPredictions(
+    input_data: WeatherInput,
+    models: LoadedModels,
+    prediction_log: PredictionLog,
+    cache: PredictionCache,
+    requested_zones_only: bool = False
+) -> Optional[dict]:
+    """
+    Answers a `/predict` request from the cache, or returns None on a miss.
+
+    A hit needs every zone the request would run inference for. It is logged like a
+    scored row, so the raw dataset doesn't depend on whether the cache was used.
+    """
+    zone_keys = resolve_zone_keys(input_data.target_zones, models.zones)
+    scored_zones = zone_keys if requested_zones_only else models.zones
+
+    cached = cache.get(cache.make_key(input_data, models.version), scored_zones)
+    if cached is None:
+        return None
+
+    all_predictions = {zone: [value] for zone, value in cached.items()}
+    started = time.perf_counter()
+    X_new = build_feature_frame([input_data], datetime.now().strftime("%m/%d/%Y %H:%M"))
+    observe_feature_frame(time.perf_counter() - started)
+    log_scored_rows(X_new, all_predictions, models, prediction_log)
+
+    return {
+        "predictions": {zone_key: all_predictions[zone_key] for zone_key in zone_keys},
+        "model_version": models.version,
+        "cached": True
     }
 
-    if input_data.target_zones:
-        filtered_predictions = {}
-        for zone in input_data.target_zones:
-            zone_key = f"PowerConsumption_Zone{zone}"
-            if zone_key not in best_models:
-                raise HTTPException(status_code=404, detail=f"Model for {zone_key} not found.")
-            filtered_predictions[zone_key] = all_predictions[zone_key]
-        predictions = filtered_predictions
-    else:
-        # If no target_zones specified, predict for all zones
-        predictions = all_predictions
-
-    # Insert the prediction data into the database
-    data_to_insert = {
-        "Datetime": datetime.now().strftime("%m/%d/%Y %H:%M"),
-        "Temperature": input_data.temperature,
-        "Humidity": input_data.humidity,
-        "WindSpeed": input_data.wind_speed,
-        "GeneralDiffuseFlows": input_data.general_diffuse_flows,
-        "DiffuseFlows": input_data.diffuse_flows,
-        "PowerConsumption_Zone1": all_predictions.get("PowerConsumption_Zone1", [None])[0],
-        "PowerConsumption_Zone2": all_predictions.get("PowerConsumption_Zone2", [None])[0],
-        "PowerConsumption_Zone3": all_predictions.get("PowerConsumption_Zone3", [None])[0],
+
+def getBatchPredictions(
+    batch: BatchWeatherInput,
+    models: LoadedModels,
+    prediction_log: PredictionLog,
+    requested_zones_only: bool = False,
+    fallback: Optional[BaselineFallback] = None
+):
+    """
+    Scores many weather records with a single `predict` call per zone.
+
+    Args:
+        batch (BatchWeatherInput): Records in row or columnar form plus the requested zones.
+        models (LoadedModels): Snapshot of the served models.
+        prediction_log (PredictionLog): Write-behind log of the raw dataset.
+        requested_zones_only (bool): Run inference only for the requested zones.
+        fallback (BaselineFallback, optional): Baseline routing, see `score_records`.
+
+    Returns:
+        dict: Predictions per zone, each a list aligned with the input rows.
+    """
+    records = batch.to_records()
+    zone_keys = resolve_zone_keys(batch.target_zones, models.zones)
+    all_predictions = score_records(
+        records, models, prediction_log, zone_keys if requested_zones_only else None, fallback=fallback
+    )
+
+    return {
+        "predictions": {zone_key: all_predictions[zone_key] for zone_key in zone_keys},
+        "model_version": models.version
     }
 
 
-    append_to_csv("data/01_raw/powerconsumption.csv", data_to_insert)
+def getMicroBatchPredictions(
+    inputs: List[WeatherInput],
+    models: LoadedModels,
+    prediction_log: PredictionLog,
+    requested_zones_only: bool = False,
+    cache: Optional[PredictionCache] = None,
+    fallback: Optional[BaselineFallback] = None
+) -> List[dict]:
+    """
+    Scores single-row requests merged by the dispatcher and splits the result back per caller.
+
+    Args:
+        inputs (list): Requests collected by the `PredictionBatcher`.
+        models (LoadedModels): Snapshot of the served models, shared by the whole batch.
+        prediction_log (PredictionLog): Write-behind log of the raw dataset.
+        requested_zones_only (bool): Run inference only for zones requested by at least one input.
+        cache (PredictionCache, optional): Cache filled with every scored row.
+        fallback (BaselineFallback, optional): Baseline routing, see `score_records`.
+
+    Returns:
+        list: One `/predict` response per input, in the same order.
+    """
+    zone_keys_per_input = [resolve_zone_keys(input_data.target_zones, models.zones) for input_data in inputs]
+    zone_keys = None
+    if requested_zones_only:
+        requested = {zone_key for keys in zone_keys_per_input for zone_key in keys}
+        zone_keys = [zone_key for zone_key in models.zones if zone_key in requested]
+
+    all_predictions = score_records(inputs, models, prediction_log, zone_keys, cache, fallback)
+
+    return [
+        {
+            "predictions": {zone_key: [all_predictions[zone_key][row]] for zone_key in keys},
+            "model_version": models.version
+        }
+        for row, keys in enumerate(zone_keys_per_input)
+    ]
+
+
+def training_pipeline(mode: str, training_params: dict) -> str:
+    """
+    Maps an `/update` mode to the pipeline a training job runs.
+
+    "auto" runs the incremental retraining once a full run has recorded the
+    high-water mark and reference it needs, and the full training otherwise.
+    """
+    if mode == "auto":
+        incremental = training_params.get("incremental", False) and all(
+            os.path.exists(path) for path in (TRAINING_STATE_PATH, REFERENCE_PROFILE_PATH)
+        )
+        mode = "incremental" if incremental else "full"
+    return TRAINING_PIPELINES[mode]
+
+
+def create_prediction_cache(api_params: dict) -> Optional[PredictionCache]:
+    """
+    Builds the `/predict` result cache from the `cache` parameters, None if it is disabled.
+    """
+    cache_params = api_params.get("cache", {})
+    if not cache_params.get("enabled", False):
+        return None
+    return PredictionCache(
+        max_entries=cache_params.get("max_entries", 10000),
+        ttl_s=cache_params.get("ttl_s", 60),
+        decimals=cache_params.get("decimals", 3)
+    )
+
+
+def create_drift_monitor(api_params: dict, on_drift: Callable[[], None]) -> Optional[DriftMonitor]:
+    """
+    Builds the drift monitor from the `drift` parameters, None if it is disabled.
+    `on_drift` is only called when `auto_retrain` is set.
+    """
+    drift_params = api_params.get("drift", {})
+    if not drift_params.get("enabled", False):
+        return None
+    return DriftMonitor(
+        drift_params.get("reference_path", REFERENCE_PROFILE_PATH),
+        psi_threshold=drift_params.get("psi_threshold", 0.2),
+        min_rows=drift_params.get("min_rows", 500),
+        on_drift=on_drift if drift_params.get("auto_retrain", False) else None,
+        cooldown_s=drift_params.get("cooldown_s", 3600)
+    )
+
+
+def create_backfill_job(
+    api_params: dict,
+    get_models: Callable[[], Tuple[str, Dict[str, TabularPredictor]]],
+    lock: FileLock,
+    rollup: MonthlyRollup
+) -> Optional[BackfillJob]:
+    """
+    Builds the zone backfill job from the `backfill` parameters, None unless it applies:
+    it needs `requested_zones_only` and the CSV storage.
+    """
+    backfill_params = api_params.get("backfill", {})
+    if not (api_params.get("requested_zones_only", False) and backfill_params.get("enabled", False)):
+        return None
+    storage = api_params.get("storage", "auto")
+    if storage == "parquet" or (storage == "auto" and is_partitioned(PARTITIONED_DATA_PATH)):
+        print("Zone backfill only supports the CSV storage, it is disabled.")
+        return None
+    return BackfillJob(
+        RAW_DATA_PATH, get_models, lock,
+        interval_s=backfill_params.get("interval_s", 300),
+        # Filled cells were null and uncounted, adding them is enough
+        on_backfill=rollup.update,
+        partitioned_path=None if storage == "csv" else PARTITIONED_DATA_PATH
+    )
+
+
+def create_app(
+    best_models: Dict[str, TabularPredictor],
+    api_params: Optional[dict] = None,
+    started_at: Optional[float] = None,
+    training_jobs: Optional[TrainingJobManager] = None,
+    request_reload: Optional[Callable[[], None]] = None,
+    on_ready: Optional[Callable[[], None]] = None,
+    worker: bool = False,
+    cache: Optional[PredictionCache] = None,
+    drift_monitor: Optional[DriftMonitor] = None
+) -> FastAPI:
+    """
+    Builds the API serving `best_models`.
+
+    Args:
+        best_models (dict): Predictors, or predictor paths, keyed by target column. May
+            be empty before the first AutoGluon training if the baseline is enabled and trained.
+        api_params (dict, optional): The `api` parameters.
+        started_at (float, optional): `time.perf_counter()` when the process started,
+            used to report the time to ready. Defaults to now.
+        training_jobs (TrainingJobManager, optional): Shared job manager; by default the
+            app starts its own, which reloads the models after a successful job.
+        request_reload (callable, optional): Called by `POST /models/reload` instead of
+            reloading in this process, e.g. to let a supervisor recycle every worker.
+        on_ready (callable, optional): Called once the models are warm.
+        worker (bool): Whether the app runs in a worker forked by `WorkerSupervisor`.
+            The supervisor then warms the models and runs the zone backfill and the
+            rollup rebuild once for all workers, and `cache` and `drift_monitor`,
+            None when disabled, are the ones all workers share.
+        cache (PredictionCache, optional): Shared cache, used when `worker` is set.
+        drift_monitor (DriftMonitor, optional): Shared monitor, used when `worker` is set.
 
-    return {"predictions": predictions}
+    Returns:
+        FastAPI: The application, its background work starts with its lifespan.
+    """
+    started_at = time.perf_counter() if started_at is None else started_at
+    api_params = api_params or {}
+    metrics_params = api_params.get("metrics", {})
+    if metrics_params.get("enabled", False):
+        init_metrics(metrics_params.get("multiproc_dir"), clean=True)
+
+    load_started = time.perf_counter()
+    best_models = resolve_predictors(best_models or {})
+    if not all(isinstance(model, TabularPredictor) for model in best_models.values()):
+        raise ValueError("Invalid models for the API.")
+
+    warmup_params = api_params.get("warmup", {})
+    baseline_params = api_params.get("baseline", {})
+    baseline_path = None
+    if baseline_params.get("enabled", False):
+        baseline_path = baseline_params.get("models_path", BASELINE_MODELS_PATH)
+    model_store = ModelStore(
+        best_models,
+        models_path=api_params.get("models_path", BEST_MODELS_PATH),
+        warmup_params=warmup_params,
+        baseline_path=baseline_path
+    )
+    if not best_models:
+        # Before the first AutoGluon training the baseline tier serves every zone
+        if not model_store.snapshot().baseline:
+            raise ValueError(
+                "No models for the API, train them first: kedro run --pipeline baseline_training "
+                "(seconds to minutes) or --pipeline model_training."
+            )
+        print("No AutoGluon models yet, the baseline serves every zone until a training job (/update) finishes.")
+    set_model_loaded(model_store.snapshot().version, time.perf_counter() - load_started)
+
+    served = {"version": model_store.snapshot().version}
+
+    def record_reload():
+        version = model_store.snapshot().version
+        set_model_loaded(version, model_store.last_load_s, served["version"])
+        served["version"] = version
+
+    model_store.add_reload_listener(record_reload)
+    # Load and warm the new models once training succeeds, requests keep using the old ones
+    owns_training_jobs = training_jobs is None
+    if owns_training_jobs:
+        training_jobs = TrainingJobManager(on_success=model_store.reload_async)
+    requested_zones_only = api_params.get("requested_zones_only", False)
+    training_params = api_params.get("training", {})
+
+    if not worker:
+        cache = create_prediction_cache(api_params)
+        if cache is not None:
+            model_store.add_reload_listener(cache.clear)
+
+    fallback = None
+    if baseline_params.get("enabled", False):
+        fallback = BaselineFallback(
+            latency_budget_ms=baseline_params.get("latency_budget_ms", 50),
+            probe_every=baseline_params.get("probe_every", 20),
+            smoothing=baseline_params.get("smoothing", 0.2)
+        )
+        if not model_store.snapshot().baseline:
+            print("No baseline models found, requests wait for the AutoGluon models.")
 
-def start_api(best_models: Dict[str, TabularPredictor]):
+    # "auto" writes to the month partitions once the CSV has been migrated, checked on every flush
+    storage = api_params.get("storage", "auto")
 
-    if not best_models or not all(isinstance(model, TabularPredictor) for model in best_models.values()):
-        raise ValueError("Invalid or missing models for the API.")
-    
-    app = FastAPI()
+    log_params = api_params.get("prediction_log", {})
+    prediction_log = PredictionLog(
+        RAW_DATA_PATH,
+        flush_rows=log_params.get("flush_rows", 500),
+        flush_interval_s=log_params.get("flush_interval_s", 1.0),
+        durable=log_params.get("durable", False),
+        partitioned_path=None if storage == "csv" else PARTITIONED_DATA_PATH,
+        compact_min_segments=log_params.get("compact_min_segments", 20),
+        storage=storage
+    )
+
+    # Per-month aggregate for the GUI chart, kept current by every flushed batch
+    rollup = MonthlyRollup(raw_csv_path=RAW_DATA_PATH, partitioned_path=PARTITIONED_DATA_PATH)
+    prediction_log.add_flush_listener(rollup.update)
+    prediction_log.add_flush_listener(lambda rows: observe_log_flush(prediction_log.last_flush_s))
+
+    def submit_training(mode: str = "auto") -> dict:
+        return training_jobs.submit(training_pipeline(mode, training_params))
+
+    # Streaming statistics of the logged rows, compared with the training-time reference
+    if not worker:
+        drift_monitor = create_drift_monitor(api_params, submit_training)
+        if drift_monitor is not None:
+            # New models come with a new reference
+            model_store.add_reload_listener(drift_monitor.load_reference)
+    if drift_monitor is not None:
+        prediction_log.add_flush_listener(drift_monitor.update)
+
+    batching_params = api_params.get("batching", {})
+    batcher = None
+    if batching_params.get("enabled", False):
+        batcher = PredictionBatcher(
+            score_batch=lambda inputs: getMicroBatchPredictions(
+                inputs, model_store.snapshot(), prediction_log, requested_zones_only, cache, fallback
+            ),
+            max_wait_ms=batching_params.get("max_wait_ms", 5),
+            max_batch_size=batching_params.get("max_batch_size", 64)
+        )
+
+    def served_models():
+        current = model_store.snapshot()
+        return current.version, current.models
+
+    backfill_job = None
+    if not worker:
+        backfill_job = create_backfill_job(api_params, served_models, prediction_log.lock, rollup)
+
+    # Live as soon as the server answers, ready once the models are warm
+    readiness = {"ready": False, "warmup_s": None, "time_to_ready_s": None, "error": None}
+
+    def run_warmup():
+        started = time.perf_counter()
+        try:
+            # Forked workers share the models the supervisor warmed, warming them again
+            # would write to (and copy) the shared pages
+            if warmup_params.get("enabled", True) and not worker:
+                model_store.warm_up()
+            readiness["warmup_s"] = round(time.perf_counter() - started, 3)
+            readiness["time_to_ready_s"] = round(time.perf_counter() - started_at, 3)
+            readiness["ready"] = True
+            if fallback is not None:
+                fallback.primary_ready = True
+            set_time_to_ready(readiness["time_to_ready_s"])
+            if on_ready is not None:
+                on_ready()
+            print(f"API ready {readiness['time_to_ready_s']}s after start, models warmed up in {readiness['warmup_s']}s")
+        except Exception as e:
+            readiness["error"] = str(e)
+            print(f"Model warmup failed, the API stays not ready: {e}")
+
+    async def refresh_process_metrics():
+        # Each worker publishes its own RSS, a scrape may be served by any of them
+        while True:
+            update_process_metrics()
+            await asyncio.sleep(metrics_params.get("refresh_interval_s", 10))
+
+    @asynccontextmanager
+    async def lifespan(_app: FastAPI):
+        if not worker:
+            with prediction_log.lock:
+                if not rollup.exists():
+                    rollup.rebuild()
+        prediction_log.start()
+        if batcher is not None:
+            batcher.start()
+        if backfill_job is not None:
+            backfill_job.start()
+        metrics_task = None
+        if metrics_params.get("enabled", False):
+            metrics_task = asyncio.get_running_loop().create_task(refresh_process_metrics())
+        # Warm up off the event loop so /health/live answers while models load
+        asyncio.get_running_loop().run_in_executor(None, run_warmup)
+        yield
+        if metrics_task is not None:
+            metrics_task.cancel()
+        if batcher is not None:
+            await batcher.stop()
+        if backfill_job is not None:
+            backfill_job.stop()
+        prediction_log.close()
+        # A shared manager outlives this app, its owner stops the jobs
+        if owns_training_jobs:
+            training_jobs.shutdown()
+
+    app = FastAPI(lifespan=lifespan)
+    app.add_middleware(MetricsMiddleware)
 
     @app.get("/", tags=["intro"])
     async def index():
         return {"message": "Welcome to the Weather Prediction API"}
 
+    @app.get("/health/live", tags=["health"], status_code=200)
+    async def health_live():
+        return {"status": "alive"}
+
+    @app.get("/health/ready", tags=["health"], status_code=200)
+    async def health_ready():
+        status = {**readiness, "model_version": model_store.snapshot().version}
+        if not readiness["ready"]:
+            return JSONResponse(status_code=503, content=status)
+        return status
+
     @app.post("/predict", tags=["prediction"], status_code=200)
     async def get_predictions(input_data: WeatherInput):
-        return getPredictions(input_data, best_models)
-        
-    @app.get("/update", tags=["update"], status_code=200)
-    async def update_model():
-        bootstrap_project(".")
-        
+        models = model_store.snapshot()
+        if cache is not None:
+            cached = getCachedPredictions(input_data, models, prediction_log, cache, requested_zones_only)
+            if cached is not None:
+                return cached
+
+        if batcher is None:
+            # The predict calls block, run them in a worker thread like the batcher does
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                None, getPredictions, input_data, models, prediction_log, requested_zones_only, cache, fallback
+            )
+        # Fail fast on unknown zones instead of inside the shared batch
+        resolve_zone_keys(input_data.target_zones, models.zones)
+        return await batcher.submit(input_data)
+
+    @app.get("/aggregates", tags=["aggregates"], status_code=200)
+    async def aggregates(freq: str = "month", zones: Optional[str] = None):
+        if freq != "month":
+            raise HTTPException(status_code=400, detail=f"Unsupported frequency: {freq}. Only 'month' is available.")
         try:
-            with KedroSession.create(project_path=".") as session:
-                session.run(pipeline_name="model_training")
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Pipeline execution failed: {str(e)}")
-        
-        return {"message": "Pipeline executed successfully."}
+            zone_numbers = [int(zone) for zone in zones.split(",")] if zones else [1, 2, 3]
+        except ValueError:
+            raise HTTPException(status_code=400, detail=f"Invalid zones: {zones}")
+
+        zone_keys = [f"PowerConsumption_Zone{zone}" for zone in zone_numbers]
+        unknown = [zone_key for zone_key in zone_keys if zone_key not in ZONE_COLUMNS]
+        if unknown:
+            raise HTTPException(status_code=404, detail=f"Unknown zones: {', '.join(unknown)}")
+        return {"freq": freq, **rollup.query(zone_keys)}
+
+    @app.post("/aggregates/rebuild", tags=["aggregates"], status_code=200)
+    async def rebuild_aggregates():
+        with prediction_log.lock:
+            rollup.rebuild()
+        return {"message": "Aggregates rebuilt."}
+
+    @app.get("/metrics", tags=["stats"], status_code=200)
+    async def metrics():
+        if not metrics_params.get("enabled", False):
+            raise HTTPException(status_code=404, detail="Metrics are disabled.")
+        body, content_type = render_metrics()
+        return Response(content=body, media_type=content_type)
+
+    @app.get("/stats/batching", tags=["stats"], status_code=200)
+    async def batching_stats():
+        if batcher is None:
+            return {"enabled": False}
+        return {"enabled": True, **batcher.stats()}
+
+    @app.get("/stats/cache", tags=["stats"], status_code=200)
+    async def cache_stats():
+        if cache is None:
+            return {"enabled": False}
+        return {"enabled": True, **cache.stats()}
+
+    @app.get("/stats/fallback", tags=["stats"], status_code=200)
+    async def fallback_stats():
+        if fallback is None:
+            return {"enabled": False}
+        return {"enabled": True, "baseline_zones": list(model_store.snapshot().baseline), **fallback.stats()}
+
+    @app.get("/stats/drift", tags=["stats"], status_code=200)
+    async def drift_stats():
+        if drift_monitor is None:
+            return {"enabled": False}
+        return {"enabled": True, **drift_monitor.scores()}
+
+    @app.get("/stats/prediction_log", tags=["stats"], status_code=200)
+    async def prediction_log_stats():
+        return prediction_log.stats()
+
+    @app.post("/predict/batch", tags=["prediction"], status_code=200)
+    async def get_batch_predictions(batch: BatchWeatherInput):
+        # Thousands of rows take a while to score, keep the event loop free meanwhile
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None, getBatchPredictions, batch, model_store.snapshot(), prediction_log, requested_zones_only, fallback
+        )
+
+    @app.get("/update", tags=["update"], status_code=202)
+    async def update_model(mode: str = "auto"):
+        if mode not in TRAINING_PIPELINES and mode != "auto":
+            raise HTTPException(status_code=400, detail=f"Unknown training mode: {mode}. Use auto, full or incremental.")
+        # Training runs in its own process; a request made while a job is running joins that job
+        job = submit_training(mode)
+        message = "Training already in progress." if job["coalesced"] else "Training started."
+        return {"message": message, **job}
+
+    @app.get("/jobs/{job_id}", tags=["update"], status_code=200)
+    async def job_status(job_id: str):
+        job = training_jobs.get(job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail=f"Job {job_id} not found.")
+        return job
+
+    @app.delete("/jobs/{job_id}", tags=["update"], status_code=200)
+    async def cancel_job(job_id: str):
+        loop = asyncio.get_running_loop()
+        job = await loop.run_in_executor(None, training_jobs.cancel, job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail=f"Job {job_id} not found.")
+        return job
+
+    @app.get("/models", tags=["update"], status_code=200)
+    async def models_status():
+        return model_store.status()
+
+    @app.post("/models/reload", tags=["update"], status_code=202)
+    async def reload_models():
+        if request_reload is not None:
+            request_reload()
+            return {"reload_started": True, **model_store.status()}
+        started = model_store.reload_async()
+        return {"reload_started": started, **model_store.status()}
+
+    return app
+
+
+def start_api(
+    best_models: Dict[str, TabularPredictor],
+    api_params: Optional[dict] = None,
+    started_at: Optional[float] = None
+):
+    """
+    Builds the API and serves it until the process is stopped, from several
+    worker processes when `api_params["workers"]["count"]` is above 1.
+    """
+    started_at = time.perf_counter() if started_at is None else started_at
+    api_params = api_params or {}
+
+    if api_params.get("workers", {}).get("count", 1) > 1:
+        if os.name == "nt":
+            print("Multiple workers need fork, serving from a single process.")
+        else:
+            from .workers import WorkerSupervisor
+            WorkerSupervisor(resolve_predictors(best_models or {}), api_params, started_at).run()
+            return
 
+    app = create_app(best_models, api_params, started_at)
 
     # Start the FastAPI server
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    uvicorn.run(app, host=api_params.get("host", "0.0.0.0"), port=api_params.get("port", 8000))
 
-def api_run(best_models: Dict[str, TabularPredictor]):
+def api_run(best_models: Dict[str, TabularPredictor], api_params: dict):
     print("Loaded `best_models`:", best_models)
-    process = Process(target=start_api, args=(best_models,))
+    process = Process(target=start_api, args=(best_models, api_params))
     process.start()
     print("API is running in a separate process...")
     return process
\ No newline at end of file
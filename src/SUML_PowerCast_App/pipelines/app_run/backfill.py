@@ -0,0 +1,188 @@
+"""
+Module for backfilling zone predictions that were skipped at request time.
+
+When the API only runs inference for the requested zones, the logged rows hold
+nulls for the other zones. The job in this module fills them in bulk, with one
+`predict` call per zone over all incomplete rows, and stamps the filled rows with
+the version of the models that filled them.
+
+The CSV is only ever appended to, so the job remembers the byte offset up to which
+every row is complete and reads only what follows it. Rows are patched in place
+from the first filled one to the end of the file; the rows before it are never
+rewritten.
+"""
+
+import csv
+import io
+import os
+import threading
+from typing import Callable, Dict, NamedTuple, Optional, Tuple
+
+import pandas as pd
+
+from SUML_PowerCast_App.datasets.file_lock import FileLock
+from SUML_PowerCast_App.datasets.partitioned_consumption import is_partitioned
+
+FEATURE_COLUMNS = ["Temperature", "Humidity", "WindSpeed", "GeneralDiffuseFlows", "DiffuseFlows"]
+ZONE_PREFIX = "PowerConsumption_Zone"
+
+
+class BackfillResult(NamedTuple):
+    """
+    Outcome of one backfill pass.
+    """
+    filled: int
+    # `Datetime` and the filled cells of every patched row, the other zones null
+    rows: pd.DataFrame
+    # Where the next pass starts reading, and the header the offset is valid for
+    offset: int
+    header: bytes
+
+
+def _format_row(fields) -> bytes:
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator="").writerow(fields)
+    return buffer.getvalue().encode("utf-8")
+
+
+def backfill_missing_zones(
+    file_path: str,
+    best_models: Dict[str, object],
+    lock: FileLock,
+    model_version: Optional[str] = None,
+    offset: int = 0,
+    header: bytes = b""
+) -> BackfillResult:
+    """
+    Predicts the missing zone values of the rows after `offset` and patches them in the file.
+
+    Args:
+        file_path (str): Path of the raw consumption CSV.
+        best_models (dict): Trained predictors keyed by target column.
+        lock (FileLock): Lock held by every writer of `file_path`.
+        model_version (str, optional): Written to the `ModelVersion` of the patched rows.
+        offset (int): Byte offset returned by the previous pass, 0 to read the whole file.
+        header (bytes): Header line returned with `offset`; if the file's header has
+            changed since, e.g. a column was added, the whole file is read again.
+
+    Returns:
+        BackfillResult: Cells filled, the patched values and where the next pass starts.
+    """
+    with lock:
+        if not os.path.exists(file_path):
+            return BackfillResult(0, pd.DataFrame(), 0, b"")
+
+        with open(file_path, "rb") as file:
+            file_header = file.readline()
+            if file_header != header or offset < len(file_header) or offset > os.path.getsize(file_path):
+                offset = len(file_header)
+            file.seek(offset)
+            tail = file.read()
+
+        # A last line without its newline is left as it is, e.g. from an interrupted write
+        lines = tail.splitlines(keepends=True)
+        remainder = lines.pop() if lines and not lines[-1].endswith(b"\n") else b""
+        if not lines:
+            return BackfillResult(0, pd.DataFrame(), offset, file_header)
+        columns = next(csv.reader([file_header.decode("utf-8")]))
+        rows = [next(csv.reader([line.decode("utf-8")])) for line in lines]
+        data = pd.DataFrame(rows, columns=columns, dtype="string").replace("", pd.NA)
+
+        filled = 0
+        patched = pd.Series(False, index=data.index)
+        filled_values = pd.DataFrame(index=data.index)
+        for zone, model in best_models.items():
+            if zone not in data.columns:
+                continue
+            missing = data[zone].isna()
+            if not missing.any():
+                continue
+            features = data.loc[missing, FEATURE_COLUMNS].apply(pd.to_numeric, errors="coerce")
+            values = model.predict(features).to_numpy(dtype="float64")
+            filled_values.loc[missing, zone] = values
+            data.loc[missing, zone] = [repr(float(value)) for value in values]
+            patched |= missing
+            filled += int(missing.sum())
+
+        if filled:
+            if model_version is not None and "ModelVersion" in data.columns:
+                data.loc[patched, "ModelVersion"] = model_version
+            first = int(patched.to_numpy().argmax())
+            for index in range(first, len(lines)):
+                if patched.iloc[index]:
+                    ending = lines[index][len(lines[index].rstrip(b"\r\n")):]
+                    lines[index] = _format_row(data.iloc[index].fillna("").tolist()) + ending
+            with open(file_path, "r+b") as file:
+                file.seek(offset + sum(len(line) for line in lines[:first]))
+                file.write(b"".join(lines[first:]) + remainder)
+                file.truncate()
+
+        # Rows of zones without a model stay incomplete, the next pass starts at the first one
+        zones = [column for column in data.columns if column.startswith(ZONE_PREFIX)]
+        incomplete = data[zones].isna().to_numpy().any(axis=1)
+        complete_lines = int(incomplete.argmax()) if incomplete.any() else len(lines)
+        next_offset = offset + sum(len(line) for line in lines[:complete_lines])
+
+    changes = pd.DataFrame()
+    if filled:
+        changes = filled_values[patched.to_numpy()].assign(Datetime=data.loc[patched, "Datetime"])
+    return BackfillResult(filled, changes, next_offset, file_header)
+
+
+class BackfillJob(threading.Thread):
+    """
+    Background thread running `backfill_missing_zones` every `interval_s` seconds
+    with the models `get_models` returns, the ones currently served, as a
+    `(version, models)` pair. `on_backfill` receives the filled values, with the lock held.
+    """
+
+    def __init__(
+        self,
+        file_path: str,
+        get_models: Callable[[], Tuple[str, Dict[str, object]]],
+        lock: FileLock,
+        interval_s: float = 300,
+        on_backfill: Optional[Callable[[pd.DataFrame], None]] = None,
+        partitioned_path: Optional[str] = None
+    ):
+        super().__init__(name="zone-backfill", daemon=True)
+        self.on_backfill = on_backfill
+        self.file_path = file_path
+        # Once the CSV has been migrated there, the CSV is no longer the training data
+        self.partitioned_path = partitioned_path
+        self.get_models = get_models
+        self.lock = lock
+        self.interval_s = interval_s
+        self._offset = 0
+        self._header = b""
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval_s):
+            if self.partitioned_path is not None and is_partitioned(self.partitioned_path):
+                print("The raw data was migrated to partitions, zone backfill stops.")
+                return
+            try:
+                self.run_once()
+            except Exception as e:
+                print(f"Zone backfill failed: {e}")
+
+    def run_once(self) -> int:
+        """
+        Runs one backfill pass from where the previous one stopped.
+
+        Returns:
+            int: Number of cells that were filled.
+        """
+        version, models = self.get_models()
+        result = backfill_missing_zones(self.file_path, models, self.lock, version, self._offset, self._header)
+        self._offset, self._header = result.offset, result.header
+        if result.filled:
+            print(f"Backfilled {result.filled} missing zone predictions in {self.file_path} with {version}")
+            if self.on_backfill is not None:
+                with self.lock:
+                    self.on_backfill(result.rows)
+        return result.filled
+
+    def stop(self):
+        self._stop_event.set()
@@ -0,0 +1,142 @@
+"""
+Module with the micro-batching dispatcher used by the `/predict` endpoint.
+
+Concurrent single-row requests are queued for a short window and scored together,
+so the models are invoked once per batch instead of once per request.
+"""
+
+import asyncio
+from collections import Counter
+from typing import Callable, List, Optional
+
+
+class PredictionBatcher:
+    """
+    Collects incoming requests and scores them in batches in a worker thread.
+
+    A batch is dispatched when `max_batch_size` requests are waiting or when the
+    first queued request has waited `max_wait_ms` milliseconds, whichever comes first.
+    """
+
+    def __init__(self, score_batch: Callable[[list], list], max_wait_ms: float = 5, max_batch_size: int = 64):
+        """
+        Args:
+            score_batch (callable): Blocking function scoring a list of inputs and
+                returning one result per input, in the same order.
+            max_wait_ms (float): How long the first request of a batch may wait for others.
+            max_batch_size (int): Maximum number of requests scored together.
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1.")
+
+        self.score_batch = score_batch
+        self.max_wait = max_wait_ms / 1000
+        self.max_batch_size = max_batch_size
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+        self._batches = 0
+        self._rows = 0
+        self._max_queue_depth = 0
+        self._batch_sizes = Counter()
+
+    def start(self):
+        """
+        Starts the dispatch loop on the running event loop.
+        """
+        if self._task is None:
+            self._queue = asyncio.Queue()
+            self._task = asyncio.get_running_loop().create_task(self._dispatch_loop())
+
+    async def stop(self):
+        """
+        Stops the dispatch loop and fails the requests that are still queued.
+        """
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+        while not self._queue.empty():
+            _, future = self._queue.get_nowait()
+            if not future.done():
+                future.set_exception(RuntimeError("The prediction dispatcher was stopped."))
+
+    async def submit(self, input_data):
+        """
+        Queues one input and waits for its result.
+
+        Args:
+            input_data: A single request payload passed to `score_batch`.
+
+        Returns:
+            The result produced for this input.
+        """
+        if self._task is None:
+            self.start()
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((input_data, future))
+        self._max_queue_depth = max(self._max_queue_depth, self._queue.qsize())
+        return await future
+
+    def stats(self) -> dict:
+        """
+        Returns queue depth and batch-size statistics.
+        """
+        return {
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "max_queue_depth": self._max_queue_depth,
+            "batches": self._batches,
+            "rows": self._rows,
+            "mean_batch_size": self._rows / self._batches if self._batches else 0.0,
+            "max_batch_size_seen": max(self._batch_sizes, default=0),
+            "batch_size_counts": dict(sorted(self._batch_sizes.items())),
+            "max_wait_ms": self.max_wait * 1000,
+            "max_batch_size": self.max_batch_size,
+        }
+
+    async def _collect_batch(self) -> List[tuple]:
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        deadline = loop.time() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+        return batch
+
+    async def _dispatch_loop(self):
+        loop = asyncio.get_running_loop()
+
+        while True:
+            batch = await self._collect_batch()
+            inputs = [input_data for input_data, _ in batch]
+
+            self._batches += 1
+            self._rows += len(batch)
+            self._batch_sizes[len(batch)] += 1
+
+            try:
+                results = await loop.run_in_executor(None, self.score_batch, inputs)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
@@ -0,0 +1,140 @@
+"""
+Module watching the served traffic for drift away from the training data.
+
+Every batch the prediction log writes is folded into constant-memory statistics
+per feature and per predicted zone, which are scored against the reference profile
+`evaluate_models` saved at training time. Rows the baseline tier predicted are
+left out, their predictions would read as drift of the served models. A drifted
+column can start a training job. With several workers the monitor lives in the
+manager process, so it sees the rows of all of them and starts at most one job.
+"""
+
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, Optional
+
+import pandas as pd
+
+from SUML_PowerCast_App.drift import RunningStats, psi
+
+from .prediction_log import TIER_COLUMN
+
+REFERENCE_PROFILE_PATH = "data/06_models/reference_profile.json"
+
+
+class DriftMonitor:
+    """
+    Keeps a `RunningStats` per column of the reference profile and scores its drift.
+    """
+
+    def __init__(
+        self,
+        reference_path: str = REFERENCE_PROFILE_PATH,
+        psi_threshold: float = 0.2,
+        min_rows: int = 500,
+        on_drift: Optional[Callable[[], None]] = None,
+        cooldown_s: float = 3600
+    ):
+        """
+        Args:
+            reference_path (str): JSON profile written by the `model_training` pipeline.
+            psi_threshold (float): PSI above which a column counts as drifted.
+            min_rows (int): Rows a column needs before it is scored.
+            on_drift (callable, optional): Called in a background thread when a column
+                drifts, e.g. to start a training job.
+            cooldown_s (float): Minimum time between two `on_drift` calls.
+        """
+        self.reference_path = reference_path
+        self.psi_threshold = psi_threshold
+        self.min_rows = min_rows
+        self.on_drift = on_drift
+        self.cooldown_s = cooldown_s
+
+        self._lock = threading.Lock()
+        # Workers' flushes arrive on concurrent manager threads, only one may start the job
+        self._trigger_lock = threading.Lock()
+        self._reference: Dict[str, dict] = {}
+        self._stats: Dict[str, RunningStats] = {}
+        self._last_triggered: Optional[float] = None
+        self.since: Optional[str] = None
+        self.load_reference()
+
+    def load_reference(self):
+        """
+        Loads the reference profile and starts the statistics over, e.g. after a model reload.
+        """
+        reference = {}
+        if os.path.exists(self.reference_path):
+            with open(self.reference_path, encoding="utf-8") as file:
+                reference = json.load(file).get("columns", {})
+        else:
+            print(f"No drift reference at {self.reference_path}, drift is not scored until one is trained.")
+
+        with self._lock:
+            self._reference = reference
+            self._stats = {column: RunningStats(profile["cuts"]) for column, profile in reference.items()}
+            self.since = datetime.now().isoformat(timespec="seconds")
+
+    def update(self, rows: pd.DataFrame):
+        """
+        Folds a batch of logged rows into the statistics, as a prediction log flush listener.
+        """
+        if TIER_COLUMN in rows.columns:
+            rows = rows[rows[TIER_COLUMN] != "baseline"]
+        with self._lock:
+            for column, stats in self._stats.items():
+                if column in rows.columns:
+                    stats.update(pd.to_numeric(rows[column], errors="coerce").to_numpy(dtype="float64"))
+
+        if self.on_drift is not None:
+            self._maybe_trigger()
+
+    def scores(self) -> dict:
+        """
+        Returns the drift of every column: PSI against the reference histogram and the
+        shift of the mean in reference standard deviations.
+        """
+        columns = {}
+        with self._lock:
+            for column, stats in self._stats.items():
+                reference = self._reference[column]
+                scored = stats.count >= self.min_rows
+                column_psi = psi(reference["fractions"], stats.fractions()) if scored else None
+                columns[column] = {
+                    "rows": stats.count,
+                    "mean": round(stats.mean, 4),
+                    "std": round(stats.std, 4),
+                    "reference_mean": round(reference["mean"], 4),
+                    "reference_std": round(reference["std"], 4),
+                    "mean_shift": round(abs(stats.mean - reference["mean"]) / reference["std"], 4)
+                    if scored and reference["std"] > 0 else None,
+                    "psi": None if column_psi is None else round(column_psi, 4),
+                    "drifted": column_psi is not None and column_psi > self.psi_threshold,
+                }
+
+        return {
+            "reference_loaded": bool(columns),
+            "since": self.since,
+            "psi_threshold": self.psi_threshold,
+            "min_rows": self.min_rows,
+            "drifted": [column for column, score in columns.items() if score["drifted"]],
+            "last_triggered_at": None if self._last_triggered is None
+            else datetime.fromtimestamp(self._last_triggered).isoformat(timespec="seconds"),
+            "columns": columns,
+        }
+
+    def _maybe_trigger(self):
+        with self._trigger_lock:
+            if self._last_triggered is not None and time.time() - self._last_triggered < self.cooldown_s:
+                return
+            drifted = self.scores()["drifted"]
+            if not drifted:
+                return
+            self._last_triggered = time.time()
+
+        print(f"Drift detected in {', '.join(drifted)}, starting a training job")
+        # Flush listeners run under the prediction log lock, start the job outside of it
+        threading.Thread(target=self.on_drift, name="drift-retrain", daemon=True).start()
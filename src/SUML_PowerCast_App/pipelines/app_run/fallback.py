@@ -0,0 +1,79 @@
+"""
+Module choosing between the AutoGluon models and the fast baseline tier per zone.
+
+The baseline serves every zone until the AutoGluon models are warm. After that it
+serves a zone only while the AutoGluon model's average predict latency per row is
+above the budget, so a large batch doesn't push single-row requests to the baseline.
+One call in `probe_every` still goes to AutoGluon so its latency keeps being
+measured and the zone switches back once it recovers. Requests run in executor
+threads, so the counters and averages are updated under a lock.
+"""
+
+import threading
+from collections import Counter
+from typing import Dict
+
+
+class BaselineFallback:
+    """
+    Per-zone routing between the primary (AutoGluon) and the baseline models.
+    """
+
+    def __init__(self, latency_budget_ms: float = 50, probe_every: int = 20, smoothing: float = 0.2):
+        """
+        Args:
+            latency_budget_ms (float): Predict latency per row above which a zone falls back.
+            probe_every (int): While falling back, every n-th call still uses AutoGluon.
+            smoothing (float): Weight of the newest call in the latency moving average.
+        """
+        self.latency_budget_ms = latency_budget_ms
+        self.probe_every = max(probe_every, 1)
+        self.smoothing = smoothing
+        self.primary_ready = False
+
+        self._lock = threading.Lock()
+        self._latency_ms: Dict[str, float] = {}
+        self._fallback_calls = Counter()
+        self.baseline_calls = Counter()
+        self.primary_calls = Counter()
+
+    def use_baseline(self, zone: str) -> bool:
+        """
+        Tells whether the next predict call of `zone` should use the baseline.
+        """
+        if not self.primary_ready:
+            return True
+        with self._lock:
+            latency = self._latency_ms.get(zone)
+            if latency is None or latency <= self.latency_budget_ms:
+                return False
+            self._fallback_calls[zone] += 1
+            return self._fallback_calls[zone] % self.probe_every != 0
+
+    def record(self, zone: str, seconds: float, rows: int, baseline: bool):
+        """
+        Records one predict call of `rows` rows; only AutoGluon calls update the latency average.
+        """
+        latency_ms = seconds * 1000 / max(rows, 1)
+        with self._lock:
+            if baseline:
+                self.baseline_calls[zone] += 1
+                return
+            self.primary_calls[zone] += 1
+            previous = self._latency_ms.get(zone)
+            self._latency_ms[zone] = (
+                latency_ms if previous is None else previous + self.smoothing * (latency_ms - previous)
+            )
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "primary_ready": self.primary_ready,
+                "latency_budget_ms": self.latency_budget_ms,
+                "primary_latency_ms_per_row": {zone: round(latency, 3) for zone, latency in self._latency_ms.items()},
+                "falling_back": [
+                    zone for zone, latency in self._latency_ms.items() if latency > self.latency_budget_ms
+                ],
+                "baseline_calls": dict(self.baseline_calls),
+                "primary_calls": dict(self.primary_calls),
+            }
@@ -13,10 +13,9 @@ import customtkinter as ctk
 from PIL import Image
 from matplotlib.figure import Figure
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import requests
-
+from SUML_PowerCast_App.pipelines.app_run.gui.api_worker import ApiWorker
 from SUML_PowerCast_App.pipelines.app_run.gui.dictionary import dictionery
-from SUML_PowerCast_App.pipelines.app_run.gui.visual_managment import show_instruction, update_graph, change_scaling_event, check_number_format
+from SUML_PowerCast_App.pipelines.app_run.gui.visual_managment import show_instruction, fetch_aggregates, update_graph, change_scaling_event, check_number_format
 
 CURRENT_PATH = os.path.dirname(os.path.realpath(__file__))
 csv_path = os.path.join(
@@ -85,6 +84,18 @@ class App(ctk.CTk):
         )
         self.train_button.grid(row=1, column=0, padx=20, pady=10)
 
+        # Training progress, shown while a training job is running
+        self.training_job_id = None
+        self.train_progress = ctk.CTkProgressBar(self.left_menu, mode="indeterminate", width=140)
+        self.train_status_label = ctk.CTkLabel(self.left_menu, fg_color="transparent", text="")
+        self.cancel_train_button = ctk.CTkButton(
+            self.left_menu,
+            height=30,
+            text=dictionery[self.language]["cancel_button"],
+            font=ctk.CTkFont(family="Segoe UI", size=13, weight="bold"),
+            command=self.cancel_training
+        )
+
 
         self.language_mode_label = ctk.CTkLabel(
             self.left_menu,
@@ -275,6 +286,16 @@ class App(ctk.CTk):
         self.info_label.insert("1.0", dictionery[self.language]["info_text"])
         self.info_label.configure(state="disabled")
 
+        # HTTP calls run in the background, results come back through after()
+        self.api_worker = ApiWorker(self)
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+
+        # Predictions and training need the API, enable them once it reports ready
+        self.predict_button.configure(state="disabled")
+        self.train_button.configure(state="disabled")
+        self.result_label.configure(text=dictionery[self.language]["api_starting"])
+        self.wait_for_api()
+
         
 
     def validate_fields(self):
@@ -308,6 +329,7 @@ class App(ctk.CTk):
         if hasattr(self, 'language'):
             self.download_button.configure(text=dictionery[self.language]["download_button"])
             self.train_button.configure(text=dictionery[self.language]["train_button"])
+            self.cancel_train_button.configure(text=dictionery[self.language]["cancel_button"])
             self.language_mode_label.configure(text=dictionery[self.language]["language"])
             self.appearance_mode_label.configure(text=dictionery[self.language]["appearance_mode"])
             self.scaling_label.configure(text=dictionery[self.language]["ui_scale"])
@@ -348,6 +370,7 @@ class App(ctk.CTk):
     def predict(self):
         """
         Gather user inputs, send them to the API for predictions, and update the graph for selected zones.
+        The request runs on the API worker, the window stays responsive meanwhile.
         """
         try:
             data = {
@@ -362,38 +385,62 @@ class App(ctk.CTk):
             messagebox.showerror("Error", "Please enter valid numeric values in all fields.")
             return
 
+        self.predict_button.configure(state="disabled")
+        self.api_worker.request(
+            "POST", "/predict",
+            on_success=self.show_predictions,
+            on_error=self.show_prediction_error,
+            json=data
+        )
 
-        try:
-            response = requests.post(
-                "http://localhost:8000/predict",
-                json=data,
-                timeout=5  # Add a timeout to avoid indefinite hanging
+    def show_predictions(self, result):
+        """
+        Display the predictions returned by the API and refresh the graph.
+        """
+        self.predict_button.configure(state="normal")
+        predictions = result.get("predictions", {})
+
+        # Format the predictions
+        formatted_result = "Wynik przewidywania:\n"
+        for zone, value in predictions.items():
+            zone_name = zone.replace("PowerConsumption_", "")
+            if isinstance(value, list) and len(value) > 0:
+                value = value[0]
+            formatted_result += f"{zone_name}: {int(value)}W\n"
+
+        self.result_label.configure(text=formatted_result)
+
+        # Update graph with selected zones
+        selected_zones = self.get_target_zones()
+        if selected_zones:
+            self.api_worker.submit(
+                lambda: fetch_aggregates(self.api_worker.session, self.api_worker.base_url, selected_zones),
+                on_success=lambda aggregates: update_graph(self.plot1, self.canvas, selected_zones, aggregates),
+                on_error=lambda exc: messagebox.showerror("Error", f"Failed to update graph: {exc}")
             )
-            response.raise_for_status()
-            result = response.json()
-            predictions = result.get("predictions", {})
-
-            # Format the predictions
-            formatted_result = "Wynik przewidywania:\n"
-            for zone, value in predictions.items():
-                zone_name = zone.replace("PowerConsumption_", "")
-                if isinstance(value, list) and len(value) > 0:
-                    value = value[0]
-                formatted_result += f"{zone_name}: {int(value)}W\n"
-
-            self.result_label.configure(text=formatted_result)
-
-
-            # Update graph with selected zones
-            selected_zones = self.get_target_zones()
-            if selected_zones:
-                update_graph(self.plot1, self.canvas, selected_zones)
-            else:
-                messagebox.showinfo("No Zones Selected", "Please select at least one zone to display.")
-
-        except requests.RequestException as exc:
-            messagebox.showerror("API Error", f"Failed to fetch prediction: {exc}")
+        else:
+            messagebox.showinfo("No Zones Selected", "Please select at least one zone to display.")
+
+    def show_prediction_error(self, exc):
+        self.predict_button.configure(state="normal")
+        messagebox.showerror("API Error", f"Failed to fetch prediction: {exc}")
     
+    def wait_for_api(self):
+        """
+        Poll the API readiness endpoint until the models are loaded and warm.
+        """
+        self.api_worker.request(
+            "GET", "/health/ready",
+            on_success=self.api_ready,
+            on_error=lambda exc: self.after(1000, self.wait_for_api),
+            timeout=2
+        )
+
+    def api_ready(self, status):
+        self.predict_button.configure(state="normal")
+        self.train_button.configure(state="normal")
+        self.result_label.configure(text=dictionery[self.language]["result"])
+
     def train_process(self):
         """Обработчик для кнопки тренировки модели"""
         messagebox.showinfo("Start process", "Please wait a bit. The process will take some time...") 
@@ -403,21 +450,97 @@ class App(ctk.CTk):
 
     def train_model(self): 
         """
-        Send a request to the API to train the model.
+        Send a request to the API to start training and follow the job until it finishes.
         """
-        try:
-            response = requests.get(
-                "http://localhost:8000/update",
-                timeout=300
-            )
-            response.raise_for_status()
+        self.train_button.configure(state="disabled")
+        self.api_worker.request(
+            "GET", "/update",
+            on_success=self.training_started,
+            on_error=self.training_failed,
+            timeout=10
+        )
 
+    def training_started(self, job):
+        """
+        Show the progress widgets and start polling the training job.
+        """
+        self.training_job_id = job["job_id"]
+        self.train_progress.grid(row=2, column=0, padx=20, pady=(0, 5))
+        self.train_progress.start()
+        self.train_status_label.grid(row=3, column=0, padx=20, pady=0)
+        self.cancel_train_button.grid(row=4, column=0, padx=20, pady=(5, 10), sticky="n")
+        self.show_training_job(job)
+
+    def check_training_job(self):
+        """
+        Poll the status of the running training job.
+        """
+        if self.training_job_id is None:
+            return
+        self.api_worker.request(
+            "GET", f"/jobs/{self.training_job_id}",
+            on_success=self.show_training_job,
+            on_error=self.training_failed
+        )
+
+    def show_training_job(self, job):
+        """
+        Display the progress of a training job and report when it is done.
+        """
+        if job["job_id"] != self.training_job_id:
+            return
+
+        if job["status"] == "succeeded":
+            self.training_finished()
             messagebox.showinfo("Complete", "Your model has been trained")
+        elif job["status"] == "failed":
+            self.training_finished()
+            messagebox.showerror("Training Error", f"Failed to train the model: {job['error']}")
+        elif job["status"] == "cancelled":
+            self.training_finished()
+        else:
+            zone = (job.get("current_zone") or "").replace("PowerConsumption_", "")
+            elapsed = int(job.get("elapsed_s") or 0)
+            self.train_status_label.configure(
+                text=f"{job.get('current_node') or job['status']}\n{zone} {elapsed // 60}:{elapsed % 60:02d}"
+            )
+            self.after(5000, self.check_training_job)
 
-        except requests.RequestException as exc:
-            messagebox.showerror("Training Error", f"Failed to train the model: {exc}")
+    def cancel_training(self):
+        """
+        Ask the API to stop the running training job.
+        """
+        if self.training_job_id is None:
+            return
+        self.cancel_train_button.configure(state="disabled")
+        self.api_worker.request(
+            "DELETE", f"/jobs/{self.training_job_id}",
+            on_success=self.show_training_job,
+            on_error=self.training_failed
+        )
 
+    def training_failed(self, exc):
+        self.training_finished()
+        messagebox.showerror("Training Error", f"Failed to train the model: {exc}")
 
+    def training_finished(self):
+        """
+        Hide the progress widgets and re-enable training.
+        """
+        self.training_job_id = None
+        self.train_progress.stop()
+        self.train_progress.grid_remove()
+        self.train_status_label.grid_remove()
+        self.cancel_train_button.grid_remove()
+        self.cancel_train_button.configure(state="normal")
+        self.train_button.configure(state="normal")
+
+    def on_close(self):
+        """
+        Release the API worker before closing the window.
+        """
+        self.api_worker.close()
+        self.destroy()
 
     def get_target_zones(self):
         """
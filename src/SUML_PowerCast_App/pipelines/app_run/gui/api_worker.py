@@ -0,0 +1,86 @@
+"""
+Module running the GUI's API calls off the Tk main loop.
+
+Calls are executed by a small thread pool sharing one `requests.Session`, so the
+window stays responsive while predictions, chart data and training jobs are in
+flight. Results are handed back to the Tk thread through a queue polled with
+`after()`, because Tk widgets may only be touched from the thread running mainloop.
+"""
+
+import queue
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+API_URL = "http://localhost:8000"
+
+
+class ApiWorker:
+    """
+    Background executor for HTTP calls with callbacks run on the Tk thread.
+    """
+
+    def __init__(self, widget, base_url=API_URL, max_workers=2, poll_ms=50):
+        """
+        Args:
+            widget: Any Tk widget, used to schedule `after()` callbacks.
+            base_url (str): Address of the API.
+            max_workers (int): Number of calls that may run at the same time.
+            poll_ms (int): How often finished calls are checked for.
+        """
+        self.widget = widget
+        self.base_url = base_url
+        self.poll_ms = poll_ms
+        self.session = requests.Session()
+
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="api-worker")
+        self._results = queue.Queue()
+        self._closed = False
+        self.widget.after(self.poll_ms, self._poll)
+
+    def submit(self, func, on_success, on_error=None):
+        """
+        Runs `func()` on a worker thread, then `on_success(result)` or `on_error(exc)`
+        on the Tk thread.
+        """
+        def run():
+            try:
+                self._results.put((on_success, func()))
+            except Exception as exc:
+                if on_error is not None:
+                    self._results.put((on_error, exc))
+
+        self._executor.submit(run)
+
+    def request(self, method, path, on_success, on_error=None, timeout=5, **kwargs):
+        """
+        Sends a request with the shared session and passes the decoded JSON to `on_success`.
+        """
+        def call():
+            response = self.session.request(method, f"{self.base_url}{path}", timeout=timeout, **kwargs)
+            response.raise_for_status()
+            return response.json()
+
+        self.submit(call, on_success, on_error)
+
+    def close(self):
+        """
+        Stops accepting callbacks and releases the session.
+        """
+        self._closed = True
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self.session.close()
+
+    def _poll(self):
+        if self._closed:
+            return
+        while True:
+            try:
+                callback, value = self._results.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                callback(value)
+            except Exception as exc:
+                print(f"GUI callback failed: {exc}")
+        self.widget.after(self.poll_ms, self._poll)
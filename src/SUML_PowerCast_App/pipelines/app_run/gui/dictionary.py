@@ -2,6 +2,8 @@ dictionery = {
     "PL":{
         "download_button": "Pobierz CSV",
         "train_button": "Trenuj model",
+        "cancel_button": "Anuluj trening",
+        "api_starting": "Uruchamianie API, ładowanie modeli...",
         "language": "Język:",
         "appearance_mode": "Tryb wyglądu:",
         "ui_scale": "Skalowanie UI:",
@@ -23,6 +25,8 @@ dictionery = {
      "ENG":{
         "download_button" : "Download CSV",
         "train_button" : "Train model",
+        "cancel_button" : "Cancel training",
+        "api_starting" : "Starting the API, loading models...",
         "language" : "Language:",
         "appearance_mode" : "Appearance Mode:",
         "ui_scale" : "UI Scaling:",
@@ -44,6 +48,8 @@ dictionery = {
     "RU":{
         "download_button": "Скачать CSV",
         "train_button": "Обучить модель",
+        "cancel_button": "Отменить обучение",
+        "api_starting": "Запуск API, загрузка моделей...",
         "language": "Язык:",
         "appearance_mode": "Режим отображения:",
         "ui_scale": "Масштаб UI:",
@@ -6,6 +6,7 @@ Technologies used:
 - Pandas: for data handling and processing.
 - Matplotlib & Seaborn: for visualization.
 - CustomTkinter: for UI management.
+- Requests (through a session): for fetching the monthly aggregates from the API.
 - Re (Regular Expressions): for input validation.
 - Tkinter Messagebox: for displaying error messages.
 """
@@ -53,7 +54,30 @@ def show_instruction():
     instruction_textbox.configure(state="disabled")
 
 
-def update_graph(plot1, canvas, selected_zones):
+def fetch_aggregates(session, base_url, selected_zones):
+    """
+    Fetches the monthly consumption aggregate of the selected zones from the API.
+    Safe to call from a worker thread, it doesn't touch any widget.
+
+    Args:
+        session (requests.Session): Session used for the request.
+        base_url (str): Address of the API.
+        selected_zones (list): List of selected zone numbers (1, 2, or 3).
+
+    Returns:
+        dict: The `/aggregates` response.
+    """
+    # The API keeps a monthly aggregate, so the chart never parses the raw data
+    response = session.get(
+        f"{base_url}/aggregates",
+        params={"freq": "month", "zones": ",".join(str(zone) for zone in selected_zones)},
+        timeout=5
+    )
+    response.raise_for_status()
+    return response.json()
+
+
+def update_graph(plot1, canvas, selected_zones, aggregates):
     """
     Updates the graph based on the selected zones.
 
@@ -61,24 +85,11 @@ def update_graph(plot1, canvas, selected_zones):
         plot1 (matplotlib.axes.Axes): The plot to update.
         canvas (matplotlib.backends.backend_tkagg.FigureCanvasTkAgg): The canvas to redraw.
         selected_zones (list): List of selected zone numbers (1, 2, or 3).
+        aggregates (dict): Monthly aggregate returned by `fetch_aggregates`.
     """
     try:
-        dataframe = pd.read_csv(
-            r"data\01_raw\powerconsumption.csv", parse_dates=["Datetime"]
-        )
-        dataframe["Datetime"] = pd.to_datetime(dataframe["Datetime"], errors="coerce")
-        dataframe["MonthYear"] = dataframe["Datetime"].dt.strftime("%m.%y")
-
-        grouped = (
-            dataframe.groupby("MonthYear")[
-                ["PowerConsumption_Zone1", "PowerConsumption_Zone2", "PowerConsumption_Zone3"]
-            ]
-            .mean()
-            .reset_index()
-        )
-
-        grouped["MonthYear"] = pd.to_datetime(grouped["MonthYear"], format="%m.%y")
-        grouped = grouped.sort_values("MonthYear")
+        grouped = pd.DataFrame(aggregates["zones"])
+        grouped["MonthYear"] = pd.to_datetime(aggregates["months"], format="%Y-%m")
 
         plot1.clear()
 
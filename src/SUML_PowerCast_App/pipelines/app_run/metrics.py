@@ -0,0 +1,208 @@
+"""
+Module with the Prometheus metrics exposed by the API on `/metrics`.
+
+`prometheus_client` is imported by `init_metrics`, after `PROMETHEUS_MULTIPROC_DIR`
+is set, because the library picks its value storage at import time. With the
+directory set every worker writes its samples to memory-mapped files there and a
+scrape of any worker aggregates all of them. Until `init_metrics` has run, the
+`observe_*` helpers do nothing, so disabling metrics costs nothing per request.
+"""
+
+import glob
+import os
+import time
+from typing import Optional
+
+import psutil
+
+_metrics: Optional[dict] = None
+_multiproc_dir: Optional[str] = None
+
+# Millisecond-scale inference and sub-millisecond bookkeeping, in seconds
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+def init_metrics(multiproc_dir: Optional[str] = None, clean: bool = False):
+    """
+    Creates the metrics of this process.
+
+    Args:
+        multiproc_dir (str, optional): Directory shared by all workers of one server.
+            Needed when several processes serve the API.
+        clean (bool): Remove samples left by an earlier server; only the parent
+            process should do this, before any worker starts.
+    """
+    global _metrics, _multiproc_dir
+    if _metrics is not None:
+        return
+
+    if multiproc_dir:
+        os.makedirs(multiproc_dir, exist_ok=True)
+        if clean:
+            for path in glob.glob(os.path.join(multiproc_dir, "*.db")):
+                os.remove(path)
+        os.environ["PROMETHEUS_MULTIPROC_DIR"] = multiproc_dir
+        _multiproc_dir = multiproc_dir
+
+    from prometheus_client import Counter, Gauge, Histogram
+
+    _metrics = {
+        "requests": Counter(
+            "powercast_requests_total", "HTTP requests handled.", ["method", "path", "status"]
+        ),
+        "request_latency": Histogram(
+            "powercast_request_latency_seconds", "HTTP request latency.", ["method", "path"],
+            buckets=LATENCY_BUCKETS
+        ),
+        "predict_latency": Histogram(
+            "powercast_predict_latency_seconds", "Model inference time per predict call.", ["zone", "tier"],
+            buckets=LATENCY_BUCKETS
+        ),
+        "predict_rows": Counter(
+            "powercast_predicted_rows_total", "Rows scored.", ["zone", "tier"]
+        ),
+        "feature_frame": Histogram(
+            "powercast_feature_frame_seconds", "Time to build the model input frame.",
+            buckets=LATENCY_BUCKETS
+        ),
+        "log_append": Histogram(
+            "powercast_prediction_log_append_seconds", "Time to queue scored rows on the request path.",
+            buckets=LATENCY_BUCKETS
+        ),
+        "log_flush": Histogram(
+            "powercast_prediction_log_flush_seconds", "Time to write one buffered batch to disk.",
+            buckets=LATENCY_BUCKETS
+        ),
+        "model_load": Gauge(
+            "powercast_model_load_seconds", "Time the last model load took.",
+            multiprocess_mode="max"
+        ),
+        "model_info": Gauge(
+            "powercast_model_info", "Model version being served, 1 for the current one.", ["version"],
+            multiprocess_mode="liveall"
+        ),
+        "time_to_ready": Gauge(
+            "powercast_time_to_ready_seconds", "Time from process start until the API reported ready.",
+            multiprocess_mode="max"
+        ),
+        "rss": Gauge(
+            "powercast_process_resident_memory_bytes", "Resident memory of each API process.",
+            multiprocess_mode="liveall"
+        ),
+    }
+
+
+def _observe(name: str, value: float, *labels: str):
+    if _metrics is None:
+        return
+    metric = _metrics[name]
+    (metric.labels(*labels) if labels else metric).observe(value)
+
+
+def observe_request(method: str, path: str, status: int, seconds: float):
+    if _metrics is None:
+        return
+    _metrics["requests"].labels(method, path, str(status)).inc()
+    _metrics["request_latency"].labels(method, path).observe(seconds)
+
+
+def observe_predict(zone: str, rows: int, seconds: float, tier: str = "autogluon"):
+    if _metrics is None:
+        return
+    _metrics["predict_latency"].labels(zone, tier).observe(seconds)
+    _metrics["predict_rows"].labels(zone, tier).inc(rows)
+
+
+def observe_feature_frame(seconds: float):
+    _observe("feature_frame", seconds)
+
+
+def observe_log_append(seconds: float):
+    _observe("log_append", seconds)
+
+
+def observe_log_flush(seconds: float):
+    _observe("log_flush", seconds)
+
+
+def set_model_loaded(version: str, load_seconds: Optional[float] = None, previous_version: Optional[str] = None):
+    """
+    Records the version now served and how long loading it took.
+    """
+    if _metrics is None:
+        return
+    if previous_version is not None and previous_version != version:
+        _metrics["model_info"].labels(previous_version).set(0)
+    _metrics["model_info"].labels(version).set(1)
+    if load_seconds is not None:
+        _metrics["model_load"].set(load_seconds)
+
+
+def set_time_to_ready(seconds: float):
+    if _metrics is not None:
+        _metrics["time_to_ready"].set(seconds)
+
+
+def update_process_metrics():
+    if _metrics is None:
+        return
+    _metrics["rss"].set(psutil.Process(os.getpid()).memory_info().rss)
+
+
+def mark_worker_dead(pid: int):
+    """
+    Drops the live gauges of a worker that exited; called by the parent process.
+    """
+    if _multiproc_dir is not None:
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(pid, _multiproc_dir)
+
+
+def render_metrics():
+    """
+    Returns the body and content type of a `/metrics` response.
+    """
+    from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, generate_latest
+
+    update_process_metrics()
+    if _multiproc_dir is not None:
+        from prometheus_client import multiprocess
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware counting requests and timing them per route template.
+
+    Written against the raw ASGI interface, which costs less per request than
+    Starlette's `BaseHTTPMiddleware`.
+    """
+
+    def __init__(self, app, skip_paths=("/metrics",)):
+        self.app = app
+        self.skip_paths = set(skip_paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or _metrics is None or scope["path"] in self.skip_paths:
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = {"code": 500}
+
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # The route template keeps label cardinality bounded, e.g. /jobs/{job_id}
+            route = scope.get("route")
+            path = getattr(route, "path", "unmatched")
+            observe_request(scope["method"], path, status["code"], time.perf_counter() - started)
@@ -0,0 +1,240 @@
+"""
+Module holding the models served by the API and swapping them after retraining.
+
+New predictors are loaded and warmed in the background, then published with a
+single reference assignment. Requests take a snapshot when they start, so any
+request in flight during a swap finishes on the version it started with.
+"""
+
+import os
+import pickle
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, NamedTuple, Optional, Union
+
+import pandas as pd
+from autogluon.tabular import TabularPredictor
+
+from .backfill import FEATURE_COLUMNS
+
+BEST_MODELS_PATH = "data/06_models/best_models.pkl"
+BASELINE_MODELS_PATH = "data/06_models/baseline_models.pkl"
+
+
+class LoadedModels(NamedTuple):
+    """
+    One immutable generation of served models.
+    """
+    version: str
+    models: Dict[str, TabularPredictor]
+    loaded_at: str
+    # Fast scikit-learn estimators keyed by target column, empty if none were trained
+    baseline: Dict[str, object] = {}
+
+    @property
+    def zones(self) -> List[str]:
+        """
+        Zones that can be scored, by AutoGluon or, before its first training, by the baseline.
+        """
+        return list(self.models) + [zone for zone in self.baseline if zone not in self.models]
+
+
+def model_version_id(models_path: str = BEST_MODELS_PATH) -> str:
+    """
+    Derives a version id from the modification time of the saved models.
+    """
+    if not os.path.exists(models_path):
+        return "unversioned"
+    modified = datetime.fromtimestamp(os.path.getmtime(models_path))
+    return modified.strftime("v%Y%m%d-%H%M%S")
+
+
+def resolve_predictors(best_models: Dict[str, Union[str, TabularPredictor]]) -> Dict[str, TabularPredictor]:
+    """
+    Loads the predictors of a slim-artifact manifest, where each target maps to the
+    directory of its predictor; entries that already are predictors are kept as they are.
+    """
+    return {
+        target: TabularPredictor.load(model) if isinstance(model, str) else model
+        for target, model in best_models.items()
+    }
+
+
+def load_best_models(models_path: str = BEST_MODELS_PATH) -> Dict[str, TabularPredictor]:
+    """
+    Loads the predictors written by the `model_training` pipeline.
+
+    Args:
+        models_path (str): Pickle holding a dict of predictors, or of predictor paths,
+            keyed by target column.
+
+    Returns:
+        dict: Predictors keyed by target column.
+    """
+    with open(models_path, "rb") as file:
+        return resolve_predictors(pickle.load(file))
+
+
+def load_baseline_models(baseline_path: str = BASELINE_MODELS_PATH) -> Dict[str, object]:
+    """
+    Loads the estimators written by the `baseline_training` pipeline, if any.
+
+    Args:
+        baseline_path (str): Pickle holding a dict of estimators keyed by target column.
+
+    Returns:
+        dict: Estimators keyed by target column, empty if the pickle is missing or unreadable.
+    """
+    if not os.path.exists(baseline_path):
+        return {}
+    try:
+        with open(baseline_path, "rb") as file:
+            return pickle.load(file)
+    except Exception as e:
+        print(f"Could not load the baseline models, serving without them: {e}")
+        return {}
+
+
+def warm_up(best_models: Dict[str, TabularPredictor], batch_size: int = 64, persist: bool = True):
+    """
+    Keeps every predictor's models in memory and runs a synthetic row and a synthetic
+    batch through them, so the first real requests don't pay for lazy model loading
+    inside AutoGluon.
+
+    Args:
+        best_models (dict): Predictors keyed by target column.
+        batch_size (int): Rows of the synthetic batch, to warm the batched code paths.
+        persist (bool): Load the models into memory instead of from disk on each predict.
+    """
+    sample = pd.DataFrame([{column: 0.0 for column in FEATURE_COLUMNS}])
+    batch = pd.concat([sample] * max(batch_size, 1), ignore_index=True)
+    for model in best_models.values():
+        if persist:
+            model.persist()
+        model.predict(sample)
+        model.predict(batch)
+
+
+class ModelStore:
+    """
+    Holds the current `LoadedModels` and replaces it atomically on reload.
+    """
+
+    def __init__(
+        self,
+        best_models: Dict[str, TabularPredictor],
+        models_path: str = BEST_MODELS_PATH,
+        warmup_params: Optional[dict] = None,
+        baseline_path: Optional[str] = None
+    ):
+        """
+        Args:
+            best_models (dict): Predictors served until the first reload.
+            models_path (str): Pickle the models are reloaded from.
+            warmup_params (dict, optional): `batch_size` and `persist` passed to `warm_up`.
+            baseline_path (str, optional): Pickle of the baseline estimators, loaded
+                with every generation. None serves without a baseline.
+        """
+        self.models_path = models_path
+        self.warmup_params = warmup_params or {}
+        self.baseline_path = baseline_path
+        self._current = LoadedModels(
+            version=model_version_id(models_path),
+            models=best_models,
+            loaded_at=datetime.now().isoformat(timespec="seconds"),
+            baseline=load_baseline_models(baseline_path) if baseline_path else {}
+        )
+        self._reload_lock = threading.Lock()
+        self._reload_thread: Optional[threading.Thread] = None
+        self._reload_listeners: List[Callable[[], None]] = []
+        self.last_error: Optional[str] = None
+        self.last_load_s: Optional[float] = None
+
+    def add_reload_listener(self, listener: Callable[[], None]):
+        """
+        Registers a callable run after every successful swap, e.g. to clear caches.
+        """
+        self._reload_listeners.append(listener)
+
+    def warm_up(self, best_models: Optional[Dict[str, TabularPredictor]] = None):
+        """
+        Warms `best_models`, by default the ones being served.
+        """
+        warm_up(
+            self._current.models if best_models is None else best_models,
+            batch_size=self.warmup_params.get("batch_size", 64),
+            persist=self.warmup_params.get("persist", True)
+        )
+
+    def snapshot(self) -> LoadedModels:
+        """
+        Returns the models a request should use from start to finish.
+        """
+        return self._current
+
+    def reload(self) -> str:
+        """
+        Loads and warms the saved models, then swaps them in.
+
+        Returns:
+            str: Version id of the models now being served.
+        """
+        with self._reload_lock:
+            started = time.perf_counter()
+            version = model_version_id(self.models_path)
+            best_models = load_best_models(self.models_path)
+            baseline = load_baseline_models(self.baseline_path) if self.baseline_path else {}
+            self.warm_up(best_models)
+            self.last_load_s = time.perf_counter() - started
+
+            # Single reference assignment, readers see either the old or the new generation
+            self._current = LoadedModels(
+                version=version,
+                models=best_models,
+                loaded_at=datetime.now().isoformat(timespec="seconds"),
+                baseline=baseline
+            )
+            print(f"Models reloaded, now serving version {version}")
+
+            for listener in self._reload_listeners:
+                listener()
+            return version
+
+    def reload_async(self) -> bool:
+        """
+        Starts `reload` in a background thread unless one is already running.
+
+        Returns:
+            bool: True if a reload was started.
+        """
+        if self.reloading:
+            return False
+        self._reload_thread = threading.Thread(target=self._reload_in_background, name="model-reload", daemon=True)
+        self._reload_thread.start()
+        return True
+
+    @property
+    def reloading(self) -> bool:
+        return self._reload_thread is not None and self._reload_thread.is_alive()
+
+    def status(self) -> dict:
+        current = self._current
+        return {
+            "model_version": current.version,
+            "loaded_at": current.loaded_at,
+            "zones": current.zones,
+            "autogluon_zones": list(current.models),
+            "baseline_zones": list(current.baseline),
+            "reloading": self.reloading,
+            "last_error": self.last_error,
+            "last_load_s": self.last_load_s,
+        }
+
+    def _reload_in_background(self):
+        try:
+            self.reload()
+            self.last_error = None
+        except Exception as e:
+            self.last_error = str(e)
+            print(f"Model reload failed, still serving the previous version: {e}")
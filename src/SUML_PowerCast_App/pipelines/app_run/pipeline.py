@@ -9,7 +9,7 @@ from .api_run import api_run
 def create_pipeline() -> Pipeline:
     """
     Creates a Kedro pipeline that runs the api_run node to start the API
-    using the best_models input.
+    using the best_models input and the `api` parameters.
 
     Returns:
         Pipeline: The constructed pipeline for running the API.
@@ -17,7 +17,7 @@ def create_pipeline() -> Pipeline:
     return pipeline([
         node(
             func=api_run,
-            inputs=["best_models"],
+            inputs=["best_models", "params:api"],
             outputs=None,
             name="api_node"
         )
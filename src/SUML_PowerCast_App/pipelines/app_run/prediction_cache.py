@@ -0,0 +1,102 @@
+"""
+Module with the LRU + TTL cache of `/predict` results.
+
+Entries are keyed on the weather features, rounded to a fixed number of decimals,
+and on the model version, so a model reload can never serve stale predictions.
+Each entry holds the value of every zone scored for those features so far.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Hashable, Iterable, Optional
+
+
+class PredictionCache:
+    """
+    Bounded cache of per-zone predictions, evicting the least recently used entry.
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl_s: float = 60, decimals: int = 3):
+        """
+        Args:
+            max_entries (int): Maximum number of cached feature vectors.
+            ttl_s (float): Seconds an entry stays valid after it was stored.
+            decimals (int): Decimals the features are rounded to when building keys.
+        """
+        self.max_entries = max_entries
+        self.ttl_s = ttl_s
+        self.decimals = decimals
+
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def make_key(self, input_data, model_version: str) -> tuple:
+        """
+        Builds the cache key of one `WeatherInput`.
+        """
+        return (
+            round(input_data.temperature, self.decimals),
+            round(input_data.humidity, self.decimals),
+            round(input_data.wind_speed, self.decimals),
+            round(input_data.general_diffuse_flows, self.decimals),
+            round(input_data.diffuse_flows, self.decimals),
+            model_version,
+        )
+
+    def get(self, key: tuple, zone_keys: Iterable[str]) -> Optional[Dict[str, float]]:
+        """
+        Returns the cached value of every zone in `zone_keys`, or None unless all are cached.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] < time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                entry = None
+
+            if entry is None or not all(zone in entry[1] for zone in zone_keys):
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return {zone: entry[1][zone] for zone in zone_keys}
+
+    def put(self, key: tuple, predictions: Dict[str, float]):
+        """
+        Stores zone predictions, merging them with zones already cached for the key.
+        """
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            values = dict(entry[1]) if entry is not None and entry[0] >= time.monotonic() else {}
+            values.update(predictions)
+            self._entries[key] = (time.monotonic() + self.ttl_s, values)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """
+        Drops every entry, e.g. after the served models were reloaded.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
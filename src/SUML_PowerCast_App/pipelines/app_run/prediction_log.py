@@ -0,0 +1,228 @@
+"""
+Module with the write-behind prediction log used by the API.
+
+Scored rows are buffered in memory and appended to the raw dataset in bulk by a
+background thread, so requests never wait on disk I/O. Writes are guarded by a
+lock file, which keeps several API processes from interleaving their appends.
+The rows go to the CSV file or, once the data is migrated, to the month partitions.
+In the "auto" storage the choice is made again on every flush, under the lock the
+migration holds, so rows logged while the data is migrated are never left behind
+in the CSV.
+"""
+
+import atexit
+import csv
+import os
+import threading
+import time
+from typing import Callable, List, Optional
+
+import pandas as pd
+
+from SUML_PowerCast_App.datasets.file_lock import FileLock
+from SUML_PowerCast_App.datasets.partitioned_consumption import append_partitions, compact_partitions, is_partitioned
+
+# Model tier of a logged row, "baseline" or "autogluon"; passed to the flush listeners
+# with the rows but never written
+TIER_COLUMN = "_tier"
+
+
+class PredictionLog:
+    """
+    Buffers scored rows and appends them to a CSV file in bulk.
+
+    The buffer is flushed by a background thread when it holds `flush_rows` rows
+    or every `flush_interval_s` seconds, and always on `close()` and at exit.
+    """
+
+    def __init__(
+        self,
+        file_path: str,
+        flush_rows: int = 500,
+        flush_interval_s: float = 1.0,
+        durable: bool = False,
+        partitioned_path: Optional[str] = None,
+        compact_min_segments: int = 20,
+        storage: str = "parquet"
+    ):
+        """
+        Args:
+            file_path (str): CSV file the rows are appended to.
+            flush_rows (int): Buffered row count that triggers an early flush.
+            flush_interval_s (float): Maximum time rows stay in the buffer.
+            durable (bool): Fsync the file after every flushed batch.
+            partitioned_path (str, optional): Root of the month partitions; when set,
+                rows are written there as Parquet segments instead of to `file_path`.
+            compact_min_segments (int): Segment count at which a month is compacted.
+            storage (str): With `partitioned_path` set, "parquet" always writes the
+                partitions and "auto" writes them only once the CSV has been migrated.
+        """
+        self.file_path = file_path
+        self.flush_rows = flush_rows
+        self.flush_interval_s = flush_interval_s
+        self.durable = durable
+        self.partitioned_path = partitioned_path
+        self.compact_min_segments = compact_min_segments
+        self.storage = storage
+        # The lock of the raw CSV, also taken by `migrate_csv_to_partitions`
+        self.lock = FileLock(f"{file_path}.lock")
+
+        self._buffer: List[pd.DataFrame] = []
+        self._buffered_rows = 0
+        self._buffer_lock = threading.Lock()
+        self._flush_requested = threading.Event()
+        self._closed = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._flush_listeners: List[Callable[[pd.DataFrame], None]] = []
+
+        self.flushes = 0
+        self.rows_written = 0
+        self.last_flush_s = 0.0
+
+    def add_flush_listener(self, listener: Callable[[pd.DataFrame], None]):
+        """
+        Registers a callable receiving every written batch, called with `self.lock` held.
+        """
+        self._flush_listeners.append(listener)
+
+    def start(self):
+        """
+        Starts the background flush thread.
+        """
+        if self._thread is None:
+            self._closed.clear()
+            self._thread = threading.Thread(target=self._run, name="prediction-log", daemon=True)
+            self._thread.start()
+            atexit.register(self.close)
+
+    def append(self, rows: pd.DataFrame):
+        """
+        Queues rows for writing; returns without touching the disk.
+        """
+        if rows.empty:
+            return
+        with self._buffer_lock:
+            self._buffer.append(rows)
+            self._buffered_rows += len(rows)
+            full = self._buffered_rows >= self.flush_rows
+
+        if self._thread is None:
+            # Without the background thread, fall back to writing synchronously
+            self.flush()
+        elif full:
+            self._flush_requested.set()
+
+    def flush(self):
+        """
+        Writes every buffered row to the file in one append.
+        """
+        # The buffer is taken with the file lock held, so concurrent flushes write in append order
+        with self.lock:
+            with self._buffer_lock:
+                if not self._buffer:
+                    return
+                pending, self._buffer = self._buffer, []
+                self._buffered_rows = 0
+
+            rows = pd.concat(pending, ignore_index=True)
+            stored_rows = rows.drop(columns=[TIER_COLUMN], errors="ignore")
+            started = time.perf_counter()
+            try:
+                if self.uses_partitions():
+                    months = append_partitions(self.partitioned_path, stored_rows, self.durable)
+                    compact_partitions(self.partitioned_path, months, self.compact_min_segments)
+                else:
+                    self._append_csv(stored_rows)
+            except Exception:
+                # Put the rows back in front so the next flush retries them in order
+                with self._buffer_lock:
+                    self._buffer.insert(0, rows)
+                    self._buffered_rows += len(rows)
+                raise
+
+            self.flushes += 1
+            self.rows_written += len(rows)
+            self.last_flush_s = time.perf_counter() - started
+
+            # The rows are on disk, a failing listener must not get them written twice
+            for listener in self._flush_listeners:
+                try:
+                    listener(rows)
+                except Exception as e:
+                    print(f"Prediction log listener failed: {e}")
+
+    def uses_partitions(self) -> bool:
+        """
+        Tells whether the rows currently go to the partitions; checked on every flush.
+        """
+        if self.partitioned_path is None:
+            return False
+        return self.storage != "auto" or is_partitioned(self.partitioned_path)
+
+    def _append_csv(self, rows: pd.DataFrame):
+        """
+        Appends rows to the CSV file. Must be called with `self.lock` held.
+        """
+        header = not os.path.exists(self.file_path) or os.path.getsize(self.file_path) == 0
+        if not header:
+            rows = rows.reindex(columns=self._match_file_columns(list(rows.columns)))
+        with open(self.file_path, "a", newline="", encoding="utf-8") as file:
+            rows.to_csv(file, index=False, header=header)
+            if self.durable:
+                file.flush()
+                os.fsync(file.fileno())
+
+    def _match_file_columns(self, columns: List[str]) -> List[str]:
+        """
+        Returns the file's column order, first adding any of `columns` the file lacks.
+        Must be called with `self.lock` held.
+        """
+        with open(self.file_path, newline="", encoding="utf-8") as file:
+            file_columns = next(csv.reader(file), [])
+
+        missing = [column for column in columns if column not in file_columns]
+        if missing:
+            # One-time upgrade of an older file, e.g. one logged before ModelVersion existed
+            existing = pd.read_csv(self.file_path)
+            for column in missing:
+                existing[column] = None
+            tmp_path = f"{self.file_path}.tmp"
+            existing.to_csv(tmp_path, index=False)
+            os.replace(tmp_path, self.file_path)
+            file_columns = file_columns + missing
+
+        return file_columns
+
+    def close(self):
+        """
+        Stops the background thread and flushes whatever is still buffered.
+        """
+        if self._thread is not None:
+            self._closed.set()
+            self._flush_requested.set()
+            self._thread.join()
+            self._thread = None
+            atexit.unregister(self.close)
+        self.flush()
+
+    def stats(self) -> dict:
+        """
+        Returns buffer and write counters.
+        """
+        return {
+            "buffered_rows": self._buffered_rows,
+            "flushes": self.flushes,
+            "rows_written": self.rows_written,
+            "last_flush_s": round(self.last_flush_s, 4),
+            "durable": self.durable,
+            "storage": "parquet" if self.uses_partitions() else "csv",
+        }
+
+    def _run(self):
+        while not self._closed.is_set():
+            self._flush_requested.wait(self.flush_interval_s)
+            self._flush_requested.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"Prediction log flush failed, will retry: {e}")
@@ -0,0 +1,117 @@
+"""
+Module maintaining the per-month consumption aggregate shown in the GUI chart.
+
+The aggregate keeps the sum and the count of every zone per month. It is updated
+from each batch the prediction log writes and is rebuilt from the raw data only
+when it is missing or after rows were rewritten, so reading it costs a few dozen
+rows no matter how much history the raw dataset holds.
+"""
+
+import os
+from typing import List, Optional
+
+import pandas as pd
+
+from SUML_PowerCast_App.datasets.partitioned_consumption import read_partitions
+
+ROLLUP_PATH = "data/03_primary/monthly_rollup.csv"
+ZONE_COLUMNS = ["PowerConsumption_Zone1", "PowerConsumption_Zone2", "PowerConsumption_Zone3"]
+DATETIME_FORMAT = "%m/%d/%Y %H:%M"
+
+
+def _aggregate(rows: pd.DataFrame) -> pd.DataFrame:
+    """
+    Sums and counts the zone values of `rows` per month.
+    """
+    datetimes = rows["Datetime"]
+    if not pd.api.types.is_datetime64_any_dtype(datetimes):
+        datetimes = pd.to_datetime(datetimes, format=DATETIME_FORMAT, errors="coerce")
+    months = datetimes.dt.strftime("%Y-%m").rename("Month")
+
+    zones = rows.reindex(columns=ZONE_COLUMNS).apply(pd.to_numeric, errors="coerce")
+    grouped = zones.groupby(months)
+    sums = grouped.sum().add_suffix("_sum")
+    counts = grouped.count().add_suffix("_count")
+    return pd.concat([sums, counts], axis=1)
+
+
+class MonthlyRollup:
+    """
+    Persisted per-month sum and count of every zone.
+
+    The persisted file is the single source of truth: `update` and `rebuild` must be
+    called with the lock of the raw dataset held, so several API processes can share it.
+    """
+
+    def __init__(self, path: str = ROLLUP_PATH, raw_csv_path: str = "", partitioned_path: str = ""):
+        """
+        Args:
+            path (str): CSV file holding the aggregate.
+            raw_csv_path (str): Raw consumption CSV, used to rebuild.
+            partitioned_path (str): Root of the month partitions, used to rebuild once migrated.
+        """
+        self.path = path
+        self.raw_csv_path = raw_csv_path
+        self.partitioned_path = partitioned_path
+        self._cached: Optional[pd.DataFrame] = None
+        self._cached_mtime: Optional[float] = None
+
+    def exists(self) -> bool:
+        return os.path.exists(self.path)
+
+    def rebuild(self):
+        """
+        Recomputes the aggregate from the whole raw dataset.
+        """
+        rows = read_partitions(
+            self.partitioned_path,
+            columns=["Datetime", *ZONE_COLUMNS],
+            legacy_filepath=self.raw_csv_path
+        )
+        self._write(_aggregate(rows))
+        print(f"Monthly rollup rebuilt from {len(rows)} rows")
+
+    def update(self, rows: pd.DataFrame):
+        """
+        Adds newly written rows to the aggregate.
+        """
+        if rows.empty:
+            return
+        delta = _aggregate(rows)
+        current = self._read()
+        merged = delta if current is None else current.add(delta, fill_value=0)
+        self._write(merged)
+
+    def query(self, zones: List[str]) -> dict:
+        """
+        Returns the mean consumption of `zones` per month, oldest month first.
+        """
+        current = self._read()
+        if current is None:
+            return {"months": [], "zones": {zone: [] for zone in zones}}
+
+        means = {}
+        for zone in zones:
+            counts = current[f"{zone}_count"]
+            means[zone] = [
+                None if count == 0 else float(total / count)
+                for total, count in zip(current[f"{zone}_sum"], counts)
+            ]
+        return {"months": list(current.index), "zones": means}
+
+    def _read(self) -> Optional[pd.DataFrame]:
+        if not os.path.exists(self.path):
+            return None
+        mtime = os.path.getmtime(self.path)
+        if self._cached is None or self._cached_mtime != mtime:
+            self._cached = pd.read_csv(self.path, index_col="Month")
+            self._cached_mtime = mtime
+        return self._cached
+
+    def _write(self, aggregate: pd.DataFrame):
+        aggregate = aggregate.sort_index()
+        aggregate.index.name = "Month"
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        aggregate.to_csv(tmp_path)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,257 @@
+"""
+Module running model training as background jobs for the `/update` endpoint.
+
+Each job runs the Kedro `model_training` pipeline in its own process, so the API
+keeps serving while training takes hours. Progress (current node, current zone)
+is sent back over a queue and exposed through `/jobs/{id}`.
+
+The job process is not a daemon, so the training nodes can start process pools of
+their own. It is therefore stopped explicitly, with its children, on cancel and on
+`shutdown`, which also runs at interpreter exit.
+"""
+
+import atexit
+import multiprocessing
+import queue
+import threading
+import time
+import uuid
+import weakref
+from datetime import datetime
+from typing import Callable, Dict, Optional
+
+import psutil
+
+TRAINING_STATE_PATH = "data/06_models/training_state.json"
+
+# Managers with jobs to stop at exit, without keeping the managers alive
+_managers = weakref.WeakSet()
+
+
+@atexit.register
+def _shutdown_all():
+    # multiprocessing joins non-daemonic children at exit, stop them first instead
+    for manager in list(_managers):
+        manager.shutdown()
+
+
+def _run_training_job(project_path: str, pipeline_name: str, progress_queue):
+    """
+    Entry point of the training process.
+    """
+    from kedro.framework.session import KedroSession
+    from kedro.framework.startup import bootstrap_project
+
+    from SUML_PowerCast_App.progress import set_progress_sink
+
+    set_progress_sink(progress_queue.put)
+    try:
+        bootstrap_project(project_path)
+        with KedroSession.create(project_path=project_path) as session:
+            session.run(pipeline_name=pipeline_name)
+    except Exception as e:
+        progress_queue.put({"error": str(e)})
+        raise
+
+
+class TrainingJobManager:
+    """
+    Starts training jobs and tracks their progress.
+
+    Only one job runs at a time: a request made while a job is queued or running
+    is coalesced into that job and gets its id back.
+    """
+
+    def __init__(
+        self,
+        project_path: str = ".",
+        pipeline_name: str = "model_training",
+        on_success: Optional[Callable[[], None]] = None,
+        job_target: Callable = _run_training_job
+    ):
+        """
+        Args:
+            project_path (str): Root of the Kedro project.
+            pipeline_name (str): Pipeline run by every job.
+            on_success (callable, optional): Called after a job finishes successfully,
+                e.g. to reload the served models.
+            job_target (callable): Entry point of the job process, called with the
+                project path, the pipeline name and the progress queue.
+        """
+        self.project_path = project_path
+        self.pipeline_name = pipeline_name
+        self.on_success = on_success
+        self.job_target = job_target
+
+        # Spawn keeps the worker clear of the API's threads and event loop
+        self._context = multiprocessing.get_context("spawn")
+        self._jobs: Dict[str, dict] = {}
+        self._processes: Dict[str, multiprocessing.Process] = {}
+        self._cancelled = set()
+        self._active_job_id: Optional[str] = None
+        self._monitors: Dict[str, threading.Thread] = {}
+        self._lock = threading.Lock()
+        _managers.add(self)
+
+    def submit(self, pipeline_name: Optional[str] = None) -> dict:
+        """
+        Starts a training job, or returns the one already in progress.
+
+        Args:
+            pipeline_name (str, optional): Pipeline run by this job instead of the default one.
+
+        Returns:
+            dict: Status of the job, with `coalesced` set when no new job was started.
+        """
+        pipeline_name = pipeline_name or self.pipeline_name
+        with self._lock:
+            if self._active_job_id is not None:
+                return {**self.get(self._active_job_id), "coalesced": True}
+
+            job_id = uuid.uuid4().hex[:12]
+            self._jobs[job_id] = {
+                "job_id": job_id,
+                "pipeline": pipeline_name,
+                "status": "queued",
+                "created_at": datetime.now().isoformat(timespec="seconds"),
+                "started_at": None,
+                "finished_at": None,
+                "current_node": None,
+                "current_zone": None,
+                "error": None,
+                "_started": None,
+                "_finished": None,
+            }
+            self._active_job_id = job_id
+
+        progress_queue = self._context.Queue()
+        process = self._context.Process(
+            target=self.job_target,
+            args=(self.project_path, pipeline_name, progress_queue),
+            name=f"training-{job_id}",
+            # Training nodes may start process pools, which daemonic processes cannot
+            daemon=False
+        )
+        self._processes[job_id] = process
+        process.start()
+        self._update(job_id, status="running", started_at=datetime.now().isoformat(timespec="seconds"), _started=time.time())
+
+        monitor = threading.Thread(
+            target=self._monitor, args=(job_id, process, progress_queue), name=f"monitor-{job_id}", daemon=True
+        )
+        self._monitors[job_id] = monitor
+        monitor.start()
+
+        return {**self.get(job_id), "coalesced": False}
+
+    def get(self, job_id: str) -> Optional[dict]:
+        """
+        Returns the public status of a job, or None if the id is unknown.
+        """
+        job = self._jobs.get(job_id)
+        if job is None:
+            return None
+
+        started, finished = job["_started"], job["_finished"]
+        elapsed = None
+        if started is not None:
+            elapsed = round((finished or time.time()) - started, 1)
+
+        status = {key: value for key, value in job.items() if not key.startswith("_")}
+        status["elapsed_s"] = elapsed
+        return status
+
+    def cancel(self, job_id: str) -> Optional[dict]:
+        """
+        Stops a running job; the served models are left untouched.
+
+        Returns:
+            dict: Status of the job, or None if the id is unknown.
+        """
+        if job_id not in self._jobs:
+            return None
+
+        process = self._processes.get(job_id)
+        if process is not None and process.is_alive():
+            self._cancelled.add(job_id)
+            self._stop_process(process)
+            # The monitor thread records the final status, wait briefly so callers see it
+            monitor = self._monitors.get(job_id)
+            if monitor is not None:
+                monitor.join(timeout=5)
+        return self.get(job_id)
+
+    def shutdown(self):
+        """
+        Stops every running job, e.g. when the API shuts down.
+        """
+        for job_id, process in list(self._processes.items()):
+            if process.is_alive():
+                self._cancelled.add(job_id)
+                self._stop_process(process)
+
+    @staticmethod
+    def _stop_process(process, timeout: float = 10):
+        """
+        Terminates a job process and the workers it started, killing what outlives `timeout`.
+        """
+        try:
+            children = psutil.Process(process.pid).children(recursive=True)
+        except psutil.Error:
+            children = []
+        process.terminate()
+        for child in children:
+            try:
+                child.terminate()
+            except psutil.Error:
+                continue
+        process.join(timeout=timeout)
+        if process.is_alive():
+            process.kill()
+            process.join()
+        _, alive = psutil.wait_procs(children, timeout=timeout)
+        for child in alive:
+            try:
+                child.kill()
+            except psutil.Error:
+                continue
+
+    def _update(self, job_id: str, **fields):
+        with self._lock:
+            self._jobs[job_id].update(fields)
+
+    def _monitor(self, job_id: str, process, progress_queue):
+        while process.is_alive() or not progress_queue.empty():
+            try:
+                message = progress_queue.get(timeout=1)
+            except queue.Empty:
+                continue
+            if "node" in message:
+                self._update(job_id, current_node=message["node"])
+            if "zone" in message:
+                self._update(job_id, current_zone=message["zone"])
+            if "error" in message:
+                self._update(job_id, error=message["error"])
+
+        process.join()
+        succeeded = process.exitcode == 0
+        if job_id in self._cancelled:
+            status = "cancelled"
+        else:
+            status = "succeeded" if succeeded else "failed"
+        self._update(
+            job_id,
+            status=status,
+            finished_at=datetime.now().isoformat(timespec="seconds"),
+            _finished=time.time()
+        )
+        if status == "failed" and self._jobs[job_id]["error"] is None:
+            self._update(job_id, error=f"Training process exited with code {process.exitcode}.")
+
+        with self._lock:
+            self._active_job_id = None
+        self._processes.pop(job_id, None)
+        self._monitors.pop(job_id, None)
+
+        if status == "succeeded" and self.on_success is not None:
+            self.on_success()
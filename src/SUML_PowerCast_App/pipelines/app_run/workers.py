@@ -0,0 +1,314 @@
+"""
+Module serving the API from several worker processes sharing one set of models.
+
+The supervisor process loads and warms the models, then forks the workers. The
+workers share the model memory copy-on-write instead of each loading a copy, and
+all of them accept connections on one socket bound by the supervisor.
+
+Workers are recycled gracefully: one is replaced after `max_requests` requests,
+and all of them, one at a time, when the models are reloaded. A reload is requested
+with SIGHUP, by `POST /models/reload` on any worker or by a successful training job.
+The supervisor loads the new models once and forks the replacements from them.
+
+Training jobs, the drift monitor and the prediction cache are owned by a manager
+process, so any worker can start, follow or cancel a job, recycling a worker never
+interrupts one, drift is judged on the traffic of all workers and at most one job is
+started for it. The supervisor runs the zone backfill and the rollup rebuild once
+for all workers. Forking needs a POSIX system.
+"""
+
+import gc
+import multiprocessing
+import os
+import signal
+import socket
+import threading
+import time
+from functools import partial
+from multiprocessing.managers import BaseManager
+from typing import Dict, Optional
+
+import uvicorn
+from autogluon.tabular import TabularPredictor
+
+from SUML_PowerCast_App.datasets.file_lock import FileLock
+
+from .api_run import (
+    PARTITIONED_DATA_PATH,
+    RAW_DATA_PATH,
+    create_app,
+    create_backfill_job,
+    create_drift_monitor,
+    create_prediction_cache,
+    training_pipeline,
+)
+from .backfill import BackfillJob
+from .metrics import init_metrics, mark_worker_dead
+from .model_store import BEST_MODELS_PATH, load_best_models, model_version_id, warm_up
+from .rollup import MonthlyRollup
+from .training_jobs import TrainingJobManager
+
+_shared: Dict[str, object] = {}
+
+
+def _init_shared(supervisor_pid: int, api_params: dict):
+    """
+    Runs in the manager process: builds the objects all workers share. Successful jobs
+    ask the supervisor to reload the models, and drift starts its job from here.
+    """
+    training_jobs = TrainingJobManager(on_success=partial(os.kill, supervisor_pid, signal.SIGHUP))
+    training_params = api_params.get("training", {})
+    _shared.update(
+        training_jobs=training_jobs,
+        cache=create_prediction_cache(api_params),
+        drift_monitor=create_drift_monitor(
+            api_params, lambda: training_jobs.submit(training_pipeline("auto", training_params))
+        ),
+    )
+
+
+def _get_shared(name: str):
+    return _shared[name]
+
+
+class SharedObjectsManager(BaseManager):
+    """
+    Manager process sharing the training jobs, the drift monitor and the prediction cache.
+    """
+
+
+SharedObjectsManager.register("training_jobs", callable=partial(_get_shared, "training_jobs"))
+SharedObjectsManager.register("drift_monitor", callable=partial(_get_shared, "drift_monitor"))
+SharedObjectsManager.register("cache", callable=partial(_get_shared, "cache"))
+
+
+def _run_worker(sock, best_models, api_params, started_at, supervisor_pid, manager_address, authkey, ready):
+    """
+    Entry point of a forked worker.
+    """
+    # Reloads are the supervisor's business, a worker only exits on SIGTERM/SIGINT
+    signal.signal(signal.SIGHUP, signal.SIG_IGN)
+
+    manager = SharedObjectsManager(address=manager_address, authkey=authkey)
+    manager.connect()
+
+    app = create_app(
+        best_models,
+        api_params,
+        started_at,
+        training_jobs=manager.training_jobs(),
+        request_reload=partial(os.kill, supervisor_pid, signal.SIGHUP),
+        on_ready=ready.set,
+        worker=True,
+        cache=manager.cache() if api_params.get("cache", {}).get("enabled", False) else None,
+        drift_monitor=manager.drift_monitor() if api_params.get("drift", {}).get("enabled", False) else None
+    )
+    worker_params = api_params.get("workers", {})
+    config = uvicorn.Config(
+        app,
+        limit_max_requests=worker_params.get("max_requests"),
+        timeout_graceful_shutdown=worker_params.get("graceful_timeout_s", 30)
+    )
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+class WorkerSupervisor:
+    """
+    Forks the API workers, replaces the ones that exit and recycles all of them on reload.
+    """
+
+    def __init__(self, best_models: Dict[str, TabularPredictor], api_params: dict, started_at: float):
+        """
+        Args:
+            best_models (dict): Loaded predictors, shared with every worker.
+            api_params (dict): The `api` parameters, `workers` configures this class.
+            started_at (float): `time.perf_counter()` when the process started.
+        """
+        self.best_models = best_models
+        self.api_params = api_params
+        self.started_at = started_at
+
+        worker_params = api_params.get("workers", {})
+        self.count = worker_params.get("count", 1)
+        self.graceful_timeout_s = worker_params.get("graceful_timeout_s", 30)
+        self.ready_timeout_s = worker_params.get("ready_timeout_s", 120)
+        self.models_path = api_params.get("models_path", BEST_MODELS_PATH)
+        self.models_version = model_version_id(self.models_path)
+
+        self._context = multiprocessing.get_context("fork")
+        self._workers = []
+        self._socket: Optional[socket.socket] = None
+        self._manager: Optional[SharedObjectsManager] = None
+        self._backfill_job: Optional[BackfillJob] = None
+
+        # Set from signal handlers, so plain flags rather than threading primitives
+        self._stopping = False
+        self._reload_requested = False
+        self._reload_thread: Optional[threading.Thread] = None
+        self._pending_models: Optional[Dict[str, TabularPredictor]] = None
+        self._pending_version: Optional[str] = None
+
+    def run(self):
+        """
+        Serves until SIGTERM or SIGINT, then stops the workers gracefully.
+        """
+        metrics_params = self.api_params.get("metrics", {})
+        if metrics_params.get("enabled", False):
+            init_metrics(metrics_params.get("multiproc_dir"), clean=True)
+
+        self._warm_up(self.best_models)
+        self._manager = SharedObjectsManager(ctx=self._context)
+        self._manager.start(_init_shared, (os.getpid(), self.api_params))
+        self._start_backfill()
+        self._socket = self._bind()
+
+        signal.signal(signal.SIGHUP, self._on_reload_signal)
+        signal.signal(signal.SIGTERM, self._on_stop_signal)
+        signal.signal(signal.SIGINT, self._on_stop_signal)
+
+        self._workers = [self._spawn(self.started_at) for _ in range(self.count)]
+        print(f"Serving with {self.count} workers on port {self.api_params.get('port', 8000)}")
+
+        try:
+            while not self._stopping:
+                time.sleep(0.5)
+                if self._reload_requested:
+                    self._reload_requested = False
+                    self._start_reload()
+                if self._pending_models is not None:
+                    self._recycle_all()
+                self._replace_exited_workers()
+        finally:
+            self._shutdown()
+
+    def _bind(self) -> socket.socket:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((self.api_params.get("host", "0.0.0.0"), self.api_params.get("port", 8000)))
+        sock.listen(2048)
+        sock.set_inheritable(True)
+        return sock
+
+    def _start_backfill(self):
+        """
+        Rebuilds a missing rollup and starts the zone backfill, once for all workers.
+        """
+        lock = FileLock(f"{RAW_DATA_PATH}.lock")
+        rollup = MonthlyRollup(raw_csv_path=RAW_DATA_PATH, partitioned_path=PARTITIONED_DATA_PATH)
+        with lock:
+            if not rollup.exists():
+                rollup.rebuild()
+        self._backfill_job = create_backfill_job(
+            self.api_params, lambda: (self.models_version, self.best_models), lock, rollup
+        )
+        if self._backfill_job is not None:
+            self._backfill_job.start()
+
+    def _warm_up(self, best_models):
+        warmup_params = self.api_params.get("warmup", {})
+        if warmup_params.get("enabled", True):
+            warm_up(best_models, warmup_params.get("batch_size", 64), warmup_params.get("persist", True))
+
+    def _spawn(self, started_at: float):
+        # Objects surviving to the fork are never collected in the workers, so the
+        # garbage collector doesn't write to (and copy) the shared model pages
+        gc.collect()
+        gc.freeze()
+        ready = self._context.Event()
+        process = self._context.Process(
+            target=_run_worker,
+            args=(
+                self._socket, self.best_models, self.api_params, started_at,
+                os.getpid(), self._manager.address, bytes(multiprocessing.current_process().authkey), ready
+            ),
+            name="api-worker"
+        )
+        process.start()
+        gc.unfreeze()
+        return process, ready
+
+    def _stop_worker(self, process):
+        # SIGTERM makes uvicorn finish in-flight requests and flush the prediction log
+        process.terminate()
+        process.join(self.graceful_timeout_s + 5)
+        if process.is_alive():
+            print(f"Worker {process.pid} did not stop in time, killing it")
+            process.kill()
+            process.join()
+        mark_worker_dead(process.pid)
+
+    def _replace_exited_workers(self):
+        for index, (process, _) in enumerate(self._workers):
+            if process.is_alive() or self._stopping:
+                continue
+            process.join()
+            mark_worker_dead(process.pid)
+            print(f"Worker {process.pid} exited with code {process.exitcode}, starting a new one")
+            self._workers[index] = self._spawn(time.perf_counter())
+
+    def _start_reload(self):
+        if self._reload_thread is not None and self._reload_thread.is_alive():
+            return
+        self._reload_thread = threading.Thread(target=self._load_models, name="model-reload", daemon=True)
+        self._reload_thread.start()
+
+    def _load_models(self):
+        try:
+            version = model_version_id(self.models_path)
+            best_models = load_best_models(self.models_path)
+            self._warm_up(best_models)
+            self._pending_version = version
+            self._pending_models = best_models
+        except Exception as e:
+            print(f"Model reload failed, workers keep serving the previous version: {e}")
+
+    def _recycle_all(self):
+        """
+        Replaces the workers one at a time with workers forked from the new models,
+        waiting for each replacement to be ready before stopping the worker it replaces.
+        """
+        self.models_version = self._pending_version
+        self.best_models, self._pending_models = self._pending_models, None
+        # New models come with a new drift reference, and cached predictions are stale
+        if self.api_params.get("drift", {}).get("enabled", False):
+            self._manager.drift_monitor().load_reference()
+        if self.api_params.get("cache", {}).get("enabled", False):
+            self._manager.cache().clear()
+        for index, (old_process, _) in enumerate(list(self._workers)):
+            process, ready = self._spawn(time.perf_counter())
+            if not ready.wait(self.ready_timeout_s):
+                print(f"Worker {process.pid} not ready after {self.ready_timeout_s}s, replacing {old_process.pid} anyway")
+            self._workers[index] = (process, ready)
+            self._stop_worker(old_process)
+            if self._stopping:
+                break
+        print(f"Recycled {len(self._workers)} workers onto the reloaded models")
+
+    def _shutdown(self):
+        if self._backfill_job is not None:
+            self._backfill_job.stop()
+        for process, _ in self._workers:
+            if process.is_alive():
+                process.terminate()
+        for process, _ in self._workers:
+            process.join(self.graceful_timeout_s + 5)
+            if process.is_alive():
+                process.kill()
+                process.join()
+            mark_worker_dead(process.pid)
+        if self._manager is not None:
+            # Stop running jobs first, terminating the manager would orphan them. A stop
+            # signal sent to the whole process group may have ended the manager already
+            try:
+                self._manager.training_jobs().shutdown()
+            except (ConnectionError, EOFError) as e:
+                print(f"Shared objects manager already stopped: {e}")
+            self._manager.shutdown()
+        if self._socket is not None:
+            self._socket.close()
+
+    def _on_reload_signal(self, signum, frame):
+        self._reload_requested = True
+
+    def _on_stop_signal(self, signum, frame):
+        self._stopping = True
@@ -0,0 +1,9 @@
+"""
+Pipeline 'backtesting' evaluating the models over rolling time windows
+"""
+
+from .pipeline import create_pipeline
+
+__all__ = ["create_pipeline"]
+
+__version__ = "0.1"
@@ -0,0 +1,192 @@
+"""
+Module running a rolling-origin backtest of the AutoGluon models.
+
+The history is cut into folds along `Datetime`: every fold trains on the data
+before its origin and is scored on the `horizon_days` that follow it, so the
+models are always evaluated on the future, unlike with the shuffled split. Folds
+train in parallel, sharing the cores and one global time budget between them.
+"""
+
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+FEATURE_COLUMNS = ["Temperature", "Humidity", "WindSpeed", "GeneralDiffuseFlows", "DiffuseFlows"]
+TARGET_COLUMNS = ["PowerConsumption_Zone1", "PowerConsumption_Zone2", "PowerConsumption_Zone3"]
+
+
+def make_folds(datetimes: pd.Series, parameters: dict) -> List[dict]:
+    """
+    Builds the fold windows, the last test window ending with the data.
+
+    Args:
+        datetimes (pd.Series): `Datetime` of every row, sorted.
+        parameters (dict): The `backtesting` parameters: `n_folds`, `horizon_days`,
+            `step_days` (defaults to `horizon_days`) and `train_days`
+            (null trains on all data before the origin).
+
+    Returns:
+        list: One dict per fold with the timestamps bounding its train and test windows.
+    """
+    horizon = pd.Timedelta(days=parameters.get("horizon_days", 7))
+    step = pd.Timedelta(days=parameters.get("step_days") or parameters.get("horizon_days", 7))
+    train_days = parameters.get("train_days")
+    n_folds = parameters.get("n_folds", 5)
+    first, last = datetimes.iloc[0], datetimes.iloc[-1]
+
+    folds = []
+    for fold in range(n_folds):
+        origin = last - horizon - step * (n_folds - 1 - fold)
+        train_start = first if train_days is None else max(first, origin - pd.Timedelta(days=train_days))
+        if origin <= train_start:
+            continue
+        folds.append({
+            "Fold": fold,
+            "Train_start": train_start,
+            "Origin": origin,
+            "Test_end": origin + horizon,
+        })
+    return folds
+
+
+def regression_metrics(y_true: np.ndarray, y_pred: np.ndarray) -> dict:
+    """
+    Computes MAE, MSE and R2 of every column at once.
+
+    Args:
+        y_true (np.ndarray): True values, one column per zone.
+        y_pred (np.ndarray): Predictions with the same shape.
+
+    Returns:
+        dict: Arrays of MAE, MSE and R2, one value per column.
+    """
+    errors = y_pred - y_true
+    sse = np.square(errors).sum(axis=0)
+    sst = np.square(y_true - y_true.mean(axis=0)).sum(axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        r2 = np.where(sst > 0, 1 - sse / sst, np.nan)
+    return {
+        "MAE": np.abs(errors).mean(axis=0),
+        "MSE": sse / len(y_true),
+        "R2": r2,
+    }
+
+
+def _run_fold(fold, train_data, test_data, fold_params):
+    """
+    Trains one predictor per zone on a fold and scores its test window, in a worker process.
+
+    Returns:
+        tuple: (fold, true values, predictions, seconds spent fitting)
+    """
+    from autogluon.tabular import TabularPredictor
+
+    started = time.monotonic()
+    predictions = np.empty((len(test_data), len(TARGET_COLUMNS)), dtype="float64")
+    for index, target_column in enumerate(TARGET_COLUMNS):
+        predictor = TabularPredictor(
+            label=target_column,
+            eval_metric=fold_params["eval_metric"],
+            path=os.path.join(fold_params["model_path"], f"fold_{fold['Fold']}", target_column),
+            verbosity=0,
+            # One frame for every zone, the other targets are not features
+            learner_kwargs={"ignored_columns": [column for column in TARGET_COLUMNS if column != target_column]}
+        ).fit(
+            train_data=train_data,
+            time_limit=fold_params["time_limit"] / len(TARGET_COLUMNS),
+            num_cpus=fold_params["num_cpus"],
+            presets=fold_params["presets"],
+            hyperparameters=fold_params["hyperparameters"]
+        )
+        predictions[:, index] = predictor.predict(test_data[FEATURE_COLUMNS]).to_numpy()
+
+    true_values = test_data[TARGET_COLUMNS].to_numpy(dtype="float64")
+    return fold, true_values, predictions, time.monotonic() - started
+
+
+def run_backtest(data: pd.DataFrame, parameters: dict) -> pd.DataFrame:
+    """
+    Trains and scores the models over rolling time windows.
+
+    Args:
+        data (pd.DataFrame): Consumption history with `Datetime`, features and targets.
+        parameters (dict): The `backtesting` parameters, see `parameters_backtesting.yml`.
+            `sample_every` keeps every n-th row, for fast runs on a downsampled history.
+            Folds with fewer than `min_rows` rows in their train or test window are skipped.
+
+    Returns:
+        pd.DataFrame: Metrics per fold and zone, with the fold windows and fit times.
+    """
+    if "ModelVersion" in data.columns:
+        # Rows appended by `/predict` hold predictions, not measured consumption
+        data = data[data["ModelVersion"].isna()]
+    data = data.dropna(subset=["Datetime", *TARGET_COLUMNS]).sort_values("Datetime", ignore_index=True)
+    sample_every = parameters.get("sample_every", 1)
+    if sample_every > 1:
+        data = data.iloc[::sample_every].reset_index(drop=True)
+
+    min_rows = parameters.get("min_rows", 1)
+    folds = []
+    for fold in make_folds(data["Datetime"], parameters):
+        in_train = (data["Datetime"] >= fold["Train_start"]) & (data["Datetime"] < fold["Origin"])
+        in_test = (data["Datetime"] >= fold["Origin"]) & (data["Datetime"] < fold["Test_end"])
+        # Gaps in the history can leave a window (nearly) empty
+        if in_train.sum() < min_rows or in_test.sum() < min_rows:
+            print(f"Skipping fold {fold['Fold']}: {in_train.sum()} train and {in_test.sum()} test rows")
+            continue
+        fold["Train_rows"] = int(in_train.sum())
+        folds.append((fold, in_train, in_test))
+    if not folds:
+        raise ValueError("The history is too short for the requested backtesting windows.")
+
+    total_cpus = parameters.get("num_cpus") or os.cpu_count() or 1
+    cpus_per_fold = max(1, parameters.get("cpus_per_fold", 1))
+    workers = max(1, min(len(folds), total_cpus // cpus_per_fold))
+    waves = -(-len(folds) // workers)
+    fold_params = {
+        "eval_metric": parameters.get("eval_metric", "mean_absolute_error"),
+        "model_path": parameters.get("model_path", "models/backtest"),
+        "num_cpus": cpus_per_fold,
+        # Folds run `workers` at a time, each wave gets an equal share of the budget
+        "time_limit": parameters.get("time_limit", 600) / waves,
+        "presets": parameters.get("presets", "medium_quality"),
+        "hyperparameters": parameters.get("hyperparameters"),
+    }
+    print(
+        f"Backtesting {len(folds)} folds over {len(data)} rows, {workers} at a time, "
+        f"{fold_params['time_limit']:.0f}s per fold"
+    )
+
+    columns = ["Datetime", *FEATURE_COLUMNS, *TARGET_COLUMNS]
+    started = time.monotonic()
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+        futures = []
+        for fold, in_train, in_test in folds:
+            futures.append(executor.submit(
+                _run_fold, fold, data.loc[in_train, columns[1:]], data.loc[in_test, columns], fold_params
+            ))
+        results = [future.result() for future in futures]
+
+    rows = []
+    for fold, true_values, predictions, fit_s in results:
+        metrics = regression_metrics(true_values, predictions)
+        for index, zone in enumerate(TARGET_COLUMNS):
+            rows.append({
+                **fold,
+                "Zone": zone,
+                "MAE": metrics["MAE"][index],
+                "MSE": metrics["MSE"][index],
+                "R2": metrics["R2"][index],
+                "Test_rows": len(true_values),
+                "Fit_s": round(fit_s, 1),
+            })
+
+    results_df = pd.DataFrame(rows)
+    print(f"Backtest finished in {time.monotonic() - started:.0f}s")
+    print(results_df.groupby("Zone")[["MAE", "MSE", "R2"]].mean())
+    return results_df
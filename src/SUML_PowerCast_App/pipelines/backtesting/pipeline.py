@@ -0,0 +1,24 @@
+"""
+Pipeline 'backtesting' with rolling-origin evaluation of AutoGluon models
+"""
+
+from kedro.pipeline import Pipeline, node, pipeline
+
+from .backtest import run_backtest
+
+
+def create_pipeline() -> Pipeline:
+    """
+    Creates the pipeline training and scoring one model set per rolling time window.
+
+    Returns:
+        Pipeline: A Kedro pipeline with the single run_backtest node.
+    """
+    return pipeline([
+        node(
+            func=run_backtest,
+            inputs=["power_consumption_backtest", "params:backtesting"],
+            outputs="backtest_metrics",
+            name="run_backtest_node"
+        )
+    ])
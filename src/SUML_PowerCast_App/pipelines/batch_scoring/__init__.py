@@ -0,0 +1,9 @@
+"""
+Pipeline 'batch_scoring' scoring large weather forecast files offline
+"""
+
+from .pipeline import create_pipeline
+
+__all__ = ["create_pipeline"]
+
+__version__ = "0.1"
@@ -0,0 +1,24 @@
+"""
+Pipeline 'batch_scoring' scoring a weather forecast file with the best models
+"""
+
+from kedro.pipeline import Pipeline, node, pipeline
+
+from .score_file import score_file
+
+
+def create_pipeline() -> Pipeline:
+    """
+    Creates the pipeline scoring `batch_scoring.input_path` chunk by chunk.
+
+    Returns:
+        Pipeline: A Kedro pipeline with the single score_file node.
+    """
+    return pipeline([
+        node(
+            func=score_file,
+            inputs=["best_models", "params:batch_scoring"],
+            outputs="batch_scoring_summary",
+            name="score_file_node"
+        )
+    ])
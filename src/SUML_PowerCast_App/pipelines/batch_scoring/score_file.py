@@ -0,0 +1,249 @@
+"""
+Module scoring large weather forecast files with the best models.
+
+The input is read in chunks and every chunk is scored in a process pool, each
+worker loading the predictors once. Scored chunks are written as soon as they are
+done to a Parquet dataset partitioned like the raw data,
+`<output_path>/month=YYYY-MM/part-<chunk>.parquet`, so memory stays bounded by the
+chunks in flight. Rows without a parseable `Datetime` go to `month=unknown`.
+
+Finished chunks are recorded in `_scoring.json`; a run that was interrupted resumes
+by skipping them and removing the files of any chunk it didn't record.
+"""
+
+import glob
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from contextlib import contextmanager
+from typing import Dict, Iterator, List
+
+import pandas as pd
+
+from SUML_PowerCast_App.datasets.partitioned_consumption import DATETIME_FORMAT
+
+FEATURE_COLUMNS = ["Temperature", "Humidity", "WindSpeed", "GeneralDiffuseFlows", "DiffuseFlows"]
+MANIFEST_NAME = "_scoring.json"
+THREAD_VARIABLES = ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS")
+
+_predictors: Dict[str, object] = {}
+
+
+def _predictor_paths(best_models: dict) -> Dict[str, str]:
+    """
+    Directories of the predictors, from a slim-artifact manifest or from loaded predictors.
+    """
+    return {
+        target: model if isinstance(model, str) else model.path
+        for target, model in best_models.items()
+    }
+
+
+@contextmanager
+def _thread_limits(threads_per_worker: int):
+    """
+    Limits the threads of the numeric libraries in the workers started inside the block.
+
+    The libraries read the variables once, when they are loaded, and a spawned worker
+    imports pandas (and so numpy and its BLAS) while unpickling its initializer, so the
+    variables have to be in the environment it inherits from this process.
+    """
+    previous = {variable: os.environ.get(variable) for variable in THREAD_VARIABLES}
+    os.environ.update({variable: str(threads_per_worker) for variable in THREAD_VARIABLES})
+    try:
+        yield
+    finally:
+        for variable, value in previous.items():
+            if value is None:
+                os.environ.pop(variable, None)
+            else:
+                os.environ[variable] = value
+
+
+def _init_worker(predictor_paths: Dict[str, str]):
+    """
+    Loads the predictors once per worker.
+    """
+    from autogluon.tabular import TabularPredictor
+
+    for target, path in predictor_paths.items():
+        _predictors[target] = TabularPredictor.load(path)
+        _predictors[target].persist()
+
+
+def _part_name(chunk_index: int) -> str:
+    return f"part-{chunk_index:06d}.parquet"
+
+
+def _months(chunk: pd.DataFrame) -> pd.Series:
+    """
+    Partition of every row: the month of its `Datetime`, or `unknown`.
+    """
+    if "Datetime" not in chunk.columns:
+        return pd.Series("unknown", index=chunk.index)
+    datetimes = chunk["Datetime"]
+    if not pd.api.types.is_datetime64_any_dtype(datetimes):
+        datetimes = pd.to_datetime(datetimes, format=DATETIME_FORMAT, errors="coerce")
+    return datetimes.dt.strftime("%Y-%m").fillna("unknown")
+
+
+def _score_chunk(chunk_index: int, chunk: pd.DataFrame, output_path: str) -> int:
+    """
+    Scores one chunk with every zone's predictor and writes its rows into their month
+    partitions. The files only get their final names once all of them are written.
+
+    Returns:
+        int: Number of scored rows.
+    """
+    features = chunk[FEATURE_COLUMNS].astype("float32")
+    for target, predictor in _predictors.items():
+        chunk[target] = predictor.predict(features).to_numpy(dtype="float32")
+
+    written = []
+    for month, rows in chunk.groupby(_months(chunk), sort=True):
+        directory = os.path.join(output_path, f"month={month}")
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = os.path.join(directory, f".{_part_name(chunk_index)}.tmp")
+        rows.to_parquet(tmp_path, index=False)
+        written.append(tmp_path)
+    for tmp_path in written:
+        directory, name = os.path.split(tmp_path)
+        os.replace(tmp_path, os.path.join(directory, name[1:-len(".tmp")]))
+    return len(chunk)
+
+
+def _read_chunks(input_path: str, chunk_rows: int) -> Iterator[pd.DataFrame]:
+    """
+    Yields the input in chunks of `chunk_rows` rows, from CSV or Parquet.
+    """
+    if input_path.endswith(".parquet") or os.path.isdir(input_path):
+        import pyarrow.dataset as ds
+
+        for batch in ds.dataset(input_path, format="parquet").to_batches(batch_size=chunk_rows):
+            if batch.num_rows:
+                yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(input_path, chunksize=chunk_rows)
+
+
+def _write_manifest(output_path: str, manifest: dict):
+    manifest_path = os.path.join(output_path, MANIFEST_NAME)
+    tmp_path = f"{manifest_path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as file:
+        json.dump(manifest, file, indent=2)
+    os.replace(tmp_path, manifest_path)
+
+
+def _prepare_output(output_path: str, settings: dict, resume: bool) -> List[int]:
+    """
+    Creates the output directory, or checks that the run being resumed used the same
+    settings and removes the files of the chunks it didn't finish.
+
+    Returns:
+        list: Indices of the chunks already scored.
+    """
+    os.makedirs(output_path, exist_ok=True)
+    manifest_path = os.path.join(output_path, MANIFEST_NAME)
+    completed = []
+
+    if resume and os.path.exists(manifest_path):
+        with open(manifest_path, encoding="utf-8") as file:
+            previous = json.load(file)
+        completed = previous.pop("completed", [])
+        if previous != settings:
+            raise ValueError(
+                f"{output_path} holds the output of a run with other settings ({previous}); "
+                "clear it or set resume: false."
+            )
+
+    finished = {_part_name(chunk_index) for chunk_index in completed}
+    for path in glob.glob(os.path.join(output_path, "month=*", "*")):
+        if os.path.basename(path) not in finished:
+            os.remove(path)
+    _write_manifest(output_path, {**settings, "completed": completed})
+    return completed
+
+
+def score_file(best_models: dict, parameters: dict) -> dict:
+    """
+    Scores a weather forecast file chunk by chunk in a process pool.
+
+    Args:
+        best_models (dict): Predictors, or predictor paths, keyed by target column.
+        parameters (dict): The `batch_scoring` parameters, e.g.
+            {"input_path": "data/05_model_input/weather_forecast.csv",
+             "output_path": "data/07_model_output/batch_predictions",
+             "chunk_rows": 100000, "num_workers": null, "resume": true}
+
+    Returns:
+        dict: Summary of the run: rows scored, chunks written and skipped, rows per second.
+
+    Raises:
+        ValueError: If the run to resume used other settings, or the input lacks a feature column.
+    """
+    input_path = parameters["input_path"]
+    output_path = parameters["output_path"]
+    chunk_rows = parameters.get("chunk_rows", 100000)
+    num_workers = parameters.get("num_workers") or os.cpu_count() or 1
+    threads_per_worker = max(1, (os.cpu_count() or 1) // num_workers)
+    predictor_paths = _predictor_paths(best_models)
+
+    settings = {"input_path": input_path, "chunk_rows": chunk_rows, "predictors": predictor_paths}
+    completed = _prepare_output(output_path, settings, parameters.get("resume", True))
+    skipped = set(completed)
+
+    started = time.perf_counter()
+    scored_rows = 0
+    written_chunks = 0
+
+    pending = {}
+
+    def collect(done):
+        nonlocal scored_rows, written_chunks
+        for future in done:
+            scored_rows += future.result()
+            written_chunks += 1
+            completed.append(pending.pop(future))
+        _write_manifest(output_path, {**settings, "completed": sorted(completed)})
+
+    with _thread_limits(threads_per_worker), ProcessPoolExecutor(
+        max_workers=num_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(predictor_paths,)
+    ) as executor:
+        for chunk_index, chunk in enumerate(_read_chunks(input_path, chunk_rows)):
+            if chunk_index in skipped:
+                continue
+
+            missing = [column for column in FEATURE_COLUMNS if column not in chunk.columns]
+            if missing:
+                raise ValueError(f"Input file is missing the columns {missing}.")
+
+            # Keep at most two chunks per worker in flight, so memory doesn't grow with the file
+            if len(pending) >= 2 * num_workers:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+            pending[executor.submit(_score_chunk, chunk_index, chunk, output_path)] = chunk_index
+
+            elapsed = time.perf_counter() - started
+            if written_chunks and elapsed > 0:
+                print(f"Scored {scored_rows} rows, {scored_rows / elapsed:.0f} rows/s")
+
+        collect(list(pending))
+
+    elapsed = time.perf_counter() - started
+    summary = {
+        "input_path": input_path,
+        "output_path": output_path,
+        "rows": scored_rows,
+        "chunks_written": written_chunks,
+        "chunks_skipped": len(skipped),
+        "seconds": round(elapsed, 2),
+        "rows_per_second": round(scored_rows / elapsed, 1) if elapsed > 0 else None,
+        "workers": num_workers,
+    }
+    print(f"Batch scoring done: {summary}")
+    return summary
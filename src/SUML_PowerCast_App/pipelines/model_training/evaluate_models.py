@@ -2,10 +2,100 @@
 Module that provides functions for evaluating trained models using common regression metrics.
 """
 
+import time
+from datetime import datetime
+
 import pandas as pd
 from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
 
-def evaluate_models(predictors, x_test, y_test, _parameters):
+from SUML_PowerCast_App.drift import build_profile
+
+
+def measure_latency(predictor, model_name, x_sample, repeats=20, batch_size=1000):
+    """
+    Measures how long one model of a predictor takes to score data.
+
+    Args:
+        predictor: Trained AutoGluon predictor.
+        model_name (str): Name of the model on the predictor's leaderboard.
+        x_sample (pd.DataFrame): Feature rows used for timing.
+        repeats (int): Number of single-row calls; the median is reported.
+        batch_size (int): Number of rows in the batch call.
+
+    Returns:
+        tuple: (per-row latency of a single-row call in ms, per-row latency inside a batch in ms)
+    """
+    one_row = x_sample.head(1)
+    batch = x_sample.head(batch_size)
+
+    # First call loads the model into memory, keep it out of the measurement
+    predictor.predict(one_row, model=model_name)
+
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        predictor.predict(one_row, model=model_name)
+        timings.append(time.perf_counter() - started)
+    row_ms = sorted(timings)[len(timings) // 2] * 1000
+
+    started = time.perf_counter()
+    predictor.predict(batch, model=model_name)
+    batch_row_ms = (time.perf_counter() - started) * 1000 / len(batch)
+
+    return row_ms, batch_row_ms
+
+
+def select_model_within_latency(predictor, x_test, selection_params):
+    """
+    Picks the most accurate leaderboard model whose single-row latency fits the budget
+    and makes it the predictor's best model.
+
+    Models are ranked by their validation score, so the test set, which the reported
+    metrics are computed on, plays no part in the choice.
+
+    Args:
+        predictor: Trained AutoGluon predictor.
+        x_test (pd.DataFrame): Test features, used for timing only.
+        selection_params (dict): The `model_selection` parameters.
+
+    Returns:
+        tuple: (chosen model name, its per-row latency in ms, its per-row latency in a batch in ms)
+    """
+    if selection_params.get('refit_full', False):
+        # Refit on train+val data, the _FULL copies are cheaper to run than bagged ensembles
+        predictor.refit_full()
+
+    budget_ms = selection_params.get('latency_budget_ms', 50)
+    leaderboard = predictor.leaderboard(silent=True)
+    # Refit copies have no validation data left, they rank as the model they were refit
+    # from and ahead of it, being the ones refit_full is asked for
+    scores = dict(zip(leaderboard['model'], leaderboard['score_val']))
+    leaderboard['refit'] = leaderboard['model'].str.endswith('_FULL')
+    leaderboard['score_val'] = [
+        scores.get(name[:-len('_FULL')], score) if refit else score
+        for name, score, refit in zip(leaderboard['model'], leaderboard['score_val'], leaderboard['refit'])
+    ]
+    leaderboard = leaderboard.sort_values(['score_val', 'refit'], ascending=False)
+
+    measured = []
+    for model_name in leaderboard['model']:
+        row_ms, batch_row_ms = measure_latency(
+            predictor, model_name, x_test, batch_size=selection_params.get('latency_batch_size', 1000)
+        )
+        print(f"  {model_name}: {row_ms:.2f} ms/row alone, {batch_row_ms:.4f} ms/row in batch")
+        measured.append((model_name, row_ms, batch_row_ms))
+
+    within_budget = [entry for entry in measured if entry[1] <= budget_ms]
+    if within_budget:
+        chosen = within_budget[0]
+    else:
+        chosen = min(measured, key=lambda entry: entry[1])
+        print(f"  No model meets the {budget_ms} ms budget, using the fastest one")
+
+    predictor.set_model_best(chosen[0], save_trainer=True)
+    return chosen
+
+def evaluate_models(predictors, x_test, y_test, parameters):
     """
     Evaluate a set of predictors on the given test data, save their performance, and return the results.
 
@@ -13,22 +103,38 @@ def evaluate_models(predictors, x_test, y_test, _parameters):
         predictors (dict): A dictionary where keys are target columns and values are trained model objects.
         x_test (pd.DataFrame): Feature data for testing.
         y_test (pd.DataFrame): True target data for testing.
-        _parameters (dict): Additional parameters for evaluation (currently unused).
+        parameters (dict): Additional parameters for evaluation. With
+            `model_selection.latency_aware` set, each predictor serves the most accurate
+            model meeting `model_selection.latency_budget_ms`.
 
     Returns:
         tuple: A tuple containing:
-            - results_df (pd.DataFrame): DataFrame with MAE, MSE, and R2 metrics for each target.
-            - predictors (dict): The same dictionary of predictors, possibly updated.
+            - results_df (pd.DataFrame): DataFrame with MAE, MSE, and R2 metrics, the served
+              model and its measured latency for each target.
+            - predictors (dict): The same dictionary of predictors, possibly updated. With
+              `artifacts.slim` set, a manifest mapping each target to its predictor's path.
+            - reference_profile (dict): Distribution of the test features and of each
+              zone's predictions, the reference of the API's drift monitor.
     """
 
     results = {}
     best_models = {}  # Dictionary to store the best models for each target zone
+    selection_params = parameters.get('model_selection', {})
+    slim = parameters.get('artifacts', {}).get('slim', False)
+    served_predictions = {}
 
     for target_column, predictor in predictors.items():
         print(f"\n{'='*20} Evaluating AutoGluon model for target: {target_column} {'='*20}\n")
 
+        model_name, row_ms, batch_row_ms = predictor.model_best, None, None
+        if selection_params.get('latency_aware', False):
+            model_name, row_ms, batch_row_ms = select_model_within_latency(
+                predictor, x_test, selection_params
+            )
+
         predictions = predictor.predict(x_test)
         true_values = y_test[target_column]
+        served_predictions[target_column] = predictions.to_numpy()
 
         mae = mean_absolute_error(true_values, predictions)
         mse = mean_squared_error(true_values, predictions)
@@ -37,17 +143,27 @@ def evaluate_models(predictors, x_test, y_test, _parameters):
         results[target_column] = {
             'MAE': mae,
             'MSE': mse,
-            'R2': r2_value
+            'R2': r2_value,
+            'Model': model_name,
+            'Latency_ms': row_ms,
+            'Batch_latency_ms_per_row': batch_row_ms
         }
 
         print(f"  MAE: {mae:.2f}")
         print(f"  MSE: {mse:.2f}")
         print(f"  R2: {r2_value:.2f}")
+        print(f"  Model: {model_name}")
+
+        if slim:
+            # Keep only the served model and what it depends on, and record where it lives
+            predictor.delete_models(models_to_keep='best', dry_run=False)
+            predictor.save_space(remove_data=True, remove_fit_stack=True)
+            best_models[target_column] = predictor.path
+            print(f"\nSlim model for {target_column} kept at {predictor.path}")
+            continue
 
-        # Save the model for the current target column
-        model_path = f"data/06_models/{target_column}_model.pkl"
-        predictor.save(model_path)
-        print(f"\nModel for {target_column} saved to {model_path}")
+        # The predictor was saved to its zone directory by training, best_models pickles it
+        print(f"\nModel for {target_column} kept at {predictor.path}")
 
         # Store the model in the dictionary
         best_models[target_column] = predictor
@@ -59,4 +175,15 @@ def evaluate_models(predictors, x_test, y_test, _parameters):
     print("\nFinal Evaluation Results:\n")
     print(results_df)
 
-    return results_df, predictors
+    reference_profile = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "columns": build_profile(
+            x_test.assign(**served_predictions),
+            bins=parameters.get('drift_reference', {}).get('bins', 10)
+        ),
+    }
+
+    if slim:
+        # The catalog stores this manifest of predictor paths instead of pickled predictors
+        return results_df, best_models, reference_profile
+    return results_df, predictors, reference_profile
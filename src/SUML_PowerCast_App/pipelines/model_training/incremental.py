@@ -0,0 +1,327 @@
+"""
+Module retraining the models on the rows appended since the last training run.
+
+Every full training records a high-water mark, the number of rows it was trained
+on, with reference statistics of the features. The `incremental_training` pipeline
+reads it back and, while the appended rows are few and look like the reference,
+only refits the served model of each zone on its original training data plus the
+new rows, and grows the baseline forests with trees fit on the new rows. The refit
+models are evaluated like a full training's, on its test split, which they never
+saw. Past the size or drift thresholds it runs the `model_training` pipeline instead.
+"""
+
+import math
+import os
+import shutil
+import time
+from datetime import datetime
+from typing import Dict, Optional
+
+import pandas as pd
+from sklearn.base import clone
+from kedro.pipeline import node, pipeline
+from sklearn.ensemble import RandomForestRegressor
+
+from .evaluate_models import evaluate_models
+from .split_data import FEATURE_COLUMNS, TARGET_COLUMNS, split_data
+from .train_models import _zone_frame
+
+REFIT_SUFFIX = "_FULL"
+
+
+def reference_profile(x_data: pd.DataFrame) -> Dict[str, dict]:
+    """
+    Mean and standard deviation of every feature, the reference new rows are compared to.
+    """
+    return {
+        column: {"mean": float(x_data[column].mean()), "std": float(x_data[column].std())}
+        for column in FEATURE_COLUMNS
+    }
+
+
+def record_training_state(x_train, x_dev, x_test, model_metrics):
+    """
+    Records the high-water mark of a full training run.
+
+    Args:
+        x_train (pd.DataFrame): Training features, used for the reference profile.
+        x_dev (pd.DataFrame): Validation features.
+        x_test (pd.DataFrame): Test features.
+        model_metrics (pd.DataFrame): Unused, it orders this node after the evaluation
+            so a failed run leaves the previous state in place.
+
+    Returns:
+        dict: Rows trained on, in total and by the last full fit, the rows each zone's
+            baseline was fit on and the reference profile.
+    """
+    rows = len(x_train) + len(x_dev) + len(x_test)
+    return {
+        "mode": "full",
+        "trained_at": datetime.now().isoformat(timespec="seconds"),
+        "trained_rows": rows,
+        "full_rows": rows,
+        # The baseline winners are refit on the training set only
+        "baseline_rows": {target_column: len(x_train) for target_column in TARGET_COLUMNS},
+        "reference": reference_profile(x_train),
+    }
+
+
+def feature_drift(x_new: pd.DataFrame, reference: Dict[str, dict]) -> Dict[str, float]:
+    """
+    Shift of every feature mean from the reference, in reference standard deviations.
+    """
+    drift = {}
+    for column in FEATURE_COLUMNS:
+        std = reference[column]["std"]
+        shift = abs(float(x_new[column].mean()) - reference[column]["mean"])
+        drift[column] = round(shift / std, 4) if std > 0 else 0.0
+    return drift
+
+
+def plan_retrain(data: pd.DataFrame, training_state: dict, incremental_params: dict, slim: bool = False) -> dict:
+    """
+    Decides between skipping, refitting on the new rows and a full training.
+
+    Args:
+        data (pd.DataFrame): The whole training dataset, appended rows last.
+        training_state (dict): High-water mark written by the last run.
+        incremental_params (dict): The `incremental` parameters: `max_new_fraction`,
+            `drift_threshold` and `drift_min_rows`.
+        slim (bool): Whether the predictors were saved without their training data.
+
+    Returns:
+        dict: The decision (`mode`, `reason`) and the row counts it was based on.
+    """
+    trained_rows = training_state.get("trained_rows", 0)
+    full_rows = training_state.get("full_rows", trained_rows)
+    plan = {
+        "total_rows": len(data),
+        "trained_rows": trained_rows,
+        "full_rows": full_rows,
+        "new_rows": max(len(data) - trained_rows, 0),
+        "rows_since_full": max(len(data) - full_rows, 0),
+        "drift": None,
+    }
+
+    if len(data) < trained_rows:
+        return {**plan, "mode": "full", "reason": "the dataset has fewer rows than were trained on"}
+    if slim:
+        return {**plan, "mode": "full", "reason": "slim predictors keep no training data to refit on"}
+    if plan["new_rows"] == 0:
+        return {**plan, "mode": "skip", "reason": "no rows were appended since the last run"}
+
+    max_rows = incremental_params.get("max_new_fraction", 0.1) * full_rows
+    if plan["rows_since_full"] > max_rows:
+        return {
+            **plan, "mode": "full",
+            "reason": f"{plan['rows_since_full']} rows since the last full fit exceed {max_rows:.0f}"
+        }
+
+    x_new = data.iloc[full_rows:][FEATURE_COLUMNS].dropna()
+    if len(x_new) >= incremental_params.get("drift_min_rows", 200):
+        plan["drift"] = feature_drift(x_new, training_state["reference"])
+        column = max(plan["drift"], key=plan["drift"].get)
+        threshold = incremental_params.get("drift_threshold", 0.5)
+        if plan["drift"][column] > threshold:
+            return {
+                **plan, "mode": "full",
+                "reason": f"{column} mean shifted {plan['drift'][column]:.2f} std, above {threshold}"
+            }
+
+    return {**plan, "mode": "incremental", "reason": "few new rows without drift"}
+
+
+def _refit_predictor(predictor, extra_data: Optional[pd.DataFrame], path: str):
+    """
+    Refits the served model of a copy of `predictor` on its training data plus `extra_data`.
+
+    The refit copies (`*_FULL`) of earlier runs are dropped first and the original model
+    is refit again, since `extra_data` holds every row appended since the full fit. A
+    refit trains each model once with the hyperparameters already found, without the
+    model search and bagging of `fit`. Without `extra_data` the copy is returned as is.
+    """
+    predictor = predictor.clone(path=path, return_clone=True, dirs_exist_ok=True)
+    if extra_data is None:
+        return predictor
+
+    model_name = predictor.model_best
+    if model_name.endswith(REFIT_SUFFIX):
+        model_name = model_name[:-len(REFIT_SUFFIX)]
+
+    stale = [name for name in predictor.model_names() if name.endswith(REFIT_SUFFIX)]
+    if stale:
+        predictor.set_model_best(model_name)
+        predictor.delete_models(models_to_delete=stale, dry_run=False)
+
+    predictor.refit_full(model=model_name, train_data_extra=extra_data, set_best_to_refit_full=True)
+    return predictor
+
+
+def _extend_baseline(model, x_new: pd.DataFrame, y_new: pd.Series, seen_rows: int, x_all, y_all):
+    """
+    Adds trees fit on the new rows to a forest, in proportion to their share of the
+    `seen_rows` rows its trees were fit on so far. The other estimators are cheap
+    enough to refit on every row.
+    """
+    if isinstance(model, RandomForestRegressor):
+        extra_trees = max(1, math.ceil(model.n_estimators * len(x_new) / max(seen_rows, 1)))
+        model.set_params(warm_start=True, n_estimators=model.n_estimators + extra_trees)
+        return model.fit(x_new, y_new)
+    return clone(model).fit(x_all, y_all)
+
+
+def _prune_versions(versions_path: str, keep: int):
+    """
+    Removes all but the `keep` newest refit directories; the previous one may still be served.
+    """
+    if not os.path.isdir(versions_path):
+        return
+    for name in sorted(os.listdir(versions_path))[:-keep]:
+        shutil.rmtree(os.path.join(versions_path, name), ignore_errors=True)
+
+
+def _full_retrain(data, parameters):
+    """
+    Runs the `model_training` pipeline on `data` in memory.
+
+    Returns:
+        tuple: The pipeline's best_models, baseline_models, training_state and
+            reference_profile, and the model metrics as records.
+    """
+    from kedro.io import DataCatalog, MemoryDataset
+    from kedro.runner import SequentialRunner
+
+    from .pipeline import create_pipeline
+
+    # The runner releases model_metrics once record_training_state has read it
+    training = create_pipeline() + pipeline([
+        node(_metric_records, "model_metrics", "metric_records", name="metric_records_node")
+    ])
+    # Predictors are handed from node to node as they are, not deep-copied
+    catalog = DataCatalog({name: MemoryDataset(copy_mode="assign") for name in training.datasets()})
+    catalog.save("power_consumption_training", data)
+    catalog.save("parameters", parameters)
+    outputs = SequentialRunner().run(training, catalog)
+    return tuple(
+        outputs[name]
+        for name in ("best_models", "baseline_models", "training_state", "reference_profile", "metric_records")
+    )
+
+
+def _metric_records(model_metrics: pd.DataFrame) -> list:
+    return model_metrics.to_dict(orient="records")
+
+
+def _evaluate_refit(data, refitted, training_state, parameters):
+    """
+    Evaluates the refit predictors on the test split of the last full training, and
+    picks their served model with the same latency check.
+
+    Returns:
+        tuple: The predictors, their drift monitor reference and the metrics as records.
+    """
+    _, _, x_test, _, _, y_test = split_data(data.iloc[:training_state.get("full_rows", len(data))], parameters)
+    # The refit copies are already made, a second refit_full would drop the new rows
+    evaluation_params = {
+        **parameters,
+        "model_selection": {**parameters.get("model_selection", {}), "refit_full": False},
+    }
+    model_metrics, refitted, reference = evaluate_models(refitted, x_test, y_test, evaluation_params)
+    return refitted, reference, _metric_records(model_metrics)
+
+
+def retrain_incremental(data, best_models, baseline_models, training_state, reference_profile, parameters):
+    """
+    Brings the models up to date with the rows appended since the last training run.
+
+    Args:
+        data (pd.DataFrame): The whole training dataset, appended rows last.
+        best_models (dict): The served predictors, keyed by target column.
+        baseline_models (dict): The served baseline estimators, keyed by target column.
+        training_state (dict): High-water mark written by the last run.
+        reference_profile (dict): Drift monitor reference written by the last full training.
+        parameters (dict): Training parameters, with the `incremental` section, e.g.
+            {"max_new_fraction": 0.1, "drift_threshold": 0.5, "drift_min_rows": 200,
+             "keep_versions": 2}.
+
+    Returns:
+        tuple: A tuple containing:
+            - best_models (dict): Predictors to serve.
+            - baseline_models (dict): Baseline estimators to serve.
+            - training_state (dict): The new high-water mark.
+            - reference_profile (dict): The drift monitor reference, new after a training.
+            - retrain_log (dict): The decision, the row counts, the test metrics of the
+              new models and the time it took.
+    """
+    started = time.monotonic()
+    slim = parameters.get('artifacts', {}).get('slim', False)
+    plan = plan_retrain(data, training_state, parameters.get('incremental', {}), slim)
+    print(
+        f"Retrain decision: {plan['mode']}, {plan['reason']}. {plan['new_rows']} new rows, "
+        f"{plan['rows_since_full']} since the last full fit, {plan['total_rows']} in total"
+    )
+
+    metrics = None
+    if plan['mode'] == 'full':
+        best_models, baseline_models, training_state, reference_profile, metrics = _full_retrain(data, parameters)
+    elif plan['mode'] == 'incremental':
+        new_data = data.iloc[plan['full_rows']:].dropna(subset=FEATURE_COLUMNS)
+        x_new, y_new = new_data[FEATURE_COLUMNS], new_data[TARGET_COLUMNS]
+        shared_new_data = new_data[FEATURE_COLUMNS + TARGET_COLUMNS] if parameters.get('memory_lean', False) else None
+
+        versions_path = os.path.join(parameters['autogluon']['model_path'], 'incremental')
+        version_path = os.path.join(versions_path, datetime.now().strftime('%Y%m%d-%H%M%S-%f'))
+        refitted = {}
+        for target_column, predictor in best_models.items():
+            # Every zone gets a copy in the new version, so pruning never removes a served one
+            extra_data = None
+            labelled = y_new[target_column].notna()
+            if labelled.any():
+                extra_data, _ = _zone_frame(
+                    x_new[labelled], y_new[labelled], target_column,
+                    None if shared_new_data is None else shared_new_data[labelled]
+                )
+                print(f"Refitting {predictor.model_best} for {target_column} with {int(labelled.sum())} new rows")
+            refitted[target_column] = _refit_predictor(
+                predictor, extra_data, os.path.join(version_path, target_column)
+            )
+        best_models, reference_profile, metrics = _evaluate_refit(data, refitted, training_state, parameters)
+        _prune_versions(versions_path, parameters.get('incremental', {}).get('keep_versions', 2))
+
+        # The forests already hold trees for the rows up to the previous run
+        since_last = data.iloc[plan['trained_rows']:].dropna(subset=FEATURE_COLUMNS)
+        all_rows = data.dropna(subset=FEATURE_COLUMNS)
+        baseline_rows = dict(training_state.get('baseline_rows', {}))
+        for target_column, model in list(baseline_models.items()):
+            labelled = since_last[target_column].notna()
+            if not labelled.any():
+                continue
+            known = all_rows[target_column].notna()
+            # States written before baseline_rows was recorded only know the total
+            seen_rows = baseline_rows.get(target_column, plan['trained_rows'])
+            baseline_models[target_column] = _extend_baseline(
+                model,
+                since_last.loc[labelled, FEATURE_COLUMNS], since_last.loc[labelled, target_column],
+                seen_rows,
+                all_rows.loc[known, FEATURE_COLUMNS], all_rows.loc[known, target_column]
+            )
+            baseline_rows[target_column] = (
+                seen_rows + int(labelled.sum()) if isinstance(model, RandomForestRegressor) else int(known.sum())
+            )
+
+        training_state = {
+            **training_state,
+            "mode": "incremental",
+            "trained_at": datetime.now().isoformat(timespec="seconds"),
+            "trained_rows": len(data),
+            "baseline_rows": baseline_rows,
+        }
+
+    retrain_log = {
+        **plan,
+        "metrics": metrics,
+        "seconds": round(time.monotonic() - started, 1),
+        "finished_at": datetime.now().isoformat(timespec="seconds"),
+    }
+    print(f"Retrain finished in {retrain_log['seconds']}s")
+    return best_models, baseline_models, training_state, reference_profile, retrain_log
@@ -5,9 +5,13 @@ generated using Kedro 0.19.10
 
 from kedro.pipeline import Pipeline, node, pipeline
 
+from SUML_PowerCast_App.node_cache import cached
+
 from .split_data import split_data
 from .train_models import train_models
+from .train_baseline import train_baseline_models
 from .evaluate_models import evaluate_models
+from .incremental import record_training_state, retrain_incremental
 
 
 def create_pipeline() -> Pipeline:
@@ -19,25 +23,63 @@ def create_pipeline() -> Pipeline:
     
     Returns:
         Pipeline: A Kedro pipeline that includes data splitting, model training, 
-                  and model evaluation nodes.
+                  and model evaluation nodes. Each node reuses its previous outputs
+                  while its inputs are unchanged, see `node_cache`.
     """
     return pipeline([
         node(
-            func=split_data,
-            inputs=["power_consumption_raw", "parameters"],
+            func=cached(split_data),
+            inputs=["power_consumption_training", "parameters"],
             outputs=["X_train", "X_dev", "X_test", "Y_train", "Y_dev", "Y_test"],
             name="split_data_node"
         ),
         node(
-            func=train_models,
+            func=cached(train_baseline_models),
+            inputs=["X_train", "Y_train", "X_dev", "Y_dev", "parameters"],
+            outputs=["baseline_models", "baseline_metrics"],
+            name="train_baseline_models_node"
+        ),
+        node(
+            func=cached(train_models),
             inputs=["X_train", "Y_train", "X_dev", "Y_dev", "parameters"],
             outputs="trained_models",
             name="train_models_node"
         ),
         node(
-            func=evaluate_models,
+            func=cached(evaluate_models),
             inputs=["trained_models", "X_test", "Y_test", "parameters"],
-            outputs=["model_metrics", "best_models"],
+            outputs=["model_metrics", "best_models", "reference_profile"],
             name="evaluate_models_node"
+        ),
+        node(
+            func=record_training_state,
+            inputs=["X_train", "X_dev", "X_test", "model_metrics"],
+            outputs="training_state",
+            name="record_training_state_node"
+        )
+    ])
+
+
+def create_incremental_pipeline() -> Pipeline:
+    """
+    Creates the pipeline updating the served models with the rows appended since the
+    last training run, or training them from scratch past the thresholds in `incremental`.
+
+    Returns:
+        Pipeline: A Kedro pipeline with the single incremental retraining node.
+    """
+    return pipeline([
+        node(
+            func=retrain_incremental,
+            inputs=[
+                "power_consumption_training",
+                "served_best_models",
+                "served_baseline_models",
+                "previous_training_state",
+                "previous_reference_profile",
+                "parameters"
+            ],
+            outputs=["best_models", "baseline_models", "training_state", "reference_profile", "retrain_log"],
+            name="retrain_incremental_node"
         )
     ])
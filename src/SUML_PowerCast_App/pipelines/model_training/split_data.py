@@ -2,8 +2,46 @@
 Module for splitting the dataset into training, validation, and test sets.
 """
 
+import numpy as np
+import pandas as pd
 from sklearn.model_selection import train_test_split
 
+from SUML_PowerCast_App.profiling import peak_rss_mb
+
+FEATURE_COLUMNS = ['Temperature', 'Humidity', 'WindSpeed', 'GeneralDiffuseFlows', 'DiffuseFlows']
+TARGET_COLUMNS = ['PowerConsumption_Zone1', 'PowerConsumption_Zone2', 'PowerConsumption_Zone3']
+
+
+def _split_indices(n_rows, parameters):
+    """
+    Splits row positions instead of the data; the shuffle only depends on the row
+    count, so the sets are the same as when splitting the frames themselves.
+    """
+    positions = np.arange(n_rows)
+    train, temp = train_test_split(
+        positions,
+        test_size=parameters["test_size"],
+        random_state=parameters["random_state"]
+    )
+    dev, test = train_test_split(
+        temp,
+        test_size=0.5,
+        random_state=parameters["random_state"]
+    )
+    return train, dev, test
+
+
+def _take_float32(data, columns, rows):
+    """
+    Copies `rows` of `columns` straight into one float32 block, selecting and casting in one pass.
+    """
+    block = np.empty((len(rows), len(columns)), dtype='float32', order='F')
+    for index, column in enumerate(columns):
+        # Only one selected column exists at full precision at a time
+        block[:, index] = data[column].to_numpy()[rows]
+    return pd.DataFrame(block, index=data.index[rows], columns=columns, copy=False)
+
+
 def split_data(data, parameters):
     """
     Splits the given dataset into training, validation, and test sets.
@@ -13,8 +51,11 @@ def split_data(data, parameters):
         parameters (dict): A dictionary of split parameters, for example:
             {
                 "test_size": 0.2,
-                "random_state": 42
+                "random_state": 42,
+                "memory_lean": false
             }
+            With `memory_lean`, the rows are split by index arrays and every set is
+            copied out of `data` once, as float32.
 
     Returns:
         tuple: A tuple of six elements:
@@ -22,8 +63,19 @@ def split_data(data, parameters):
             where x_* and y_* represent features and target values for the respective sets.
     """
 
-    x_data = data[['Temperature', 'Humidity', 'WindSpeed', 'GeneralDiffuseFlows', 'DiffuseFlows']]
-    y_data = data[['PowerConsumption_Zone1', 'PowerConsumption_Zone2', 'PowerConsumption_Zone3']]
+    if parameters.get("memory_lean", False):
+        splits = []
+        for rows in _split_indices(len(data), parameters):
+            splits.append((
+                _take_float32(data, FEATURE_COLUMNS, rows),
+                _take_float32(data, TARGET_COLUMNS, rows)
+            ))
+        (x_train, y_train), (x_dev, y_dev), (x_test, y_test) = splits
+        print(f"Split {len(data)} rows, peak RSS {peak_rss_mb():.0f} MB")
+        return x_train, x_dev, x_test, y_train, y_dev, y_test
+
+    x_data = data[FEATURE_COLUMNS]
+    y_data = data[TARGET_COLUMNS]
 
     x_train, x_temp, y_train, y_temp = train_test_split(
         x_data,
@@ -39,4 +91,5 @@ def split_data(data, parameters):
         random_state=parameters["random_state"]
     )
 
+    print(f"Split {len(data)} rows, peak RSS {peak_rss_mb():.0f} MB")
     return x_train, x_dev, x_test, y_train, y_dev, y_test
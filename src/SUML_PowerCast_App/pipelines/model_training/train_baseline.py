@@ -0,0 +1,117 @@
+"""
+Module training the fast scikit-learn baseline tier.
+
+The estimators in `hyperparameters` are tuned with a randomized search, or a
+successive-halving one, run on all cores. The best estimator of each zone is
+served by the API while the AutoGluon models are not ready, and for zones whose
+AutoGluon model runs over its latency budget.
+"""
+
+import multiprocessing
+import time
+
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+from sklearn.linear_model import LinearRegression
+from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+from sklearn.model_selection import HalvingRandomSearchCV, RandomizedSearchCV
+from sklearn.tree import DecisionTreeRegressor
+
+ESTIMATORS = {
+    'LinearRegression': LinearRegression,
+    'DecisionTreeRegressor': DecisionTreeRegressor,
+    'RandomForestRegressor': RandomForestRegressor,
+}
+
+
+def _search(estimator_name, grid, x_data, y_data, parameters, baseline_params):
+    """
+    Tunes one estimator on one zone.
+
+    Returns:
+        tuple: (best cross-validated MAE, the search with the refitted best estimator)
+    """
+    estimator = ESTIMATORS[estimator_name]()
+    if 'random_state' in estimator.get_params():
+        estimator.set_params(random_state=parameters['random_state'])
+
+    search_kwargs = {
+        'scoring': 'neg_mean_absolute_error',
+        'cv': parameters.get('cv_folds', 3),
+        'n_jobs': baseline_params.get('n_jobs', -1),
+        'random_state': parameters['random_state'],
+    }
+    if baseline_params.get('search', 'random') == 'halving':
+        search = HalvingRandomSearchCV(estimator, grid, **search_kwargs)
+    else:
+        grid_size = 1
+        for values in grid.values():
+            grid_size *= len(values)
+        search = RandomizedSearchCV(
+            estimator, grid, n_iter=min(parameters.get('n_iter', 10), grid_size), **search_kwargs
+        )
+
+    search.fit(x_data, y_data)
+    return -search.best_score_, search
+
+
+def train_baseline_models(x_train, y_train, x_dev, y_dev, parameters):
+    """
+    Tunes the estimators in `hyperparameters` for every zone and keeps the best one.
+
+    Args:
+        x_train (pd.DataFrame): Training features.
+        y_train (pd.DataFrame): Training targets.
+        x_dev (pd.DataFrame): Validation features.
+        y_dev (pd.DataFrame): Validation targets.
+        parameters (dict): Uses `hyperparameters`, `n_iter`, `cv_folds`, `random_state`
+            and the `baseline` section (`search`, `sample_rows`, `n_jobs`).
+
+    Returns:
+        tuple: A tuple containing:
+            - baseline_models (dict): Fitted estimators keyed by target column.
+            - results_df (pd.DataFrame): Chosen estimator, its parameters and dev metrics per target.
+    """
+    baseline_params = parameters.get('baseline', {})
+    sample_rows = baseline_params.get('sample_rows')
+    if multiprocessing.current_process().daemon:
+        # joblib cannot start workers from a daemonic process and would quietly use one core
+        print("Running in a daemonic process, the baseline search uses a single core")
+        baseline_params = {**baseline_params, 'n_jobs': 1}
+
+    # The search only ranks candidates, a sample keeps it within seconds to minutes
+    x_search, y_search = x_train, y_train
+    if sample_rows and len(x_train) > sample_rows:
+        x_search = x_train.sample(sample_rows, random_state=parameters['random_state'])
+        y_search = y_train.loc[x_search.index]
+
+    baseline_models = {}
+    results = {}
+    for target_column in y_train.columns:
+        started = time.monotonic()
+        candidates = [
+            (*_search(name, grid, x_search, y_search[target_column], parameters, baseline_params), name)
+            for name, grid in parameters['hyperparameters'].items()
+        ]
+        cv_mae, search, estimator_name = min(candidates, key=lambda candidate: candidate[0])
+
+        model = search.best_estimator_.fit(x_train, y_train[target_column])
+        predictions = model.predict(x_dev)
+        baseline_models[target_column] = model
+
+        results[target_column] = {
+            'Model': estimator_name,
+            'Params': str(search.best_params_),
+            'CV_MAE': cv_mae,
+            'MAE': mean_absolute_error(y_dev[target_column], predictions),
+            'MSE': mean_squared_error(y_dev[target_column], predictions),
+            'R2': r2_score(y_dev[target_column], predictions),
+            'Search_s': round(time.monotonic() - started, 1),
+        }
+        print(f"Baseline for {target_column}: {estimator_name} {search.best_params_}, "
+              f"dev MAE {results[target_column]['MAE']:.2f}")
+
+    results_df = pd.DataFrame.from_dict(results, orient='index').reset_index()
+    results_df.rename(columns={'index': 'Target'}, inplace=True)
+    return baseline_models, results_df
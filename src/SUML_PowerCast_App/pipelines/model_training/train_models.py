@@ -2,20 +2,125 @@
 Module for training AutoGluon models on given data.
 """
 
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
 import pandas as pd
 from autogluon.tabular import TabularPredictor
 
+from SUML_PowerCast_App.profiling import peak_rss_mb
+from SUML_PowerCast_App.progress import report_progress
+
+
+def _fit_kwargs(autogluon_params):
+    """
+    Optional `fit` arguments shared by the sequential and the parallel path.
+    """
+    kwargs = {}
+    if autogluon_params.get('infer_limit') is not None:
+        # Seconds per row AutoGluon may spend at inference, it drops models exceeding it
+        kwargs['infer_limit'] = autogluon_params['infer_limit']
+        kwargs['infer_limit_batch_size'] = autogluon_params.get('infer_limit_batch_size', 1)
+    return kwargs
+
+
+def _zone_frame(x_data, y_data, target_column, shared_data=None):
+    """
+    Returns the frame a zone's predictor is fit on and the columns it must ignore.
+
+    `shared_data`, the features joined with every target, is built once in the
+    memory-lean mode and used by all zones, the other targets being ignored columns.
+    """
+    if shared_data is not None:
+        return shared_data, [column for column in y_data.columns if column != target_column]
+    return pd.concat([x_data, y_data[target_column]], axis=1), []
+
+
+def _zone_predictor(target_column, eval_metric, model_path, ignored_columns=None):
+    """
+    Creates a zone's predictor, saved to `model_path` by `fit` in both training paths.
+    """
+    return TabularPredictor(
+        label=target_column,
+        eval_metric=eval_metric,
+        path=model_path,
+        learner_kwargs={'ignored_columns': ignored_columns or []}
+    )
+
+
+def _fit_zone(train_data, target_column, eval_metric, time_limit, num_cpus, model_path, fit_kwargs, ignored_columns=None):
+    """
+    Fits one zone's predictor in a worker process and returns where it was saved.
+    """
+    _zone_predictor(target_column, eval_metric, model_path, ignored_columns).fit(
+        train_data=train_data,
+        time_limit=time_limit,
+        num_cpus=num_cpus,
+        **fit_kwargs
+    )
+    return model_path
+
+
+def _train_zones_in_parallel(x_train, y_train, parameters, model_path_base, time_budget):
+    """
+    Trains every zone at the same time, splitting the CPU cores between them.
+
+    Returns:
+        dict: Trained predictors keyed by target column.
+    """
+    autogluon_params = parameters['autogluon']
+    targets = list(y_train.columns)
+    total_cpus = autogluon_params.get('num_cpus') or os.cpu_count() or 1
+    cpus_per_zone = max(1, total_cpus // len(targets))
+
+    print(f"Training {len(targets)} zones in parallel, {cpus_per_zone} CPUs and {time_budget:.0f}s each")
+    report_progress(zone=", ".join(targets))
+
+    shared_train_data = x_train.join(y_train) if parameters.get('memory_lean', False) else None
+
+    with ProcessPoolExecutor(
+        max_workers=len(targets),
+        mp_context=multiprocessing.get_context("spawn")
+    ) as executor:
+        futures = {}
+        for target_column in targets:
+            train_data, ignored_columns = _zone_frame(x_train, y_train, target_column, shared_train_data)
+            futures[target_column] = executor.submit(
+                _fit_zone,
+                train_data,
+                target_column,
+                autogluon_params.get('eval_metric', 'mean_absolute_error'),
+                time_budget,
+                cpus_per_zone,
+                f"{model_path_base}/{target_column}",
+                _fit_kwargs(autogluon_params),
+                ignored_columns
+            )
+        return {
+            target_column: TabularPredictor.load(future.result())
+            for target_column, future in futures.items()
+        }
+
+
 def train_models(x_train, y_train, x_dev, y_dev, parameters):
     """
     Trains AutoGluon models for each target column and saves them to disk.
 
+    Both the sequential and the parallel path fit each predictor into
+    `<autogluon.model_path>/<target column>`, which every retrain reuses.
+
     Args:
         x_train (pd.DataFrame): Training features.
         y_train (pd.DataFrame): Training targets.
         x_dev (pd.DataFrame): Validation features.
         y_dev (pd.DataFrame): Validation targets.
         parameters (dict): Dictionary containing training parameters, 
-            e.g. {"autogluon": {"model_path": "./models", "time_limit": 3600}}
+            e.g. {"autogluon": {"model_path": "./models", "time_limit": 3600}}.
+            With `total_time_limit` set, one wall-clock budget is shared by all zones;
+            with `parallel: true`, the zones are trained at the same time. With
+            `memory_lean`, one training frame is shared by all zones instead of one each.
 
     Returns:
         dict: A dictionary of trained AutoGluon predictors, keyed by target column name.
@@ -31,30 +136,61 @@ def train_models(x_train, y_train, x_dev, y_dev, parameters):
             "The 'model_path' key is missing in the 'autogluon' section of parameters."
         )
 
-    model_path_base = parameters['autogluon']['model_path']
-    predictors = {}
+    autogluon_params = parameters['autogluon']
+    model_path_base = autogluon_params['model_path']
+    time_limit = autogluon_params.get('time_limit', 3600)
+    total_time_limit = autogluon_params.get('total_time_limit')
+    started = time.monotonic()
+    memory_lean = parameters.get('memory_lean', False)
+    print(f"Peak RSS before training: {peak_rss_mb():.0f} MB")
+
+    if autogluon_params.get('parallel', False):
+        predictors = _train_zones_in_parallel(
+            x_train, y_train, parameters, model_path_base, total_time_limit or time_limit
+        )
+    else:
+        predictors = {}
+
+    # Built once for all zones in the memory-lean mode, unless the parallel path trained them all
+    pending_zones = [column for column in y_train.columns if column not in predictors]
+    shared_train_data = x_train.join(y_train) if memory_lean and pending_zones else None
+
+    for zone_index, target_column in enumerate(y_train.columns):
+        if target_column in predictors:
+            continue
 
-    for target_column in y_train.columns:
         print(f"\nTraining AutoGluon for target: {target_column}")
+        report_progress(zone=target_column)
+
+        zone_time_limit = time_limit
+        if total_time_limit:
+            # Split what is left of the global budget evenly between the remaining zones
+            remaining = max(total_time_limit - (time.monotonic() - started), 1)
+            zone_time_limit = min(time_limit, remaining / (len(y_train.columns) - zone_index))
 
-        train_data = pd.concat([x_train, y_train[target_column]], axis=1)
-        dev_data = pd.concat([x_dev, y_dev[target_column]], axis=1)
+        train_data, ignored_columns = _zone_frame(x_train, y_train, target_column, shared_train_data)
 
-        predictor = TabularPredictor(
-            label=target_column,
-            eval_metric=parameters['autogluon'].get('eval_metric', 'mean_absolute_error')
+        # Fit straight into the zone's directory, every retrain reuses it
+        predictor = _zone_predictor(
+            target_column,
+            autogluon_params.get('eval_metric', 'mean_absolute_error'),
+            f"{model_path_base}/{target_column}",
+            ignored_columns
         ).fit(
             train_data=train_data,
-            time_limit=parameters['autogluon'].get('time_limit', 3600)
+            time_limit=zone_time_limit,
+            **_fit_kwargs(autogluon_params)
         )
+        print(f"AutoGluon model for {target_column} saved at {predictor.path}")
 
+        predictors[target_column] = predictor
+
+    shared_train_data = None
+    shared_dev_data = x_dev.join(y_dev) if memory_lean else None
+    for target_column, predictor in predictors.items():
+        dev_data, _ = _zone_frame(x_dev, y_dev, target_column, shared_dev_data)
         performance = predictor.evaluate(dev_data)
         print(f"Performance for {target_column}: {performance}")
 
-        model_path = f"{model_path_base}/{target_column}"
-        predictor.save(model_path)
-        print(f"AutoGluon model for {target_column} saved at {model_path}")
-
-        predictors[target_column] = predictor
-
+    print(f"Trained {len(predictors)} zones in {time.monotonic() - started:.0f}s, peak RSS {peak_rss_mb():.0f} MB")
     return predictors
@@ -0,0 +1,92 @@
+"""
+Helpers measuring where pipeline runs spend time and memory, used by `ProfilingHooks`.
+"""
+
+import os
+import sys
+import threading
+from typing import Any, Optional
+
+import pandas as pd
+import psutil
+
+
+def process_tree_rss(process: psutil.Process) -> int:
+    """
+    Returns the resident memory of `process` and its children in bytes, so nodes
+    training in worker processes are measured too.
+    """
+    rss = process.memory_info().rss
+    for child in process.children(recursive=True):
+        try:
+            rss += child.memory_info().rss
+        except psutil.Error:
+            continue
+    return rss
+
+
+class PeakRssSampler:
+    """
+    Samples the resident memory of this process tree in a thread and keeps the peak.
+    """
+
+    def __init__(self, interval_s: float = 0.1):
+        self.interval_s = interval_s
+        self.peak = 0
+        self._process = psutil.Process(os.getpid())
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self.peak = process_tree_rss(self._process)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="rss-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> int:
+        """
+        Stops sampling and returns the peak in bytes.
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self._sample()
+        return self.peak
+
+    def _sample(self):
+        try:
+            self.peak = max(self.peak, process_tree_rss(self._process))
+        except psutil.Error:
+            pass
+
+    def _run(self):
+        while not self._stop.wait(self.interval_s):
+            self._sample()
+
+
+def peak_rss_mb() -> float:
+    """
+    Returns the peak resident memory of this process so far, in MB.
+    """
+    if os.name == "nt":
+        return psutil.Process(os.getpid()).memory_info().peak_wset / 2**20
+
+    import resource
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+def describe_size(value: Any) -> dict:
+    """
+    Summarises the size of a dataset passed between nodes.
+    """
+    if isinstance(value, pd.DataFrame):
+        return {"type": "DataFrame", "rows": len(value), "columns": value.shape[1],
+                "bytes": int(value.memory_usage(deep=True).sum())}
+    if isinstance(value, pd.Series):
+        return {"type": "Series", "rows": len(value), "bytes": int(value.memory_usage(deep=True))}
+    if isinstance(value, (dict, list, tuple)):
+        return {"type": type(value).__name__, "items": len(value)}
+    return {"type": type(value).__name__}
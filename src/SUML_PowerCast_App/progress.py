@@ -0,0 +1,27 @@
+"""
+Lightweight progress reporting shared by pipeline nodes and hooks.
+
+Reports are dropped unless a sink is installed, which the API's training worker
+does to forward the current node and zone to `/jobs/{id}`.
+"""
+
+from typing import Callable, Optional
+
+_sink: Optional[Callable[[dict], None]] = None
+
+
+def set_progress_sink(sink: Optional[Callable[[dict], None]]):
+    """
+    Installs the callable receiving progress reports, or removes it with None.
+    """
+    global _sink
+    _sink = sink
+
+
+def report_progress(**fields):
+    """
+    Forwards `fields` (e.g. `node="train_models_node"`, `zone="PowerConsumption_Zone1"`)
+    to the installed sink.
+    """
+    if _sink is not None:
+        _sink(fields)
@@ -0,0 +1,69 @@
+"""
+Standalone serving entry point: `python -m SUML_PowerCast_App.serve`.
+
+Starts the API straight from the saved models, without bootstrapping Kedro or
+importing the training and analysis pipelines. Only the `api` parameters are
+read from the project configuration. The time from process start until the API
+reports ready is printed, returned by `/health/ready` and exported on `/metrics`.
+
+Startup still imports pandas, scikit-learn, AutoGluon and FastAPI, which take most
+of the import time, and the core of pyarrow, which pandas loads when it is installed.
+Check with `python -X importtime -c "import SUML_PowerCast_App.pipelines.app_run.api_run"`.
+"""
+
+import time
+
+STARTED_AT = time.perf_counter()
+
+# pylint: disable=wrong-import-position
+import argparse
+import os
+
+import yaml
+
+CONF_FILES = [
+    os.path.join("conf", "base", "parameters_app_run.yml"),
+    os.path.join("conf", "local", "parameters_app_run.yml"),
+]
+
+
+def load_api_params(conf_files=None) -> dict:
+    """
+    Reads the `api` parameters, later files overriding top-level keys of earlier ones.
+    """
+    api_params = {}
+    for path in conf_files or CONF_FILES:
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as file:
+                api_params.update((yaml.safe_load(file) or {}).get("api", {}))
+    return api_params
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the PowerCast prediction API.")
+    parser.add_argument("--models", default=None, help="Pickle with the best models, see `best_models` in the catalog.")
+    parser.add_argument("--host", default=None)
+    parser.add_argument("--port", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    api_params = load_api_params()
+    if args.host is not None:
+        api_params["host"] = args.host
+    if args.port is not None:
+        api_params["port"] = args.port
+    if args.models is not None:
+        api_params["models_path"] = args.models
+
+    # Deferred until the arguments are valid, these pull in AutoGluon, FastAPI and pandas
+    from SUML_PowerCast_App.pipelines.app_run.api_run import start_api
+    from SUML_PowerCast_App.pipelines.app_run.model_store import BEST_MODELS_PATH, load_best_models
+
+    print(f"Imports done {time.perf_counter() - STARTED_AT:.2f}s after start")
+    best_models = load_best_models(api_params.get("models_path", BEST_MODELS_PATH))
+    print(f"Models loaded {time.perf_counter() - STARTED_AT:.2f}s after start")
+
+    start_api(best_models, api_params, started_at=STARTED_AT)
+
+
+if __name__ == "__main__":
+    main()
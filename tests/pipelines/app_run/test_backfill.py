@@ -0,0 +1,94 @@
+"""
+Tests of the zone backfill: version stamping, in-place patching and the resume offset.
+"""
+
+import pandas as pd
+import pytest
+
+from SUML_PowerCast_App.datasets.file_lock import FileLock
+from SUML_PowerCast_App.pipelines.app_run.backfill import BackfillJob, backfill_missing_zones
+from SUML_PowerCast_App.pipelines.app_run.rollup import MonthlyRollup
+
+HEADER = (
+    "Datetime,Temperature,Humidity,WindSpeed,GeneralDiffuseFlows,DiffuseFlows,"
+    "PowerConsumption_Zone1,PowerConsumption_Zone2,ModelVersion\n"
+)
+
+
+class ConstantModel:
+    def __init__(self, value):
+        self.value = value
+
+    def predict(self, features):
+        return pd.Series(self.value, index=features.index)
+
+
+def _line(day, zone1="", zone2="", version="v1"):
+    return f"1/{day}/2017 0:00,6.5,73.8,0.08,0.05,0.12,{zone1},{zone2},{version}\n"
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = tmp_path / "powerconsumption.csv"
+    path.write_text(HEADER + _line(1, "100.0", "200.0", "dataset") + _line(2, "110.0") + _line(3, "", "230.0"))
+    return str(path)
+
+
+def test_patches_only_the_missing_rows_and_stamps_the_version(csv_path):
+    models = {"PowerConsumption_Zone1": ConstantModel(1.5), "PowerConsumption_Zone2": ConstantModel(2.5)}
+    complete = HEADER + _line(1, "100.0", "200.0", "dataset")
+
+    result = backfill_missing_zones(csv_path, models, FileLock(f"{csv_path}.lock"), "v2")
+
+    content = open(csv_path, encoding="utf-8").read()
+    assert content.startswith(complete)
+    assert content[len(complete):] == _line(2, "110.0", "2.5", "v2") + _line(3, "1.5", "230.0", "v2")
+    assert result.filled == 2
+    assert result.offset == len(content.encode("utf-8"))
+    assert set(result.rows.columns) == {"Datetime", "PowerConsumption_Zone1", "PowerConsumption_Zone2"}
+    assert result.rows["PowerConsumption_Zone1"].isna().tolist() == [True, False]
+
+
+def test_resumes_after_the_last_complete_row(csv_path):
+    lock = FileLock(f"{csv_path}.lock")
+    # Zone2 has no model, so the rows missing it stay incomplete
+    first = backfill_missing_zones(csv_path, {"PowerConsumption_Zone1": ConstantModel(1.5)}, lock, "v2")
+    with open(csv_path, "a", encoding="utf-8") as file:
+        file.write(_line(4, "", "240.0"))
+
+    second = backfill_missing_zones(
+        csv_path, {"PowerConsumption_Zone1": ConstantModel(3.0)}, lock, "v3", first.offset, first.header
+    )
+
+    assert first.filled == 1
+    assert first.offset == len((HEADER + _line(1, "100.0", "200.0", "dataset")).encode("utf-8"))
+    assert second.filled == 1
+    assert second.rows["Datetime"].tolist() == ["1/4/2017 0:00"]
+    data = pd.read_csv(csv_path)
+    assert data["ModelVersion"].tolist() == ["dataset", "v1", "v2", "v3"]
+    assert data["PowerConsumption_Zone1"].tolist() == [100.0, 110.0, 1.5, 3.0]
+
+
+def test_changed_header_reads_the_whole_file(csv_path):
+    lock = FileLock(f"{csv_path}.lock")
+    first = backfill_missing_zones(csv_path, {}, lock, "v2")
+    result = backfill_missing_zones(
+        csv_path, {"PowerConsumption_Zone2": ConstantModel(2.5)}, lock, "v2", first.offset, b"Datetime\n"
+    )
+    assert result.filled == 1
+
+
+def test_job_updates_the_rollup_with_the_filled_cells(csv_path, tmp_path):
+    rollup = MonthlyRollup(str(tmp_path / "rollup.csv"), raw_csv_path=csv_path)
+    rollup.rebuild()
+    models = {"PowerConsumption_Zone1": ConstantModel(1.5), "PowerConsumption_Zone2": ConstantModel(2.5)}
+    job = BackfillJob(csv_path, lambda: ("v2", models), FileLock(f"{csv_path}.lock"), on_backfill=rollup.update)
+
+    assert job.run_once() == 2
+    assert job.run_once() == 0
+
+    rebuilt = MonthlyRollup(str(tmp_path / "rebuilt.csv"), raw_csv_path=csv_path)
+    rebuilt.rebuild()
+    zones = ["PowerConsumption_Zone1", "PowerConsumption_Zone2"]
+    assert rollup.query(zones) == rebuilt.query(zones)
+    assert rollup.query(zones)["zones"]["PowerConsumption_Zone2"] == [pytest.approx((200 + 2.5 + 230) / 3)]
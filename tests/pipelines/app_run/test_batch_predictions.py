@@ -0,0 +1,67 @@
+"""
+Tests of `/predict/batch` scoring: the `Datetime` every logged row is dated with.
+"""
+
+import pandas as pd
+import pytest
+from fastapi import HTTPException
+
+from SUML_PowerCast_App.pipelines.app_run.api_run import BatchWeatherInput, getBatchPredictions
+from SUML_PowerCast_App.pipelines.app_run.model_store import LoadedModels
+
+ZONE = "PowerConsumption_Zone1"
+WEATHER = {"temperature": 6.5, "humidity": 73.8, "wind_speed": 0.08, "general_diffuse_flows": 0.05, "diffuse_flows": 0.12}
+
+
+class ConstantModel:
+    def predict(self, features):
+        return pd.Series(1.0, index=features.index)
+
+
+class RecordingLog:
+    def __init__(self):
+        self.rows = []
+
+    def append(self, rows):
+        self.rows.append(rows)
+
+
+def _score(batch):
+    log = RecordingLog()
+    models = LoadedModels(version="v1", models={}, loaded_at="", baseline={ZONE: ConstantModel()})
+    result = getBatchPredictions(batch, models, log)
+    return result, pd.concat(log.rows, ignore_index=True)
+
+
+def test_records_keep_their_own_datetime():
+    batch = BatchWeatherInput(records=[
+        {**WEATHER, "datetime": "2017-01-01 00:10:00"},
+        {**WEATHER, "datetime": "2017-01-01 00:20:00"},
+        WEATHER,
+    ])
+
+    result, logged = _score(batch)
+
+    assert result["predictions"][ZONE] == [1.0, 1.0, 1.0]
+    assert logged["Datetime"][:2].tolist() == ["01/01/2017 00:10", "01/01/2017 00:20"]
+    # Records without a datetime are dated with the request time
+    assert pd.to_datetime(logged["Datetime"][2], format="%m/%d/%Y %H:%M") > pd.Timestamp("2020-01-01")
+
+
+def test_columnar_payload_accepts_a_datetime_column():
+    columns = {name: [value, value] for name, value in WEATHER.items()}
+    columns["datetime"] = ["2017-03-01 12:00:00", None]
+
+    _, logged = _score(BatchWeatherInput(columns=columns))
+
+    assert logged["Datetime"][0] == "03/01/2017 12:00"
+    assert logged["Datetime"][1] != logged["Datetime"][0]
+
+
+def test_invalid_datetime_is_rejected():
+    batch = BatchWeatherInput(records=[{**WEATHER, "datetime": "01/01/2017"}])
+
+    with pytest.raises(HTTPException) as error:
+        _score(batch)
+
+    assert error.value.status_code == 400
@@ -0,0 +1,57 @@
+"""
+Tests of the micro-batching dispatcher behind `/predict`.
+"""
+
+import asyncio
+
+import pytest
+
+from SUML_PowerCast_App.pipelines.app_run.batching import PredictionBatcher
+
+
+def test_results_follow_their_inputs():
+    batches = []
+
+    def score_batch(inputs):
+        batches.append(list(inputs))
+        return [value * 10 for value in inputs]
+
+    async def run():
+        batcher = PredictionBatcher(score_batch, max_wait_ms=20, max_batch_size=4)
+        batcher.start()
+        results = await asyncio.gather(*(batcher.submit(value) for value in range(10)))
+        await batcher.stop()
+        return results, batcher.stats()
+
+    results, stats = asyncio.run(run())
+
+    assert results == [value * 10 for value in range(10)]
+    assert all(len(batch) <= 4 for batch in batches)
+    assert sorted(value for batch in batches for value in batch) == list(range(10))
+    assert stats["rows"] == 10
+    assert stats["batches"] == len(batches)
+
+
+def test_scoring_error_reaches_every_caller_of_the_batch():
+    def score_batch(inputs):
+        raise ValueError("model failed")
+
+    async def run():
+        batcher = PredictionBatcher(score_batch, max_wait_ms=20, max_batch_size=8)
+        batcher.start()
+        outcomes = await asyncio.gather(*(batcher.submit(value) for value in range(5)), return_exceptions=True)
+        # The dispatcher keeps serving after a failed batch
+        batcher.score_batch = lambda inputs: list(inputs)
+        after = await batcher.submit(7)
+        await batcher.stop()
+        return outcomes, after
+
+    outcomes, after = asyncio.run(run())
+
+    assert all(isinstance(outcome, ValueError) for outcome in outcomes)
+    assert after == 7
+
+
+def test_invalid_batch_size_is_rejected():
+    with pytest.raises(ValueError):
+        PredictionBatcher(lambda inputs: inputs, max_batch_size=0)
@@ -0,0 +1,68 @@
+"""
+Tests of the streaming statistics and the PSI behind the drift monitor.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from SUML_PowerCast_App.drift import (
+    RunningStats,
+    build_profile,
+    histogram_counts,
+    histogram_cuts,
+    psi,
+)
+
+
+@pytest.fixture
+def values():
+    return np.random.default_rng(0).normal(loc=20, scale=5, size=5000)
+
+
+def test_running_stats_match_numpy(values):
+    stats = RunningStats(histogram_cuts(values))
+    # Uneven batches, one of them a single value, with NaNs ignored
+    for batch in np.split(values, [1, 7, 1000, 3100]):
+        stats.update(np.append(batch, np.nan))
+
+    assert stats.count == len(values)
+    assert stats.mean == pytest.approx(values.mean(), rel=1e-12)
+    assert stats.std == pytest.approx(values.std(ddof=0), rel=1e-10)
+    np.testing.assert_array_equal(stats.counts, histogram_counts(values, stats.cuts))
+    assert sum(stats.fractions()) == pytest.approx(1.0)
+
+
+def test_empty_running_stats():
+    stats = RunningStats([0.0])
+    stats.update(np.array([np.nan]))
+
+    assert stats.count == 0
+    assert stats.std == 0.0
+    assert stats.fractions() == [0.0, 0.0]
+
+
+def test_profile_bins_hold_equal_mass(values):
+    profile = build_profile(pd.DataFrame({"Temperature": values}))["Temperature"]
+
+    assert profile["count"] == len(values)
+    assert len(profile["fractions"]) == len(profile["cuts"]) + 1 == 10
+    assert profile["fractions"] == pytest.approx([0.1] * 10, abs=0.01)
+
+
+def test_psi_is_zero_for_the_same_distribution_and_grows_with_the_shift(values):
+    cuts = histogram_cuts(values)
+    reference = (histogram_counts(values, cuts) / len(values)).tolist()
+    rng = np.random.default_rng(1)
+
+    def psi_of(shift):
+        sample = rng.normal(loc=20 + shift, scale=5, size=5000)
+        return psi(reference, (histogram_counts(sample, cuts) / len(sample)).tolist())
+
+    assert psi(reference, reference) == 0.0
+    assert psi_of(0) < 0.1
+    assert 0.1 < psi_of(2.5) < psi_of(5)
+
+
+def test_psi_stays_finite_with_empty_bins():
+    assert np.isfinite(psi([0.5, 0.5, 0.0], [0.0, 0.5, 0.5]))
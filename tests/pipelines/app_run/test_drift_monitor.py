@@ -0,0 +1,134 @@
+"""
+Tests of the drift monitor fed by the prediction log: scoring, triggering and resets.
+"""
+
+import json
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from SUML_PowerCast_App.drift import build_profile
+from SUML_PowerCast_App.pipelines.app_run.drift_monitor import DriftMonitor
+from SUML_PowerCast_App.pipelines.app_run.prediction_log import TIER_COLUMN, PredictionLog
+
+
+def _rows(count, shift=0.0, seed=0, tier="autogluon"):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "Temperature": rng.normal(loc=20 + shift, scale=5, size=count),
+        "PowerConsumption_Zone1": rng.normal(loc=30000, scale=3000, size=count),
+        TIER_COLUMN: tier,
+    })
+
+
+@pytest.fixture
+def reference_path(tmp_path):
+    path = tmp_path / "reference_profile.json"
+    path.write_text(json.dumps({"columns": build_profile(_rows(5000).drop(columns=TIER_COLUMN))}))
+    return str(path)
+
+
+@pytest.fixture
+def triggered():
+    return threading.Event()
+
+
+def _monitor(reference_path, triggered, **kwargs):
+    return DriftMonitor(reference_path, min_rows=500, on_drift=triggered.set, **kwargs)
+
+
+def test_same_traffic_is_not_drift(reference_path, triggered):
+    monitor = _monitor(reference_path, triggered)
+
+    monitor.update(_rows(1000, seed=1))
+
+    scores = monitor.scores()
+    assert scores["reference_loaded"]
+    assert scores["drifted"] == []
+    assert scores["columns"]["Temperature"]["rows"] == 1000
+    assert scores["columns"]["Temperature"]["psi"] < 0.1
+    assert not triggered.is_set()
+
+
+def test_columns_are_scored_only_after_min_rows(reference_path, triggered):
+    monitor = _monitor(reference_path, triggered)
+
+    monitor.update(_rows(100, shift=15, seed=1))
+
+    assert monitor.scores()["columns"]["Temperature"]["psi"] is None
+    assert not triggered.is_set()
+
+
+def test_drift_triggers_once_per_cooldown(reference_path, triggered):
+    monitor = _monitor(reference_path, triggered)
+
+    monitor.update(_rows(1000, shift=10, seed=1))
+
+    assert triggered.wait(5)
+    assert monitor.scores()["drifted"] == ["Temperature"]
+    assert monitor.scores()["last_triggered_at"] is not None
+
+    triggered.clear()
+    monitor.update(_rows(1000, shift=10, seed=2))
+    assert not triggered.wait(0.2)
+
+
+def test_concurrent_updates_trigger_one_job(reference_path):
+    calls = []
+    monitor = DriftMonitor(reference_path, min_rows=500, on_drift=lambda: calls.append(1))
+    monitor.update(_rows(499, shift=10, seed=1))
+
+    threads = [threading.Thread(target=monitor.update, args=(_rows(10, shift=10, seed=seed),)) for seed in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert monitor.scores()["drifted"] == ["Temperature"]
+    # The job runs in a thread, give it the time to start
+    threading.Event().wait(0.2)
+    assert calls == [1]
+
+
+def test_baseline_rows_are_left_out(reference_path, triggered):
+    monitor = _monitor(reference_path, triggered)
+
+    monitor.update(pd.concat([_rows(1000, seed=1), _rows(1000, shift=10, seed=2, tier="baseline")]))
+
+    assert monitor.scores()["columns"]["Temperature"]["rows"] == 1000
+    assert monitor.scores()["drifted"] == []
+    assert not triggered.is_set()
+
+
+def test_load_reference_starts_over(reference_path, triggered):
+    monitor = _monitor(reference_path, triggered, cooldown_s=0)
+    monitor.update(_rows(1000, shift=10, seed=1))
+    assert triggered.wait(5)
+
+    monitor.load_reference()
+
+    scores = monitor.scores()
+    assert scores["drifted"] == []
+    assert scores["columns"]["Temperature"]["rows"] == 0
+
+
+def test_missing_reference_scores_nothing(tmp_path, triggered):
+    monitor = _monitor(str(tmp_path / "missing.json"), triggered)
+
+    monitor.update(_rows(1000, shift=10, seed=1))
+
+    assert monitor.scores()["reference_loaded"] is False
+    assert not triggered.is_set()
+
+
+def test_the_tier_reaches_the_monitor_but_not_the_file(tmp_path, reference_path, triggered):
+    monitor = _monitor(reference_path, triggered)
+    prediction_log = PredictionLog(str(tmp_path / "log.csv"))
+    prediction_log.add_flush_listener(monitor.update)
+
+    prediction_log.append(pd.concat([_rows(600, seed=1), _rows(400, seed=2, tier="baseline")]))
+
+    assert TIER_COLUMN not in pd.read_csv(tmp_path / "log.csv").columns
+    assert monitor.scores()["columns"]["Temperature"]["rows"] == 600
@@ -0,0 +1,107 @@
+"""
+Tests of the routing between the AutoGluon models and the baseline tier.
+"""
+
+import pickle
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LinearRegression
+
+from SUML_PowerCast_App.pipelines.app_run.fallback import BaselineFallback
+from SUML_PowerCast_App.pipelines.model_training.split_data import FEATURE_COLUMNS
+
+ZONE = "PowerConsumption_Zone1"
+
+
+def test_baseline_serves_until_primary_is_ready():
+    fallback = BaselineFallback(latency_budget_ms=50)
+
+    assert fallback.use_baseline(ZONE)
+    fallback.primary_ready = True
+    assert not fallback.use_baseline(ZONE)
+
+
+def test_large_batch_does_not_push_single_rows_to_baseline():
+    fallback = BaselineFallback(latency_budget_ms=5)
+    fallback.primary_ready = True
+
+    # 2 s for 5000 rows is 0.4 ms per row, well within the budget
+    fallback.record(ZONE, 2.0, 5000, baseline=False)
+
+    assert not fallback.use_baseline(ZONE)
+
+
+def test_slow_zone_falls_back_and_is_probed():
+    fallback = BaselineFallback(latency_budget_ms=5, probe_every=4)
+    fallback.primary_ready = True
+    fallback.record(ZONE, 0.02, 1, baseline=False)
+
+    routes = [fallback.use_baseline(ZONE) for _ in range(8)]
+
+    assert routes == [True, True, True, False, True, True, True, False]
+    assert fallback.stats()["falling_back"] == [ZONE]
+
+
+def test_counters_hold_under_concurrent_requests():
+    fallback = BaselineFallback(latency_budget_ms=5, probe_every=4)
+    fallback.primary_ready = True
+    fallback.record(ZONE, 0.02, 1, baseline=False)
+    routes = []
+
+    def requests():
+        for _ in range(1000):
+            baseline = fallback.use_baseline(ZONE)
+            fallback.record(ZONE, 0.02, 1, baseline)
+            routes.append(baseline)
+
+    threads = [threading.Thread(target=requests) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Exactly one call in four probes AutoGluon, however the threads interleave
+    assert routes.count(False) == 2000
+    assert fallback.stats()["baseline_calls"][ZONE] == 6000
+    assert fallback.stats()["primary_calls"][ZONE] == 2001
+
+
+def test_api_starts_on_the_baseline_alone(tmp_path, monkeypatch):
+    pytest.importorskip("autogluon.tabular")
+    from fastapi.testclient import TestClient
+
+    from SUML_PowerCast_App.pipelines.app_run.api_run import create_app
+
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "data" / "01_raw").mkdir(parents=True)
+    rng = np.random.default_rng(0)
+    x_data = rng.normal(size=(100, len(FEATURE_COLUMNS)))
+    baseline_models = {
+        f"PowerConsumption_Zone{zone}": LinearRegression().fit(
+            pd.DataFrame(x_data, columns=FEATURE_COLUMNS), x_data.sum(axis=1) * zone
+        )
+        for zone in (1, 2, 3)
+    }
+    baseline_path = tmp_path / "baseline_models.pkl"
+    baseline_path.write_bytes(pickle.dumps(baseline_models))
+    api_params = {
+        "baseline": {"enabled": True, "models_path": str(baseline_path)},
+        "models_path": str(tmp_path / "missing.pkl"),
+    }
+
+    with pytest.raises(ValueError, match="No models"):
+        create_app({}, {**api_params, "baseline": {"enabled": False}})
+
+    with TestClient(create_app({}, api_params)) as client:
+        record = dict.fromkeys(
+            ["temperature", "humidity", "wind_speed", "general_diffuse_flows", "diffuse_flows"], 1.0
+        )
+        response = client.post("/predict", json={**record, "target_zones": [2]})
+        batch = client.post("/predict/batch", json={"records": [record, record]})
+
+    assert response.status_code == 200
+    assert response.json()["predictions"] == {"PowerConsumption_Zone2": [pytest.approx(10.0)]}
+    assert batch.json()["predictions"]["PowerConsumption_Zone3"] == [pytest.approx(15.0)] * 2
@@ -0,0 +1,78 @@
+"""
+Tests of the LRU + TTL cache of `/predict` results.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from SUML_PowerCast_App.pipelines.app_run import prediction_cache
+from SUML_PowerCast_App.pipelines.app_run.prediction_cache import PredictionCache
+
+ZONE1 = "PowerConsumption_Zone1"
+ZONE2 = "PowerConsumption_Zone2"
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = SimpleNamespace(value=1000.0)
+    monkeypatch.setattr(prediction_cache, "time", SimpleNamespace(monotonic=lambda: now.value))
+    return now
+
+
+def test_key_rounds_features_and_holds_model_version():
+    cache = PredictionCache(decimals=2)
+    weather = SimpleNamespace(
+        temperature=10.001, humidity=70.0, wind_speed=0.08, general_diffuse_flows=1.0, diffuse_flows=0.5
+    )
+    close = SimpleNamespace(**{**vars(weather), "temperature": 10.004})
+
+    assert cache.make_key(weather, "v1") == cache.make_key(close, "v1")
+    assert cache.make_key(weather, "v1") != cache.make_key(weather, "v2")
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = PredictionCache(ttl_s=60)
+    cache.put(("a",), {ZONE1: 1.0})
+
+    clock.value += 59
+    assert cache.get(("a",), [ZONE1]) == {ZONE1: 1.0}
+    clock.value += 2
+    assert cache.get(("a",), [ZONE1]) is None
+    assert cache.stats()["expirations"] == 1
+    assert cache.stats()["entries"] == 0
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    cache = PredictionCache(max_entries=2)
+    cache.put(("a",), {ZONE1: 1.0})
+    cache.put(("b",), {ZONE1: 2.0})
+    # Reading `a` makes `b` the least recently used entry
+    cache.get(("a",), [ZONE1])
+    cache.put(("c",), {ZONE1: 3.0})
+
+    assert cache.get(("b",), [ZONE1]) is None
+    assert cache.get(("a",), [ZONE1]) == {ZONE1: 1.0}
+    assert cache.get(("c",), [ZONE1]) == {ZONE1: 3.0}
+    assert cache.stats()["evictions"] == 1
+
+
+def test_zones_are_merged_per_key(clock):
+    cache = PredictionCache(ttl_s=60)
+    cache.put(("a",), {ZONE1: 1.0})
+
+    # A request for both zones misses until the second one is cached too
+    assert cache.get(("a",), [ZONE1, ZONE2]) is None
+    cache.put(("a",), {ZONE2: 2.0})
+    assert cache.get(("a",), [ZONE1, ZONE2]) == {ZONE1: 1.0, ZONE2: 2.0}
+
+
+def test_expired_zones_are_not_merged(clock):
+    cache = PredictionCache(ttl_s=60)
+    cache.put(("a",), {ZONE1: 1.0})
+
+    clock.value += 61
+    cache.put(("a",), {ZONE2: 2.0})
+
+    assert cache.get(("a",), [ZONE1]) is None
+    assert cache.get(("a",), [ZONE2]) == {ZONE2: 2.0}
@@ -0,0 +1,106 @@
+"""
+Tests of the write-behind prediction log under concurrent writers: every row is
+written exactly once, whether it is flushed by the background thread, by
+`close()` or by another process appending to the same file.
+"""
+
+import multiprocessing
+import threading
+
+import pandas as pd
+
+from SUML_PowerCast_App.pipelines.app_run.prediction_log import TIER_COLUMN, PredictionLog
+
+ROWS_PER_BATCH = 3
+
+
+def _batch(writer, batch):
+    first = (writer * 1000 + batch) * ROWS_PER_BATCH
+    return pd.DataFrame({
+        "Datetime": "01/01/2017 00:00",
+        "Temperature": [float(row) for row in range(first, first + ROWS_PER_BATCH)],
+        "ModelVersion": f"writer-{writer}",
+        TIER_COLUMN: "autogluon",
+    })
+
+
+def _expected_ids(writers, batches):
+    return sorted(
+        float(row)
+        for writer in range(writers)
+        for batch in range(batches)
+        for row in _batch(writer, batch)["Temperature"]
+    )
+
+
+def _write_from_process(file_path, writer, batches):
+    prediction_log = PredictionLog(file_path, flush_rows=4, flush_interval_s=0.01)
+    prediction_log.start()
+    for batch in range(batches):
+        prediction_log.append(_batch(writer, batch))
+    prediction_log.close()
+
+
+def test_threads_appending_and_flushing_lose_and_duplicate_nothing(tmp_path):
+    file_path = str(tmp_path / "powerconsumption.csv")
+    prediction_log = PredictionLog(file_path, flush_rows=10, flush_interval_s=0.01)
+    prediction_log.add_flush_listener(lambda rows: seen.extend(rows["Temperature"]))
+    prediction_log.start()
+    seen = []
+
+    def write(writer):
+        for batch in range(50):
+            prediction_log.append(_batch(writer, batch))
+            # Explicit flushes race with the background thread's
+            if batch % 7 == 0:
+                prediction_log.flush()
+
+    threads = [threading.Thread(target=write, args=(writer,)) for writer in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    prediction_log.close()
+
+    written = pd.read_csv(file_path)
+    assert sorted(written["Temperature"]) == _expected_ids(8, 50)
+    assert sorted(seen) == _expected_ids(8, 50)
+    assert TIER_COLUMN not in written.columns
+    assert prediction_log.stats()["rows_written"] == len(written)
+    # Rows of one batch stay in order, whichever flush wrote them
+    for _, rows in written.groupby("ModelVersion"):
+        assert rows["Temperature"].is_monotonic_increasing
+
+
+def test_close_flushes_the_buffer(tmp_path):
+    file_path = str(tmp_path / "powerconsumption.csv")
+    prediction_log = PredictionLog(file_path, flush_rows=10_000, flush_interval_s=3600)
+    prediction_log.start()
+    for batch in range(20):
+        prediction_log.append(_batch(0, batch))
+
+    assert prediction_log.stats()["buffered_rows"] == 20 * ROWS_PER_BATCH
+    prediction_log.close()
+
+    assert sorted(pd.read_csv(file_path)["Temperature"]) == _expected_ids(1, 20)
+    assert prediction_log.stats()["buffered_rows"] == 0
+
+
+def test_processes_sharing_the_file_lock_interleave_no_rows(tmp_path):
+    file_path = str(tmp_path / "powerconsumption.csv")
+    context = multiprocessing.get_context("spawn")
+    processes = [
+        context.Process(target=_write_from_process, args=(file_path, writer, 40)) for writer in range(4)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(timeout=120)
+        assert process.exitcode == 0
+
+    with open(file_path, encoding="utf-8") as file:
+        lines = file.read().splitlines()
+    # One header, and no line torn by another process's append
+    assert lines[0] == "Datetime,Temperature,ModelVersion"
+    assert all(line.count(",") == 2 for line in lines)
+    assert sorted(pd.read_csv(file_path)["Temperature"]) == _expected_ids(4, 40)
@@ -0,0 +1,25 @@
+"""
+Tests of what the standalone serving entry point imports, measured in a fresh interpreter.
+"""
+
+import json
+import subprocess
+import sys
+
+SCRIPT = """
+import json, sys
+from SUML_PowerCast_App.pipelines.app_run.api_run import start_api
+from SUML_PowerCast_App.pipelines.app_run.model_store import load_best_models
+print(json.dumps(sorted(sys.modules)))
+"""
+
+
+def test_serving_imports_skip_kedro_and_the_parquet_readers():
+    output = subprocess.run([sys.executable, "-c", SCRIPT], capture_output=True, text=True, check=True).stdout
+    modules = set(json.loads(output.splitlines()[-1]))
+
+    assert "autogluon.tabular" in modules
+    assert not any(module == "kedro" or module.startswith("kedro.") for module in modules)
+    assert not any(module.startswith("SUML_PowerCast_App.pipelines.model_training") for module in modules)
+    assert "pyarrow.parquet" not in modules
+    assert "pyarrow.dataset" not in modules
@@ -0,0 +1,84 @@
+"""
+Tests of the CSV to partitions migration while the API's prediction log is writing.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from SUML_PowerCast_App.datasets import partitioned_consumption
+from SUML_PowerCast_App.datasets.partitioned_consumption import (
+    is_partitioned,
+    migrate_csv_to_partitions,
+    read_partitions,
+)
+from SUML_PowerCast_App.pipelines.app_run.prediction_log import PredictionLog
+
+pytest.importorskip("pyarrow")
+
+
+def _rows(start, count):
+    rng = np.random.default_rng(start)
+    rows = pd.DataFrame(
+        rng.normal(size=(count, 8)),
+        columns=[
+            "Temperature", "Humidity", "WindSpeed", "GeneralDiffuseFlows", "DiffuseFlows",
+            "PowerConsumption_Zone1", "PowerConsumption_Zone2", "PowerConsumption_Zone3",
+        ]
+    )
+    datetimes = pd.date_range("2017-01-20", periods=count, freq="6h") + pd.Timedelta(hours=start)
+    rows.insert(0, "Datetime", datetimes.strftime("%m/%d/%Y %H:%M"))
+    return rows
+
+
+@pytest.fixture
+def paths(tmp_path):
+    csv_path = tmp_path / "powerconsumption.csv"
+    _rows(0, 100).to_csv(csv_path, index=False)
+    return str(csv_path), str(tmp_path / "powerconsumption")
+
+
+def test_interrupted_migration_leaves_readers_on_the_csv(paths, monkeypatch):
+    csv_path, path = paths
+    append = partitioned_consumption.append_partitions
+    written = []
+
+    def fail_on_second_chunk(target, chunk, *args):
+        written.append(len(chunk))
+        if len(written) == 2:
+            raise KeyboardInterrupt
+        return append(target, chunk, *args)
+
+    monkeypatch.setattr(partitioned_consumption, "append_partitions", fail_on_second_chunk)
+    with pytest.raises(KeyboardInterrupt):
+        migrate_csv_to_partitions(csv_path, path, chunksize=40)
+
+    assert not is_partitioned(path)
+    assert len(read_partitions(path, legacy_filepath=csv_path)) == 100
+    # The partial partitions were removed
+    assert not [name for name in os.listdir(os.path.dirname(path)) if "migrating" in name]
+
+
+def test_migration_runs_once(paths):
+    csv_path, path = paths
+
+    assert migrate_csv_to_partitions(csv_path, path, chunksize=40) == 100
+    assert migrate_csv_to_partitions(csv_path, path, chunksize=40) == 0
+    assert len(read_partitions(path)) == 100
+
+
+def test_auto_log_follows_a_migration(paths):
+    csv_path, path = paths
+    prediction_log = PredictionLog(csv_path, partitioned_path=path, storage="auto")
+
+    prediction_log.append(_rows(1000, 5))
+    assert prediction_log.stats()["storage"] == "csv"
+
+    migrate_csv_to_partitions(csv_path, path)
+    prediction_log.append(_rows(2000, 7))
+
+    assert prediction_log.stats()["storage"] == "parquet"
+    # Rows logged before and after the migration all reach the partitions
+    assert len(read_partitions(path)) == 112
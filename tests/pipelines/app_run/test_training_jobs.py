@@ -0,0 +1,101 @@
+"""
+Tests of the background training jobs started by `/update`.
+"""
+
+import atexit
+import time
+from functools import partial
+
+import pytest
+
+from SUML_PowerCast_App.pipelines.app_run import training_jobs
+from SUML_PowerCast_App.pipelines.app_run.training_jobs import TrainingJobManager
+
+
+def _train_in_parallel(model_path, project_path, pipeline_name, progress_queue):
+    """
+    Job target training every zone in a process pool, like `autogluon.parallel: true`.
+    """
+    import numpy as np
+    import pandas as pd
+
+    from SUML_PowerCast_App.pipelines.model_training.train_models import train_models
+
+    rng = np.random.default_rng(0)
+    x_data = pd.DataFrame(
+        rng.normal(size=(300, 5)),
+        columns=["Temperature", "Humidity", "WindSpeed", "GeneralDiffuseFlows", "DiffuseFlows"]
+    )
+    y_data = pd.DataFrame({
+        f"PowerConsumption_Zone{zone}": x_data.sum(axis=1) * zone + rng.normal(size=300)
+        for zone in (1, 2, 3)
+    })
+    parameters = {
+        "autogluon": {
+            "model_path": model_path,
+            "time_limit": 30,
+            "parallel": True,
+            "num_cpus": 3,
+            "eval_metric": "mean_absolute_error",
+        },
+    }
+    train_models(x_data[:200], y_data[:200], x_data[200:], y_data[200:], parameters)
+
+
+def _sleep(project_path, pipeline_name, progress_queue):
+    time.sleep(600)
+
+
+def _wait_for(manager, job_id, timeout_s):
+    deadline = time.time() + timeout_s
+    while time.time() < deadline:
+        job = manager.get(job_id)
+        if job["finished_at"] is not None:
+            return job
+        time.sleep(0.5)
+    raise AssertionError(f"Job {job_id} did not finish within {timeout_s}s")
+
+
+def test_parallel_training_runs_in_a_job(tmp_path):
+    pytest.importorskip("autogluon.tabular")
+
+    manager = TrainingJobManager(
+        project_path=str(tmp_path / "project"), job_target=partial(_train_in_parallel, str(tmp_path / "models"))
+    )
+    job = manager.submit()
+    finished = _wait_for(manager, job["job_id"], timeout_s=600)
+
+    assert finished["status"] == "succeeded", finished["error"]
+    for zone in (1, 2, 3):
+        assert (tmp_path / "models" / f"PowerConsumption_Zone{zone}").is_dir()
+
+
+def test_shutdown_stops_running_jobs():
+    manager = TrainingJobManager(job_target=_sleep)
+    job = manager.submit()
+
+    manager.shutdown()
+    finished = _wait_for(manager, job["job_id"], timeout_s=30)
+
+    assert finished["status"] == "cancelled"
+    assert not any(process.is_alive() for process in manager._processes.values())
+
+
+def test_cancel_returns_the_final_status():
+    manager = TrainingJobManager(job_target=_sleep)
+    job = manager.submit()
+
+    cancelled = manager.cancel(job["job_id"])
+
+    assert cancelled["status"] == "cancelled"
+    assert cancelled["finished_at"] is not None
+
+
+def test_exit_handler_is_registered_once(monkeypatch):
+    registered = []
+    monkeypatch.setattr(atexit, "register", registered.append)
+
+    managers = [TrainingJobManager(job_target=_sleep) for _ in range(3)]
+
+    assert registered == []
+    assert all(manager in training_jobs._managers for manager in managers)
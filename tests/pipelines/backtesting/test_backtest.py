@@ -0,0 +1,87 @@
+"""
+Tests of the rolling-origin backtest on a small synthetic history, fast enough for CI.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+
+from SUML_PowerCast_App.pipelines.backtesting.backtest import (
+    FEATURE_COLUMNS,
+    TARGET_COLUMNS,
+    make_folds,
+    regression_metrics,
+    run_backtest,
+)
+
+
+@pytest.fixture
+def history():
+    rng = np.random.default_rng(0)
+    datetimes = pd.date_range("2017-01-01", periods=60 * 24, freq="h")
+    data = pd.DataFrame(rng.normal(size=(len(datetimes), len(FEATURE_COLUMNS))), columns=FEATURE_COLUMNS)
+    for index, target_column in enumerate(TARGET_COLUMNS, start=1):
+        data[target_column] = 1000 * index + 100 * data[FEATURE_COLUMNS].sum(axis=1) + rng.normal(size=len(data))
+    data.insert(0, "Datetime", datetimes)
+    return data
+
+
+def test_folds_roll_up_to_the_end_of_the_data(history):
+    folds = make_folds(history["Datetime"], {"n_folds": 3, "horizon_days": 7, "train_days": 20})
+
+    assert [fold["Fold"] for fold in folds] == [0, 1, 2]
+    assert folds[-1]["Test_end"] == history["Datetime"].iloc[-1]
+    for previous, fold in zip(folds, folds[1:]):
+        assert fold["Origin"] - previous["Origin"] == pd.Timedelta(days=7)
+    for fold in folds:
+        assert fold["Origin"] - fold["Train_start"] == pd.Timedelta(days=20)
+
+
+def test_folds_without_training_data_are_dropped(history):
+    folds = make_folds(history["Datetime"], {"n_folds": 10, "horizon_days": 7})
+
+    # Origins before the first timestamp leave nothing to train on
+    assert len(folds) == 8
+    assert all(fold["Origin"] > fold["Train_start"] for fold in folds)
+
+
+def test_vectorized_metrics_match_sklearn():
+    rng = np.random.default_rng(1)
+    y_true = rng.normal(size=(200, 3))
+    y_pred = y_true + rng.normal(scale=0.5, size=(200, 3))
+
+    metrics = regression_metrics(y_true, y_pred)
+
+    for column in range(3):
+        assert metrics["MAE"][column] == pytest.approx(mean_absolute_error(y_true[:, column], y_pred[:, column]))
+        assert metrics["MSE"][column] == pytest.approx(mean_squared_error(y_true[:, column], y_pred[:, column]))
+        assert metrics["R2"][column] == pytest.approx(r2_score(y_true[:, column], y_pred[:, column]))
+
+
+def test_too_short_history_is_rejected(history):
+    with pytest.raises(ValueError, match="too short"):
+        run_backtest(history.head(24 * 3), {"n_folds": 2, "horizon_days": 7, "min_rows": 10})
+
+
+def test_backtest_on_a_downsampled_history(tmp_path, history):
+    pytest.importorskip("autogluon.tabular")
+    # Rows logged by the API hold predictions and are left out
+    logged = history.tail(24).assign(ModelVersion="20240101-000000")
+    data = pd.concat([history.assign(ModelVersion=None), logged], ignore_index=True)
+    parameters = {
+        "n_folds": 2, "horizon_days": 7, "sample_every": 2, "min_rows": 50,
+        "time_limit": 120, "num_cpus": 2, "cpus_per_fold": 1,
+        "hyperparameters": {"GBM": {}}, "model_path": str(tmp_path / "backtest"),
+    }
+
+    results = run_backtest(data, parameters)
+
+    assert len(results) == 2 * len(TARGET_COLUMNS)
+    assert sorted(results["Fold"].unique()) == [0, 1]
+    assert set(results["Zone"]) == set(TARGET_COLUMNS)
+    # A week of every other hour, the second origin a week later
+    assert results["Test_rows"].between(7 * 12 - 1, 7 * 12).all()
+    train_rows = results.groupby("Fold")["Train_rows"].first()
+    assert train_rows[1] - train_rows[0] == 7 * 12
+    assert (results["R2"] > 0.8).all()
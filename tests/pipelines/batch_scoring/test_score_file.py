@@ -0,0 +1,97 @@
+"""
+Tests of the chunked batch scoring: the partitioned output, resuming and the worker thread limits.
+"""
+
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from SUML_PowerCast_App.pipelines.batch_scoring.score_file import (
+    FEATURE_COLUMNS,
+    MANIFEST_NAME,
+    THREAD_VARIABLES,
+    _thread_limits,
+    score_file,
+)
+
+ZONE = "PowerConsumption_Zone1"
+
+
+def _forecast(count):
+    rng = np.random.default_rng(0)
+    forecast = pd.DataFrame(rng.normal(size=(count, len(FEATURE_COLUMNS))), columns=FEATURE_COLUMNS)
+    forecast.insert(0, "Datetime", pd.date_range("2017-01-25", periods=count, freq="3h").strftime("%m/%d/%Y %H:%M"))
+    return forecast
+
+
+@pytest.fixture(scope="module")
+def predictor(tmp_path_factory):
+    pytest.importorskip("autogluon.tabular")
+    from autogluon.tabular import TabularPredictor
+
+    train = _forecast(200).drop(columns="Datetime")
+    train[ZONE] = train.sum(axis=1)
+    path = str(tmp_path_factory.mktemp("models") / ZONE)
+    return TabularPredictor(label=ZONE, path=path, verbosity=0).fit(train, hyperparameters={"LR": {}})
+
+
+@pytest.fixture
+def parameters(tmp_path):
+    input_path = tmp_path / "forecast.csv"
+    _forecast(1000).to_csv(input_path, index=False)
+    return {
+        "input_path": str(input_path), "output_path": str(tmp_path / "predictions"),
+        "chunk_rows": 300, "num_workers": 2, "resume": True,
+    }
+
+
+def test_scores_into_a_month_partitioned_dataset(predictor, parameters):
+    summary = score_file({ZONE: predictor}, parameters)
+
+    scored = pd.read_parquet(parameters["output_path"])
+    assert (summary["rows"], summary["chunks_written"], summary["chunks_skipped"]) == (1000, 4, 0)
+    assert sorted(scored["month"].astype(str).unique()) == ["2017-01", "2017-02", "2017-03", "2017-04", "2017-05"]
+    scored = scored.sort_values("Datetime", key=lambda column: pd.to_datetime(column, format="%m/%d/%Y %H:%M"))
+    expected = predictor.predict(_forecast(1000)[FEATURE_COLUMNS].astype("float32"))
+    np.testing.assert_allclose(scored[ZONE].to_numpy(), expected.to_numpy(), rtol=1e-5)
+
+
+def test_resume_scores_only_the_unfinished_chunks(predictor, parameters):
+    score_file({ZONE: predictor}, parameters)
+    # Simulate a run interrupted after writing chunk 2 but before recording it
+    manifest_path = os.path.join(parameters["output_path"], MANIFEST_NAME)
+    with open(manifest_path, encoding="utf-8") as file:
+        manifest = json.load(file)
+    manifest["completed"].remove(2)
+    with open(manifest_path, "w", encoding="utf-8") as file:
+        json.dump(manifest, file)
+
+    summary = score_file({ZONE: predictor}, parameters)
+
+    assert (summary["chunks_written"], summary["chunks_skipped"]) == (1, 3)
+    scored = pd.read_parquet(parameters["output_path"])
+    assert len(scored) == 1000
+    assert not scored["Datetime"].duplicated().any()
+
+
+def test_resume_refuses_other_settings(parameters):
+    os.makedirs(parameters["output_path"])
+    with open(os.path.join(parameters["output_path"], MANIFEST_NAME), "w", encoding="utf-8") as file:
+        json.dump({"input_path": parameters["input_path"], "chunk_rows": 300, "predictors": {}, "completed": [0]}, file)
+
+    with pytest.raises(ValueError, match="other settings"):
+        score_file({}, {**parameters, "chunk_rows": 500})
+
+
+def test_thread_limits_are_set_for_the_pool_and_restored(monkeypatch):
+    monkeypatch.setenv("OMP_NUM_THREADS", "8")
+    monkeypatch.delenv("MKL_NUM_THREADS", raising=False)
+
+    with _thread_limits(2):
+        assert all(os.environ[variable] == "2" for variable in THREAD_VARIABLES)
+
+    assert os.environ["OMP_NUM_THREADS"] == "8"
+    assert "MKL_NUM_THREADS" not in os.environ
@@ -0,0 +1,50 @@
+"""
+Tests of where the trained predictors are written and what the slim manifest points at.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+FEATURES = ["Temperature", "Humidity", "WindSpeed", "GeneralDiffuseFlows", "DiffuseFlows"]
+ZONES = ["PowerConsumption_Zone1", "PowerConsumption_Zone2"]
+
+
+@pytest.fixture
+def splits():
+    rng = np.random.default_rng(0)
+    x_data = pd.DataFrame(rng.normal(size=(300, 5)), columns=FEATURES)
+    y_data = pd.DataFrame({
+        zone: x_data.sum(axis=1) * index + rng.normal(size=300) for index, zone in enumerate(ZONES, start=1)
+    })
+    return x_data[:200], y_data[:200], x_data[200:], y_data[200:]
+
+
+@pytest.mark.parametrize("parallel", [False, True])
+def test_retraining_reuses_the_zone_directories(tmp_path, monkeypatch, splits, parallel):
+    pytest.importorskip("autogluon.tabular")
+    from SUML_PowerCast_App.pipelines.model_training.evaluate_models import evaluate_models
+    from SUML_PowerCast_App.pipelines.model_training.train_models import train_models
+
+    monkeypatch.chdir(tmp_path)
+    x_train, y_train, x_test, y_test = splits
+    model_path = tmp_path / "models"
+    parameters = {
+        "autogluon": {
+            "model_path": str(model_path), "time_limit": 10, "eval_metric": "mean_absolute_error",
+            "parallel": parallel, "num_cpus": 2,
+        },
+        "artifacts": {"slim": True},
+    }
+
+    for _ in range(2):
+        predictors = train_models(x_train, y_train, x_test, y_test, parameters)
+        _, manifest, _ = evaluate_models(predictors, x_test, y_test, parameters)
+
+    assert sorted(os.listdir(model_path)) == ZONES
+    # No timestamped AutogluonModels/ag-* directory is left behind by the fits
+    assert not (tmp_path / "AutogluonModels").exists()
+    for zone in ZONES:
+        assert os.path.samefile(manifest[zone], model_path / zone)
@@ -0,0 +1,147 @@
+"""
+Tests of the decision between skipping, an incremental refit and a full training.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from SUML_PowerCast_App.pipelines.model_training.incremental import plan_retrain, reference_profile
+from SUML_PowerCast_App.pipelines.model_training.split_data import FEATURE_COLUMNS, TARGET_COLUMNS
+
+PARAMS = {"max_new_fraction": 0.1, "drift_threshold": 0.5, "drift_min_rows": 20}
+
+
+def _rows(count, shift=0.0, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame(rng.normal(loc=shift, size=(count, len(FEATURE_COLUMNS))), columns=FEATURE_COLUMNS)
+
+
+@pytest.fixture
+def history():
+    return _rows(1000)
+
+
+@pytest.fixture
+def state(history):
+    return {"trained_rows": 1000, "full_rows": 1000, "reference": reference_profile(history)}
+
+
+def test_skips_without_new_rows(history, state):
+    plan = plan_retrain(history, state, PARAMS)
+
+    assert plan["mode"] == "skip"
+    assert plan["new_rows"] == 0
+
+
+def test_refits_on_few_similar_rows(history, state):
+    data = pd.concat([history, _rows(50, seed=1)], ignore_index=True)
+
+    plan = plan_retrain(data, state, PARAMS)
+
+    assert plan["mode"] == "incremental"
+    assert plan["new_rows"] == 50
+    assert max(plan["drift"].values()) < PARAMS["drift_threshold"]
+
+
+def test_too_many_rows_since_full_fit_retrain_fully(history, state):
+    # 60 rows since the last incremental run, but 150 since the full fit
+    data = pd.concat([history, _rows(150, seed=1)], ignore_index=True)
+    state = {**state, "trained_rows": 1090}
+
+    plan = plan_retrain(data, state, PARAMS)
+
+    assert plan["mode"] == "full"
+    assert (plan["new_rows"], plan["rows_since_full"]) == (60, 150)
+
+
+def test_drifted_rows_retrain_fully(history, state):
+    data = pd.concat([history, _rows(50, shift=2.0, seed=1)], ignore_index=True)
+
+    plan = plan_retrain(data, state, PARAMS)
+
+    assert plan["mode"] == "full"
+    assert "shifted" in plan["reason"]
+
+
+def test_drift_is_not_judged_on_too_few_rows(history, state):
+    data = pd.concat([history, _rows(10, shift=2.0, seed=1)], ignore_index=True)
+
+    plan = plan_retrain(data, state, PARAMS)
+
+    assert plan["mode"] == "incremental"
+    assert plan["drift"] is None
+
+
+def test_shrunk_dataset_or_slim_predictors_retrain_fully(history, state):
+    assert plan_retrain(history.iloc[:900], state, PARAMS)["mode"] == "full"
+
+    data = pd.concat([history, _rows(50, seed=1)], ignore_index=True)
+    assert plan_retrain(data, state, PARAMS, slim=True)["mode"] == "full"
+
+
+def _training_data(count):
+    rng = np.random.default_rng(0)
+    data = _rows(count)
+    for index, target_column in enumerate(TARGET_COLUMNS, start=1):
+        data[target_column] = data[FEATURE_COLUMNS].sum(axis=1) * index + rng.normal(scale=0.1, size=count)
+    return data
+
+
+def test_full_then_incremental_runs(tmp_path, monkeypatch):
+    pytest.importorskip("autogluon.tabular")
+    from SUML_PowerCast_App.pipelines.model_training.incremental import retrain_incremental
+
+    monkeypatch.chdir(tmp_path)
+    data = _training_data(580)
+    parameters = {
+        "test_size": 0.3, "random_state": 42, "n_iter": 1, "cv_folds": 2,
+        "hyperparameters": {"RandomForestRegressor": {"n_estimators": [10], "max_depth": [5]}},
+        "baseline": {"n_jobs": 1},
+        "autogluon": {"model_path": str(tmp_path / "models"), "time_limit": 10, "eval_metric": "mean_absolute_error"},
+        "incremental": {"max_new_fraction": 0.2, "drift_min_rows": 1000, "keep_versions": 1},
+        "model_selection": {"latency_aware": True, "latency_budget_ms": 1000, "refit_full": True},
+    }
+
+    # Without a recorded state the model_training pipeline runs
+    best_models, baseline_models, state, reference, log = retrain_incremental(
+        data.iloc[:500], {}, {}, {}, {}, parameters
+    )
+    assert log["mode"] == "full"
+    assert [record["Target"] for record in log["metrics"]] == TARGET_COLUMNS
+    assert state["baseline_rows"] == {target_column: 350 for target_column in TARGET_COLUMNS}
+    forest = baseline_models[TARGET_COLUMNS[0]]
+    first_trees = list(forest.estimators_)
+
+    def refit_models(predictor):
+        return sorted(name for name in predictor.model_names() if name.endswith("_FULL"))
+
+    # refit_full made a copy of every model, the incremental runs keep the served one's
+    served_refits = {target_column: refit_models(predictor) for target_column, predictor in best_models.items()}
+
+    for rows, trees in ((540, 12), (580, 14)):
+        best_models, baseline_models, state, reference, log = retrain_incremental(
+            data.iloc[:rows], best_models, baseline_models, state, reference, parameters
+        )
+
+        assert log["mode"] == "incremental"
+        assert state["trained_rows"] == rows
+        for target_column, predictor in best_models.items():
+            # The refit is served after being evaluated on the held-out test split
+            assert predictor.model_best.endswith("_FULL")
+            assert predictor.model_best in refit_models(predictor)
+            assert set(refit_models(predictor)) <= set(served_refits[target_column])
+            served_refits[target_column] = refit_models(predictor)
+        assert [record["Model"] for record in log["metrics"]] == [
+            best_models[target_column].model_best for target_column in TARGET_COLUMNS
+        ]
+        assert all(record["Latency_ms"] is not None for record in log["metrics"])
+        # The forest keeps its trees and grows by the new rows' share of those it was fit on
+        assert forest.n_estimators == len(forest.estimators_) == trees
+        assert forest.estimators_[:10] == first_trees
+        assert state["baseline_rows"][TARGET_COLUMNS[0]] == rows - 150
+
+    # Only the served version is kept
+    assert len(os.listdir(tmp_path / "models" / "incremental")) == 1
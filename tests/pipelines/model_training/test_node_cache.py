@@ -0,0 +1,151 @@
+"""
+Tests of the node output cache wrapping the `model_training` nodes.
+"""
+
+import os
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from SUML_PowerCast_App import node_cache
+from SUML_PowerCast_App.node_cache import cache_stats, cached, configure, fingerprint
+
+calls = []
+
+
+def scale(frame, parameters):
+    calls.append(1)
+    return frame * parameters["factor"]
+
+
+class SavedModel:
+    """
+    A model saved to a directory and loaded back from it, like a `TabularPredictor`.
+    """
+    loads = 0
+
+    def __init__(self, path):
+        self.path = path
+
+    @classmethod
+    def load(cls, path):
+        cls.loads += 1
+        return cls(path)
+
+
+def fit(frame, parameters):
+    calls.append(1)
+    path = os.path.join(parameters["model_path"], "zone")
+    os.makedirs(path, exist_ok=True)
+    return {"zone": SavedModel(path)}, frame.mean()
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path):
+    configure(enabled=True, path=str(tmp_path / "node_cache"), ignore_params=["api"])
+    node_cache._stats.clear()
+    calls.clear()
+    yield tmp_path / "node_cache"
+    configure(enabled=False)
+
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(0)
+    return pd.DataFrame(rng.normal(size=(50, 3)), columns=["a", "b", "c"])
+
+
+def test_fingerprint_depends_on_content(frame):
+    assert fingerprint(frame, {"x": 1}) == fingerprint(frame.copy(), {"x": 1})
+    assert fingerprint(frame, {"x": 1}) != fingerprint(frame, {"x": 2})
+
+    changed = frame.copy()
+    changed.iloc[0, 0] += 1
+    assert fingerprint(frame) != fingerprint(changed)
+    assert fingerprint(frame) != fingerprint(frame.astype("float32"))
+
+
+def test_cached_hits_while_inputs_are_unchanged(frame):
+    cached_scale = cached(scale)
+
+    first = cached_scale(frame, {"factor": 2, "api": {"port": 1}})
+    # Ignored parameter sections don't invalidate the entry
+    second = cached_scale(frame.copy(), {"factor": 2, "api": {"port": 2}})
+    cached_scale(frame, {"factor": 3})
+
+    pd.testing.assert_frame_equal(first, second)
+    assert len(calls) == 2
+    assert cache_stats()["scale"] == {"hits": 1, "misses": 2}
+
+
+def test_cached_is_bypassed_when_disabled(frame):
+    configure(enabled=False)
+    cached_scale = cached(scale)
+
+    cached_scale(frame, {"factor": 2})
+    cached_scale(frame, {"factor": 2})
+
+    assert len(calls) == 2
+
+
+def test_saved_models_are_cached_as_their_paths(frame, cache_dir, tmp_path):
+    cached_fit = cached(fit)
+    parameters = {"model_path": str(tmp_path / "models")}
+    SavedModel.loads = 0
+
+    first_models, first_means = cached_fit(frame, parameters)
+    second_models, second_means = cached_fit(frame, parameters)
+
+    assert len(calls) == 1
+    assert SavedModel.loads == 1
+    assert second_models["zone"].path == os.path.abspath(first_models["zone"].path)
+    pd.testing.assert_series_equal(first_means, second_means)
+    with open(cache_dir / "fit.pkl", "rb") as file:
+        stored_models = pickle.load(file)["outputs"][0]
+    assert not isinstance(stored_models["zone"], SavedModel)
+
+
+def test_training_nodes_hit_on_unchanged_rerun(tmp_path, monkeypatch):
+    pytest.importorskip("autogluon.tabular")
+    from SUML_PowerCast_App.pipelines.model_training.evaluate_models import evaluate_models
+    from SUML_PowerCast_App.pipelines.model_training.split_data import (
+        FEATURE_COLUMNS,
+        TARGET_COLUMNS,
+        split_data,
+    )
+    from SUML_PowerCast_App.pipelines.model_training.train_models import train_models
+
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "data" / "06_models").mkdir(parents=True)
+    rng = np.random.default_rng(0)
+    data = pd.DataFrame(rng.normal(size=(300, 5)), columns=FEATURE_COLUMNS)
+    for zone, column in enumerate(TARGET_COLUMNS, start=1):
+        data[column] = data[FEATURE_COLUMNS].sum(axis=1) * zone + rng.normal(size=300)
+    parameters = {
+        "test_size": 0.3,
+        "random_state": 42,
+        "autogluon": {
+            "model_path": str(tmp_path / "models"),
+            "time_limit": 10,
+            "eval_metric": "mean_absolute_error",
+        },
+    }
+
+    def run():
+        x_train, x_dev, x_test, y_train, y_dev, y_test = cached(split_data)(data, parameters)
+        predictors = cached(train_models)(x_train, y_train, x_dev, y_dev, parameters)
+        return cached(evaluate_models)(predictors, x_test, y_test, parameters)
+
+    first_metrics = run()[0]
+    second_metrics = run()[0]
+
+    pd.testing.assert_frame_equal(first_metrics, second_metrics)
+    # The entries refer to the predictor directories instead of holding the predictors
+    with open(tmp_path / "node_cache" / "train_models.pkl", "rb") as file:
+        stored = pickle.load(file)["outputs"]
+    assert all(type(value).__name__ != "TabularPredictor" for value in stored.values())
+    stats = cache_stats()
+    for name in ("split_data", "train_models", "evaluate_models"):
+        assert stats[name] == {"hits": 1, "misses": 1}, name
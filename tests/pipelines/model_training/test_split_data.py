@@ -0,0 +1,52 @@
+"""
+Tests of the train/validation/test split, in the normal and the memory-lean mode.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from SUML_PowerCast_App.pipelines.model_training.split_data import FEATURE_COLUMNS, TARGET_COLUMNS, split_data
+from SUML_PowerCast_App.pipelines.model_training.train_models import _zone_frame
+
+PARAMETERS = {"test_size": 0.3, "random_state": 42}
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(0)
+    frame = pd.DataFrame(rng.normal(size=(1000, 8)) * 100, columns=FEATURE_COLUMNS + TARGET_COLUMNS)
+    frame.insert(0, "Datetime", pd.date_range("2017-01-01", periods=1000, freq="10min"))
+    # A shuffled, non-default index, as after filtering the raw data
+    return frame.sample(frac=1, random_state=1)
+
+
+def test_lean_split_holds_the_same_sets(data):
+    normal = split_data(data, PARAMETERS)
+    lean = split_data(data, {**PARAMETERS, "memory_lean": True})
+
+    for normal_set, lean_set in zip(normal, lean):
+        assert list(lean_set.columns) == list(normal_set.columns)
+        assert (lean_set.dtypes == "float32").all()
+        pd.testing.assert_index_equal(lean_set.index, normal_set.index)
+        pd.testing.assert_frame_equal(lean_set, normal_set.astype("float32"))
+
+
+def test_lean_split_owns_its_data(data):
+    x_train = split_data(data, {**PARAMETERS, "memory_lean": True})[0]
+
+    x_train.iloc[0, 0] = -1.0
+
+    assert (data[FEATURE_COLUMNS].to_numpy() != -1.0).all()
+
+
+def test_shared_zone_frame_matches_the_per_zone_frame(data):
+    x_train, _, _, y_train, _, _ = split_data(data, {**PARAMETERS, "memory_lean": True})
+    shared = x_train.join(y_train)
+
+    for target_column in TARGET_COLUMNS:
+        lean_frame, ignored_columns = _zone_frame(x_train, y_train, target_column, shared)
+        normal_frame, _ = _zone_frame(x_train, y_train, target_column)
+
+        assert set(ignored_columns) == set(TARGET_COLUMNS) - {target_column}
+        pd.testing.assert_frame_equal(lean_frame.drop(columns=ignored_columns), normal_frame)